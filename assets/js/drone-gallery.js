@@ -11,33 +11,89 @@
 
   if (!gallery || !viewer) return;
 
-  let cards = Array.from(gallery.querySelectorAll(".drone-card"));
+  // Cards appended per chunk once the manifest is loaded.
+  const CHUNK_SIZE = 24;
+  const title = document.querySelector(".gallery-header h1")?.textContent.trim() || "Drone image";
+
+  // One entry per image: { thumb, full, created, width, height }. Until the
+  // manifest arrives (or when it cannot be fetched) the inline cards are used.
+  let items = Array.from(gallery.querySelectorAll(".drone-card")).map((card) => {
+    const image = card.querySelector("img");
+    return { thumb: image.currentSrc || image.src, full: image.src, created: card.dataset.created };
+  });
+  let rendered = items.length;
   let newestFirst = true;
   let currentIndex = 0;
   let previousFocus = null;
   let touchStartX = 0;
   let touchStartY = 0;
+  let sentinel = null;
+  let observer = null;
+
+  const displayDate = (created) => {
+    const [date] = created.split("T");
+    const [year, month, day] = date.split("-");
+    return `${day}.${month}.${year}`;
+  };
+
+  const createCard = (item, index) => {
+    const card = document.createElement("button");
+    card.className = "drone-card";
+    card.type = "button";
+    card.dataset.created = item.created;
+    card.dataset.index = index;
+    card.setAttribute("aria-label", `Open aerial image from ${displayDate(item.created)}`);
+    if (item.color) card.style.backgroundColor = item.color;
 
-  const refreshCards = () => {
-    cards = Array.from(gallery.querySelectorAll(".drone-card"));
-    cards.forEach((card, index) => { card.dataset.index = index; });
+    const image = document.createElement("img");
+    image.src = item.thumb;
+    image.alt = `${title} — aerial image ${index + 1}`;
+    image.loading = "lazy";
+    image.decoding = "async";
+    if (item.width && item.height) {
+      image.width = item.width;
+      image.height = item.height;
+    }
+
+    const time = document.createElement("time");
+    time.dateTime = item.created;
+    time.textContent = displayDate(item.created);
+
+    card.append(image, time);
+    return card;
+  };
+
+  const renderChunk = () => {
+    const fragment = document.createDocumentFragment();
+    const end = Math.min(rendered + CHUNK_SIZE, items.length);
+    for (let index = rendered; index < end; index += 1) {
+      fragment.appendChild(createCard(items[index], index));
+    }
+    gallery.insertBefore(fragment, sentinel);
+    rendered = end;
+    if (rendered >= items.length) observer?.disconnect();
+  };
+
+  const renderFromStart = () => {
+    gallery.querySelectorAll(".drone-card").forEach((card) => card.remove());
+    rendered = 0;
+    renderChunk();
+    if (rendered < items.length && sentinel) observer?.observe(sentinel);
   };
 
   const showImage = (index) => {
-    currentIndex = (index + cards.length) % cards.length;
-    const card = cards[currentIndex];
-    const image = card.querySelector("img");
-    const time = card.querySelector("time");
-    viewerImage.src = image.currentSrc || image.src;
-    viewerImage.alt = image.alt;
-    viewerDate.dateTime = time.dateTime;
-    viewerDate.textContent = time.textContent;
-    viewerCounter.textContent = `${currentIndex + 1} / ${cards.length}`;
-
-    [cards[currentIndex - 1], cards[currentIndex + 1]].forEach((nearbyCard) => {
-      if (!nearbyCard) return;
+    currentIndex = (index + items.length) % items.length;
+    const item = items[currentIndex];
+    viewerImage.src = item.full;
+    viewerImage.alt = `${title} — aerial image ${currentIndex + 1}`;
+    viewerDate.dateTime = item.created;
+    viewerDate.textContent = displayDate(item.created);
+    viewerCounter.textContent = `${currentIndex + 1} / ${items.length}`;
+
+    [items[currentIndex - 1], items[currentIndex + 1]].forEach((nearbyItem) => {
+      if (!nearbyItem) return;
       const preload = new Image();
-      preload.src = nearbyCard.querySelector("img").src;
+      preload.src = nearbyItem.full;
     });
   };
 
@@ -58,6 +114,44 @@
     previousFocus?.focus({ preventScroll: true });
   };
 
+  const loadManifest = async () => {
+    const url = gallery.dataset.manifest;
+    if (!url) return;
+    try {
+      const response = await fetch(url);
+      if (!response.ok) return;
+      const manifest = await response.json();
+      const fields = manifest.fields;
+      items = manifest.items.map((row) => Object.fromEntries(fields.map((field, i) => [field, row[i]])));
+    } catch {
+      return;
+    }
+    if (!newestFirst) items.reverse();
+    // The cards on screen are the inline ones, possibly re-sorted by a click
+    // before the manifest arrived; redraw unless they already match.
+    const cards = Array.from(gallery.querySelectorAll(".drone-card"));
+    const current = cards.length <= items.length && cards.every(
+      (card, index) => Number(card.dataset.index) === index && card.dataset.created === items[index].created,
+    );
+    if (current && rendered >= items.length) return;
+
+    sentinel = document.createElement("div");
+    sentinel.className = "drone-gallery-sentinel";
+    sentinel.setAttribute("aria-hidden", "true");
+    gallery.appendChild(sentinel);
+
+    if ("IntersectionObserver" in window) {
+      observer = new IntersectionObserver((entries) => {
+        if (entries.some((entry) => entry.isIntersecting)) renderChunk();
+      }, { rootMargin: "1200px 0px" });
+    }
+    if (!current) renderFromStart();
+    else if (rendered < items.length) observer?.observe(sentinel);
+    if (!observer) {
+      while (rendered < items.length) renderChunk();
+    }
+  };
+
   gallery.addEventListener("click", (event) => {
     const card = event.target.closest(".drone-card");
     if (card) openViewer(card);
@@ -65,11 +159,8 @@
 
   sortButton?.addEventListener("click", () => {
     newestFirst = !newestFirst;
-    const direction = newestFirst ? -1 : 1;
-    cards
-      .sort((a, b) => direction * a.dataset.created.localeCompare(b.dataset.created))
-      .forEach((card) => gallery.appendChild(card));
-    refreshCards();
+    items.reverse();
+    renderFromStart();
     sortButton.innerHTML = newestFirst
       ? 'newest first <span aria-hidden="true">↓</span>'
       : 'oldest first <span aria-hidden="true">↑</span>';
@@ -102,5 +193,5 @@
     }
   }, { passive: true });
 
-  refreshCards();
+  loadManifest();
 })();
@@ -20,10 +20,71 @@ document.addEventListener("DOMContentLoaded", function () {
   }
 
   // --- FILTER LOGIC ---
+  // index.search.json maps every tag and title word to card positions, so a
+  // query is a few lookups instead of a pass over every card's attributes.
+  // Until it has loaded, the cards themselves are checked.
+  const searchInput = document.getElementById("projectSearch");
+  const shownState = new Map();
+  let searchIndex = null;
+  let searchTokens = [];
+  let searchQuery = "";
+
+  function tokenize(text) {
+    return text.toLowerCase().match(/[\p{L}\p{N}]+/gu) || [];
+  }
+
+  function intersect(current, values) {
+    if (current === null) return new Set(values);
+    return new Set(Array.from(values).filter((value) => current.has(value)));
+  }
+
+  function prefixPositions(prefix) {
+    // searchTokens is sorted: find the first token >= prefix, then take the run.
+    let low = 0;
+    let high = searchTokens.length;
+    while (low < high) {
+      const mid = (low + high) >> 1;
+      if (searchTokens[mid] < prefix) low = mid + 1;
+      else high = mid;
+    }
+    const positions = new Set();
+    for (let i = low; i < searchTokens.length && searchTokens[i].startsWith(prefix); i++) {
+      searchIndex.tokens[searchTokens[i]].forEach((position) => positions.add(position));
+    }
+    return positions;
+  }
+
+  function indexedMatches(filter, words) {
+    let positions = null;
+    if (filter) positions = intersect(positions, searchIndex.tags[filter] || []);
+    words.forEach((word) => {
+      positions = intersect(positions, prefixPositions(word));
+    });
+    if (positions === null) return null;
+    return new Set(Array.from(positions, (position) => searchIndex.projects[position]));
+  }
+
+  function scannedMatches(filter, words) {
+    if (!filter && !words.length) return null;
+    const matches = allProjects.filter((el) => {
+      const hashtags = (el.dataset.hashtags || "").toLowerCase().split(/\s+/);
+      const text = tokenize(el.textContent);
+      return (
+        (!filter || hashtags.includes(filter)) &&
+        words.every((word) => text.some((token) => token.startsWith(word)))
+      );
+    });
+    return new Set(matches.map((el) => el.dataset.project));
+  }
+
   function applyFilter(filter) {
+    activeFilter = filter;
+    const words = tokenize(searchQuery);
+    const matches = searchIndex ? indexedMatches(filter, words) : scannedMatches(filter, words);
     allProjects.forEach((el) => {
-      const hashtags = (el.dataset.hashtags || "").toLowerCase();
-      const shouldShow = !filter || hashtags.includes(filter);
+      const shouldShow = !matches || matches.has(el.dataset.project);
+      if (shownState.get(el) === shouldShow) return;
+      shownState.set(el, shouldShow);
       el.style.pointerEvents = shouldShow ? "" : "none";
       el.style.opacity = shouldShow ? "1" : "0.12";
       el.style.transition = "opacity 0.4s cubic-bezier(0.4,0,0.2,1)";
@@ -33,6 +94,121 @@ document.addEventListener("DOMContentLoaded", function () {
     originalRects = projects.map((el) => el.getBoundingClientRect());
   }
 
+  if (grid.dataset.searchIndex && window.fetch) {
+    fetch(grid.dataset.searchIndex)
+      .then((response) => (response.ok ? response.json() : Promise.reject(response.status)))
+      .then((data) => {
+        searchIndex = data;
+        searchTokens = Object.keys(data.tokens).sort();
+        if (activeFilter || searchQuery) applyFilter(activeFilter);
+      })
+      .catch(() => {});
+  }
+
+  if (searchInput) {
+    searchInput.addEventListener("input", () => {
+      searchQuery = searchInput.value;
+      applyFilter(activeFilter);
+    });
+  }
+
+  // --- CHUNKED CARDS ---
+  // Large libraries inline only the first page of cards; the rest arrive from
+  // index-N.json chunks as the grid nears the end of the viewport. The page
+  // links stay visible when the chunks cannot be loaded.
+  const pageLinks = document.getElementById("indexPages");
+  const pendingChunks = JSON.parse(grid.dataset.chunks || "[]");
+  let chunkSentinel = null;
+  let chunkObserver = null;
+  let chunkLoading = false;
+
+  function createCard(card) {
+    const el = document.createElement("a");
+    el.className = "project";
+    el.dataset.project = card.num;
+    el.dataset.hashtags = card.hashtags.join(" ");
+    el.href = card.href;
+
+    let logo;
+    if (card.sprite) {
+      logo = document.createElement("span");
+      logo.className = `project-logo project-logo-sprite icon-atlas-${card.sprite.atlas}`;
+      logo.setAttribute("role", "img");
+      logo.setAttribute("aria-label", "icon");
+      logo.style.backgroundPosition = card.sprite.position;
+    } else {
+      logo = document.createElement("img");
+      logo.src = card.icon;
+      logo.alt = "icon";
+      if (card.size) {
+        logo.width = card.size[0];
+        logo.height = card.size[1];
+      }
+      logo.className = "project-logo";
+    }
+
+    const label = document.createElement("span");
+    label.className = "project-label";
+    label.textContent = card.num;
+
+    const tooltip = document.createElement("span");
+    tooltip.className = "project-tooltip";
+    card.titledesc.split("\n").forEach((line, index) => {
+      if (index) tooltip.appendChild(document.createElement("br"));
+      tooltip.append(line);
+    });
+
+    el.append(logo, label, tooltip);
+    return el;
+  }
+
+  async function loadNextChunk() {
+    if (chunkLoading || inBubbleMode || !pendingChunks.length) return;
+    chunkLoading = true;
+    try {
+      const response = await fetch(pendingChunks[0]);
+      if (!response.ok) throw new Error(`HTTP ${response.status}`);
+      const data = await response.json();
+      pendingChunks.shift();
+      const fragment = document.createDocumentFragment();
+      data.cards.forEach((card) => {
+        const el = createCard(card);
+        allProjects.push(el);
+        fragment.appendChild(el);
+      });
+      grid.insertBefore(fragment, chunkSentinel);
+      applyFilter(activeFilter);
+    } catch (error) {
+      console.warn("Could not load more projects:", error);
+      pendingChunks.length = 0;
+      if (pageLinks) pageLinks.hidden = false;
+    } finally {
+      chunkLoading = false;
+    }
+    if (!pendingChunks.length) {
+      chunkObserver.disconnect();
+      chunkSentinel.remove();
+    } else {
+      // Re-observing reports the sentinel again if it is still on screen.
+      chunkObserver.unobserve(chunkSentinel);
+      chunkObserver.observe(chunkSentinel);
+    }
+  }
+
+  if (pendingChunks.length && window.fetch && "IntersectionObserver" in window) {
+    if (pageLinks) pageLinks.hidden = true;
+    chunkSentinel = document.createElement("div");
+    chunkSentinel.className = "project-grid-sentinel";
+    grid.appendChild(chunkSentinel);
+    chunkObserver = new IntersectionObserver(
+      (entries) => {
+        if (entries.some((entry) => entry.isIntersecting)) loadNextChunk();
+      },
+      { rootMargin: "600px 0px" },
+    );
+    chunkObserver.observe(chunkSentinel);
+  }
+
   function updateDirectionArrow() {
     if (!directionArrow) return;
 
@@ -1,25 +1,34 @@
 #!/usr/bin/env python3
 """Compatibility entry point for the static-site generator."""
 
+import argparse
+import io
 import subprocess
 import sys
+import tempfile
 import zipfile
 from pathlib import Path
 
 sys.dont_write_bytecode = True
 
+from tools.output_writer import write_output
 from tools.site_generator import main
+from tools.tracing import enable, merge_traces, span
+
+DEFAULT_TRACE_PATH = Path(".cache") / "trace.json"
+PACKAGE_ENTRY_DATE = (1980, 1, 1, 0, 0, 0)
 
 
 def run_public_export(script_name):
     root = Path(__file__).resolve().parent
     local_python = root / ".venv" / "bin" / "python3"
     python = local_python if local_python.exists() else Path(sys.executable)
-    subprocess.run(
-        [str(python), str(root / "portfolio-export" / script_name)],
-        cwd=root,
-        check=True,
-    )
+    with span("export." + Path(script_name).stem, "export"):
+        subprocess.run(
+            [str(python), str(root / "portfolio-export" / script_name)],
+            cwd=root,
+            check=True,
+        )
 
 
 def create_full_application_package():
@@ -33,14 +42,42 @@ def create_full_application_package():
         raise FileNotFoundError(
             "Cannot create full application package; missing: " + ", ".join(missing)
         )
-    with zipfile.ZipFile(package_path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
-        archive.write(cv_path, cv_path.name)
-        archive.write(portfolio_path, portfolio_path.name)
-    print(f"Full CV + portfolio package: {package_path}")
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        # Fixed entry dates keep the archive byte-identical while the PDFs are.
+        for path in (cv_path, portfolio_path):
+            entry = zipfile.ZipInfo(path.name, date_time=PACKAGE_ENTRY_DATE)
+            entry.compress_type = zipfile.ZIP_DEFLATED
+            archive.writestr(entry, path.read_bytes())
+    written = write_output(package_path, buffer.getvalue())
+    print(f"Full CV + portfolio package: {package_path}" + ("" if written else " (unchanged)"))
+
+
+def publish(argv):
+    with span("publish", "export"):
+        main(argv)
+        run_public_export("generate_public_cv.py")
+        run_public_export("generate_public_portfolio.py")
+        with span("full_application_package", "export"):
+            create_full_application_package()
+
+
+def parse_trace_args(argv):
+    """Split off ``--trace [PATH]``; everything else goes to the site generator."""
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--trace", nargs="?", const=DEFAULT_TRACE_PATH, type=Path)
+    return parser.parse_known_args(argv)
 
 
 if __name__ == "__main__":
-    main()
-    run_public_export("generate_public_cv.py")
-    run_public_export("generate_public_portfolio.py")
-    create_full_application_package()
+    trace_args, site_args = parse_trace_args(sys.argv[1:])
+    if trace_args.trace is None:
+        publish(site_args)
+    else:
+        with tempfile.TemporaryDirectory(prefix="site-trace-") as trace_dir:
+            enable(trace_dir)
+            try:
+                publish(site_args)
+            finally:
+                count = merge_traces(trace_dir, trace_args.trace)
+                print(f"Trace with {count} events: {trace_args.trace} (open in chrome://tracing or ui.perfetto.dev)")
@@ -69,7 +69,7 @@ def validated_application(payload: Any) -> dict[str, Any]:
     if not 1 <= hobby_item_limit <= 12:
         raise ValueError("Choose between 1 and 12 hobby entries.")
 
-    known_ids = set(generator.published_project_folders())
+    known_ids = set(generator.library_state().folders)
     include_projects = clean_list(payload.get("include_projects"), "Included projects")
     exclude_projects = clean_list(payload.get("exclude_projects"), "Excluded projects")
     overlap = set(include_projects) & set(exclude_projects)
@@ -82,6 +82,10 @@ def validated_application(payload: Any) -> dict[str, Any]:
     if unknown_ids:
         raise ValueError("Unknown project ID: " + ", ".join(sorted(unknown_ids)))
 
+    keyword_scoring = payload.get("keyword_scoring", "flat")
+    if keyword_scoring not in generator.KEYWORD_SCORING_MODES:
+        raise ValueError("Keyword scoring must be one of: " + ", ".join(generator.KEYWORD_SCORING_MODES) + ".")
+
     include_hobbies = payload.get("include_hobbies", True)
     if not isinstance(include_hobbies, bool):
         raise ValueError("Include hobbies must be true or false.")
@@ -103,6 +107,7 @@ def validated_application(payload: Any) -> dict[str, Any]:
             payload.get("hobby_categories"), "Hobby categories"
         ),
         "hobby_item_limit": hobby_item_limit,
+        "keyword_scoring": keyword_scoring,
     }
 
 
@@ -278,6 +283,9 @@ def main() -> int:
     if not 1024 <= args.port <= 65535:
         print("Choose a port between 1024 and 65535.", file=sys.stderr)
         return 2
+    # Parse the library before the first request instead of during it.
+    state = generator.library_state()
+    print(f"Loaded {len(state.projects)} project(s).")
     server = ThreadingHTTPServer((HOST, args.port), ApplicationHandler)
     url = f"http://{HOST}:{args.port}/"
     print(f"Private application generator: {url}")
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""Rank many vacancies against the project library at once.
+
+The library is loaded once and turned into project-by-term matrices: one for
+each of the software, skill and focus phrases and one for the keyword tokens.
+Every vacancy is enriched as in ``generate.py`` and becomes a row of term
+counts, so one matrix product per term type scores all vacancies against all
+projects with the ``rank_projects`` weights. Vacancies with ``bm25`` keyword
+scoring get their keyword points from the library's ``KeywordIndex`` instead.
+The result is written as a score matrix (CSV) or as rankings plus project
+coverage (JSON).
+
+    python3 portfolio-export/batch_rank.py vacancies/ --output .cache/ranking.csv
+    python3 portfolio-export/batch_rank.py a.json b.txt --project-limit 4 --output ranking.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import io
+import json
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable
+
+try:
+    import numpy as np
+except ImportError as exc:
+    raise SystemExit(
+        "Missing export dependencies. Run: "
+        "python3 -m pip install -r portfolio-export/requirements.txt"
+    ) from exc
+
+import generate as generator
+from tools.output_writer import write_output
+
+
+APPLICATION_SUFFIXES = {".json", ".txt"}
+# (application key, ProjectTerms field, points per match), as in rank_projects.
+PHRASE_WEIGHTS = (("software", "software", 10), ("skills", "skills", 6), ("focus", "tags", 5))
+
+
+@dataclass
+class BatchRanking:
+    sources: list[str]
+    applications: list[dict[str, Any]]
+    project_ids: list[str]
+    # Applications x projects; NaN where a project is excluded for that application.
+    scores: np.ndarray
+    # Applications x projects, the project column indices in ranked order.
+    order: np.ndarray
+
+    def ranking(self, row: int) -> list[str]:
+        return [
+            self.project_ids[column] for column in self.order[row]
+            if not np.isnan(self.scores[row, column])
+        ]
+
+    def selected(self, row: int) -> list[str]:
+        ranking = self.ranking(row)
+        limit = max(1, min(int(self.applications[row].get("project_limit", 4)), len(ranking)))
+        return ranking[:limit]
+
+    def coverage(self) -> dict[str, int]:
+        """Return how many applications select each project, most selected first."""
+        counts = {project_id: 0 for project_id in self.project_ids}
+        for row in range(len(self.applications)):
+            for project_id in self.selected(row):
+                counts[project_id] += 1
+        return dict(sorted(counts.items(), key=lambda item: (-item[1], item[0])))
+
+
+def term_matrix(rows: Iterable[Iterable[str]], columns: dict[str, int]) -> np.ndarray:
+    """Count how often each row mentions each known term; unknown terms are ignored."""
+    rows = list(rows)
+    matrix = np.zeros((len(rows), len(columns)), dtype=np.int32)
+    for index, terms in enumerate(rows):
+        for term in terms:
+            column = columns.get(term)
+            if column is not None:
+                matrix[index, column] += 1
+    return matrix
+
+
+def vocabulary_index(values: Iterable[Iterable[str]]) -> dict[str, int]:
+    return {term: index for index, term in enumerate(sorted({term for terms in values for term in terms}))}
+
+
+def rank_applications(
+    applications: list[dict[str, Any]],
+    sources: list[str] | None = None,
+    state: generator.LibraryState | None = None,
+) -> BatchRanking:
+    """Enrich and score every application against every publishable project."""
+    state = state or generator.library_state()
+    projects = [project for project in state.projects if not project.exclude]
+    project_ids = [project.project_id for project in projects]
+    column_of = {project_id: index for index, project_id in enumerate(project_ids)}
+    terms = [state.terms[project_id] for project_id in project_ids]
+    prepared = [
+        generator.enrich_application(
+            generator.prepare_application(application), list(state.projects), state.cv, state.vocabulary,
+        )
+        for application in applications
+    ]
+
+    # Projects hold a phrase at most once, so its column is 0 or 1; an
+    # application can list it more than once, and every listing counts.
+    score = np.tile(np.array([project.priority for project in projects], dtype=np.float64), (len(prepared), 1))
+    for key, field, weight in PHRASE_WEIGHTS:
+        project_phrases = [getattr(profile, field) for profile in terms]
+        columns = vocabulary_index(project_phrases)
+        matches = term_matrix(
+            ([generator.normalize(item) for item in application.get(key, [])] for application in prepared), columns,
+        ) @ term_matrix(project_phrases, columns).T
+        score += weight * matches
+
+    project_tokens = [profile.tokens for profile in terms]
+    columns = vocabulary_index(project_tokens)
+    shared = np.minimum(
+        term_matrix((generator.application_tokens(application) for application in prepared), columns)
+        @ term_matrix(project_tokens, columns).T,
+        generator.KEYWORD_POINTS_CAP,
+    )
+    score += bm25_rows(shared.astype(np.float64), prepared, column_of, state.keywords)
+    score += np.array([profile.selected for profile in terms], dtype=np.float64)
+
+    included = np.zeros_like(score, dtype=bool)
+    excluded = np.zeros_like(score, dtype=bool)
+    for row, application in enumerate(prepared):
+        for project_id in application.get("include_projects", []):
+            if str(project_id) in column_of:
+                included[row, column_of[str(project_id)]] = True
+        for project_id in application.get("exclude_projects", []):
+            if str(project_id) in column_of:
+                excluded[row, column_of[str(project_id)]] = True
+    score = np.where(included, score + 1000, score)
+    score[excluded] = np.nan
+
+    # rank_projects sorts by score, then priority (both descending), then ID.
+    priority = np.array([project.priority for project in projects])
+    id_rank = np.argsort(np.argsort(project_ids))
+    order = np.empty(score.shape, dtype=np.intp)
+    for row in range(len(prepared)):
+        order[row] = np.lexsort((id_rank, -priority, -np.nan_to_num(score[row], nan=-np.inf)))
+    return BatchRanking(
+        sources=sources or [f"application {index + 1}" for index in range(len(prepared))],
+        applications=prepared,
+        project_ids=project_ids,
+        scores=score,
+        order=order,
+    )
+
+
+def bm25_rows(
+    points: np.ndarray,
+    applications: list[dict[str, Any]],
+    column_of: dict[str, int],
+    keywords: generator.KeywordIndex,
+) -> np.ndarray:
+    """Replace the flat keyword points of ``bm25`` applications with their BM25 points.
+
+    Each such row gets the capped, rounded ``KeywordIndex.bm25`` scores that
+    ``rank_projects`` adds, so mixed folders rank exactly as one at a time.
+    """
+    for row, application in enumerate(applications):
+        if application.get("keyword_scoring") != "bm25":
+            continue
+        points[row] = 0
+        scores, _matches = keywords.bm25(generator.application_tokens(application))
+        for project_id, value in scores.items():
+            column = column_of.get(project_id)
+            if column is not None:
+                points[row, column] = round(min(value, generator.KEYWORD_POINTS_CAP), 2)
+    return points
+
+
+def application_files(paths: Iterable[Path]) -> list[Path]:
+    files: list[Path] = []
+    for path in paths:
+        if path.is_dir():
+            files.extend(sorted(
+                item for item in path.iterdir()
+                if item.is_file() and item.suffix.lower() in APPLICATION_SUFFIXES
+            ))
+        else:
+            files.append(path)
+    return files
+
+
+def load_applications(files: list[Path], args: argparse.Namespace) -> list[dict[str, Any]]:
+    overrides = argparse.Namespace(
+        office=None, position=None, software=None, skills=None, focus=None,
+        project_limit=args.project_limit, include_hobbies=None, hobby_categories=None, keyword_scoring=None,
+    )
+    return [generator.load_application(path, overrides) for path in files]
+
+
+def ranking_csv(result: BatchRanking) -> str:
+    """One row per application: its selection, then every project's score."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(["source", "office", "position", "selected", *result.project_ids])
+    for row, application in enumerate(result.applications):
+        writer.writerow([
+            result.sources[row],
+            application["office"],
+            application["position"],
+            " ".join(result.selected(row)),
+            *("" if np.isnan(value) else f"{value:g}" for value in result.scores[row]),
+        ])
+    return buffer.getvalue()
+
+
+def ranking_json(result: BatchRanking) -> str:
+    column_of = {project_id: index for index, project_id in enumerate(result.project_ids)}
+    payload = {
+        "projects": result.project_ids,
+        "coverage": result.coverage(),
+        "applications": [
+            {
+                "source": result.sources[row],
+                "office": application["office"],
+                "position": application["position"],
+                "selected": result.selected(row),
+                "ranking": [
+                    {"project": project_id, "score": round(float(result.scores[row, column_of[project_id]]), 2)}
+                    for project_id in result.ranking(row)
+                ],
+            }
+            for row, application in enumerate(result.applications)
+        ],
+    }
+    return json.dumps(payload, indent=2, ensure_ascii=False) + "\n"
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Rank many vacancies (application JSON or plain-text files) against the project library."
+    )
+    parser.add_argument("applications", type=Path, nargs="+", help="application files or folders of them")
+    parser.add_argument("--project-limit", type=int, help="projects selected per application (default: each file's own)")
+    parser.add_argument("--output", type=Path, help="write .csv (score matrix) or .json (rankings and coverage)")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    files = application_files(args.applications)
+    missing = [str(path) for path in files if not path.is_file()]
+    if missing:
+        print("Application file not found: " + ", ".join(missing), file=sys.stderr)
+        return 2
+    if not files:
+        print("No application files found.", file=sys.stderr)
+        return 2
+    result = rank_applications(load_applications(files, args), [str(path) for path in files])
+    if args.output:
+        text = ranking_json(result) if args.output.suffix.lower() == ".json" else ranking_csv(result)
+        write_output(args.output, text)
+        print(f"Ranking of {len(files)} application(s): {args.output}")
+    else:
+        for row, source in enumerate(result.sources):
+            print(f"{source}: {', '.join(result.selected(row))}")
+    print("Coverage: " + ", ".join(f"{project_id} {count}" for project_id, count in result.coverage().items() if count))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -4,16 +4,20 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
+import heapq
 import html
 import io
 import json
+import math
 import os
 import re
 import shutil
-import subprocess
 import sys
-import tempfile
+import threading
 import time
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Iterable
@@ -37,9 +41,33 @@ except ImportError as exc:
 
 SCRIPT_DIR = Path(__file__).resolve().parent
 REPO_ROOT = SCRIPT_DIR.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.append(str(REPO_ROOT))
+
+from tools.project_library import (
+    PROJECT_FOLDER_PATTERN,
+    ProjectFolder,
+    ProjectLibrary,
+    find_project_folders,
+    scan_library,
+    scan_project,
+)
+from tools import chrome_print
+from tools.chrome_print import ChromePrintPool, DevToolsError
+from tools.output_writer import atomic_output, report, take_report, write_output
+from tools.template_engine import load_template
+from tools.tracing import span
+
 PROJECTS_DIR = REPO_ROOT / "projects"
 DATA_DIR = SCRIPT_DIR / "data"
 DEFAULT_OUTPUT_DIR = REPO_ROOT / "output" / "pdf"
+BATCH_MANIFEST_NAME = "batch-manifest.json"
+BATCH_REPORT_NAME = "batch-report.json"
+# Chrome prints each portfolio; more parallel browsers mostly cost memory.
+DEFAULT_BATCH_JOBS = 4
+APPLICATION_SUFFIXES = {".json", ".txt"}
+# Headless browsers kept alive per process; concurrent prints queue for them.
+PRINT_BROWSERS = 1
 PORTFOLIO_TEMPLATE = SCRIPT_DIR / "templates" / "portfolio.html"
 PORTFOLIO_CSS = SCRIPT_DIR / "templates" / "portfolio.css"
 QR_ASSET = REPO_ROOT / "assets" / "qr" / "bagaturiya.svg"
@@ -59,9 +87,10 @@ STOPWORDS = {
     "experience", "skills", "role", "position", "work", "working", "office",
 }
 IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif"}
-PROJECT_FOLDER_PATTERN = re.compile(
-    r"^(?P<project_id>\d{4,})(?:-(?P<slug>[a-z0-9]+(?:-[a-z0-9]+)*))?$"
-)
+KEYWORD_SCORING_MODES = ("flat", "bm25")
+KEYWORD_POINTS_CAP = 8
+BM25_K1 = 1.2
+BM25_B = 0.75
 
 
 @dataclass
@@ -87,6 +116,34 @@ class RankedProject:
     reasons: list[str]
 
 
+@dataclass(frozen=True)
+class ProjectTerms:
+    """A project's normalized phrases and keyword tokens, as ranking compares them."""
+
+    software: frozenset[str]
+    skills: frozenset[str]
+    tags: frozenset[str]
+    tokens: frozenset[str]
+    selected: bool
+
+
+@dataclass(frozen=True)
+class LibraryState:
+    """Everything ranking reads from disk, parsed once per library version.
+
+    Shared between threads and requests: callers must treat it as read-only.
+    """
+
+    signature: tuple[Any, ...]
+    watched: tuple[Path, ...]
+    cv: dict[str, Any]
+    projects: tuple[Project, ...]
+    folders: dict[str, Path]
+    vocabulary: "VocabularyMatcher"
+    terms: dict[str, ProjectTerms]
+    keywords: "KeywordIndex"
+
+
 def load_json(path: Path) -> dict[str, Any]:
     with path.open("r", encoding="utf-8") as handle:
         return json.load(handle)
@@ -152,90 +209,69 @@ def slugify(value: str) -> str:
     return slug or "application"
 
 
-def website_hashtags(folder: Path) -> list[str]:
-    raw = read_text(folder / "hashtags.txt")
+def website_hashtags(folder: ProjectFolder) -> list[str]:
+    raw = folder.text("hashtags.txt")
     return [match.lower().lstrip("#") for match in re.findall(r"#\w+", raw)]
 
 
-def project_skills(folder: Path, fallback: Iterable[str]) -> list[str]:
+def project_skills(folder: ProjectFolder, fallback: Iterable[str]) -> list[str]:
     """Read display/ranking skills from the editable per-project skill.txt file."""
-    path = folder / "skill.txt"
-    if not path.exists():
+    if not folder.has("skill.txt"):
         return dedupe(fallback)
-    raw = read_text(path)
+    raw = folder.text("skill.txt")
     hashtag_values = re.findall(r"#[\w-]+", raw, flags=re.UNICODE)
     if hashtag_values:
         return dedupe(hashtag_values)
     return dedupe(re.split(r"[,;\n]+", raw))
 
 
-def project_year(folder: Path, configured: Any) -> str:
+def project_year(folder: ProjectFolder, configured: Any) -> str:
     year = clean_text(configured)
     if year:
         return year
-    match = re.search(r"\b(?:19|20)\d{2}\b", read_text(folder / "titledescription.txt"))
+    match = re.search(r"\b(?:19|20)\d{2}\b", folder.text("titledescription.txt"))
     return match.group(0) if match else ""
 
 
 def published_project_folders() -> dict[str, Path]:
-    projects: dict[str, Path] = {}
-    invalid: list[str] = []
-    for folder in PROJECTS_DIR.iterdir():
-        if not folder.is_dir() or folder.name.startswith("_"):
-            continue
-        match = PROJECT_FOLDER_PATTERN.fullmatch(folder.name)
-        if match is None:
-            if folder.name[:1].isdigit():
-                invalid.append(folder.name)
-            continue
-        project_id = match.group("project_id")
-        if project_id in projects:
-            raise ValueError(
-                f"Duplicate project ID {project_id}: "
-                f"{projects[project_id].name} and {folder.name}"
-            )
-        projects[project_id] = folder
-    if invalid:
-        raise ValueError(
-            "Invalid project folder name(s): " + ", ".join(sorted(invalid))
-            + ". Use NNNN-lowercase-hyphenated-title."
-        )
-    return projects
+    return find_project_folders(PROJECTS_DIR)
 
 
-def discover_media(folder: Path) -> list[str]:
+def discover_media(folder: Path | ProjectFolder) -> list[str]:
     """Return ordered image and numbered text media, excluding project metadata."""
-    def sort_key(path: Path) -> tuple[int, str]:
-        match = re.search(r"(\d+)", path.stem)
-        return (int(match.group(1)) if match else 999999, path.name.lower())
+    if not isinstance(folder, ProjectFolder):
+        folder = scan_project(folder)
+
+    def sort_key(item: Any) -> tuple[int, str]:
+        match = re.search(r"(\d+)", item.stem)
+        return (int(match.group(1)) if match else 999999, item.name.lower())
 
     metadata_stems = {
         "_readme", "description", "hashtags", "skill", "title",
         "titledescription", "trailer",
     }
     media = [
-        path for path in folder.iterdir()
-        if path.is_file()
-        and path.suffix.lower() in IMAGE_EXTENSIONS | {".txt"}
-        and path.stem.lower() not in metadata_stems | {"icon"}
+        item for item in folder.files
+        if item.suffix in IMAGE_EXTENSIONS | {".txt"}
+        and item.stem.lower() not in metadata_stems | {"icon"}
     ]
-    return [path.name for path in sorted(media, key=sort_key)]
+    return [item.name for item in sorted(media, key=sort_key)]
 
 
-def load_projects() -> list[Project]:
+def load_projects(library: ProjectLibrary | None = None) -> list[Project]:
     overrides = load_json(DATA_DIR / "projects.json")
     projects: list[Project] = []
-    folders = published_project_folders()
-    for project_id in sorted(folders, key=int, reverse=True):
-        folder = folders[project_id]
+    library = library or scan_library(PROJECTS_DIR)
+    for folder in library.projects:
+        project_id = folder.project_id
         extra = overrides.get(project_id, {})
         site_tags = website_hashtags(folder)
         projects.append(
             Project(
                 project_id=project_id,
-                folder=folder,
-                title=clean_text(read_text(folder / "title.txt") or folder.name),
-                description=clean_text(read_text(folder / "description.txt")),
+                folder=folder.path,
+                title=clean_text(folder.text("title.txt") or folder.name),
+                description=clean_text(folder.text("description.txt")),
                 website_tags=site_tags,
                 year=project_year(folder, extra.get("year", "")),
                 tags=dedupe([*site_tags, *extra.get("tags", [])]),
@@ -264,6 +300,7 @@ def load_application(path: Path, args: argparse.Namespace) -> dict[str, Any]:
         "project_limit": args.project_limit,
         "include_hobbies": args.include_hobbies,
         "hobby_categories": split_csv(args.hobby_categories),
+        "keyword_scoring": args.keyword_scoring,
     }
     for key, value in overrides.items():
         if value not in (None, [], ""):
@@ -281,23 +318,40 @@ def load_application(path: Path, args: argparse.Namespace) -> dict[str, Any]:
     application.setdefault("include_hobbies", True)
     application.setdefault("hobby_categories", [])
     application.setdefault("hobby_item_limit", 5)
+    application.setdefault("keyword_scoring", "flat")
     return application
 
 
-def meaningful_tokens(value: Any) -> set[str]:
-    return {
+def meaningful_token_list(value: Any) -> list[str]:
+    return [
         token for token in normalize(value).split()
         if len(token) >= 4 and token not in STOPWORDS
-    }
+    ]
 
 
-def enrich_application(
-    application: dict[str, Any], projects: list[Project], cv: dict[str, Any]
-) -> dict[str, Any]:
-    """Detect known software/skills/focus phrases in pasted vacancy text."""
-    job_text = normalize(
-        f"{application.get('position', '')} {application.get('job_description', '')}"
+def meaningful_tokens(value: Any) -> set[str]:
+    return set(meaningful_token_list(value))
+
+
+def project_text(project: Project) -> str:
+    return " ".join(
+        [project.title, project.description, *project.tags, *project.software, *project.skills]
     )
+
+
+def project_terms(project: Project) -> ProjectTerms:
+    return ProjectTerms(
+        software=frozenset(normalize(item) for item in project.software),
+        skills=frozenset(normalize(item) for item in project.skills),
+        tags=frozenset(normalize(item) for item in project.tags),
+        tokens=frozenset(meaningful_tokens(project_text(project))),
+        selected="selected" in [normalize(tag) for tag in project.website_tags],
+    )
+
+
+def known_vocabulary(projects: Iterable[Project], cv: dict[str, Any]) -> dict[str, list[str]]:
+    """Return the software, skill and focus phrases that vacancy text can mention."""
+    projects = list(projects)
     software_groups = [
         group for group in cv.get("skill_groups", [])
         if normalize(group.get("name", "")) == "software"
@@ -309,7 +363,7 @@ def enrich_application(
         if normalize(group.get("name", "")) != "software"
         for item in group.get("items", [])
     ]
-    known = {
+    return {
         "software": dedupe_vocabulary([
             *(item for project in projects for item in project.software),
             *cv_software,
@@ -320,9 +374,86 @@ def enrich_application(
         ]),
         "focus": dedupe_vocabulary(item for project in projects for item in project.tags),
     }
+
+
+def phrase_tokens(value: Any) -> list[str]:
+    """Normalized words, with a plural ``s`` dropped so "facades" finds "facade"."""
+    return [
+        token[:-1] if len(token) > 3 and token.endswith("s") and not token.endswith("ss") else token
+        for token in normalize(value).split()
+    ]
+
+
+class VocabularyMatcher:
+    """Aho-Corasick automaton over the word sequences of the known vocabulary.
+
+    ``detect()`` reads the vacancy text once, word by word, however many
+    terms there are. Matching whole words means "art" does not fire inside
+    "start". Build one per vocabulary and reuse it.
+    """
+
+    def __init__(self, known: dict[str, list[str]]) -> None:
+        self.known = known
+        self.entries: list[tuple[str, str]] = []
+        self.goto: list[dict[str, int]] = [{}]
+        self.outputs: list[list[int]] = [[]]
+        for category, items in known.items():
+            for item in items:
+                words = phrase_tokens(item)
+                if not words:
+                    continue
+                state = 0
+                for word in words:
+                    following = self.goto[state].get(word)
+                    if following is None:
+                        following = len(self.goto)
+                        self.goto[state][word] = following
+                        self.goto.append({})
+                        self.outputs.append([])
+                    state = following
+                self.outputs[state].append(len(self.entries))
+                self.entries.append((category, item))
+        self.fail = [0] * len(self.goto)
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for word, following in self.goto[state].items():
+                queue.append(following)
+                fallback = self.fail[state]
+                while fallback and word not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[following] = self.goto[fallback].get(word, 0)
+                self.outputs[following] = self.outputs[following] + self.outputs[self.fail[following]]
+
+    def detect(self, text: str) -> dict[str, list[str]]:
+        """Return the terms of each category found in ``text``, in vocabulary order."""
+        found: set[int] = set()
+        state = 0
+        for word in phrase_tokens(text):
+            while state and word not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(word, 0)
+            found.update(self.outputs[state])
+        detected: dict[str, list[str]] = {category: [] for category in self.known}
+        for index in sorted(found):
+            category, item = self.entries[index]
+            detected[category].append(item)
+        return detected
+
+
+def enrich_application(
+    application: dict[str, Any],
+    projects: list[Project],
+    cv: dict[str, Any],
+    vocabulary: VocabularyMatcher | None = None,
+) -> dict[str, Any]:
+    """Detect known software/skills/focus phrases in pasted vacancy text."""
+    matcher = vocabulary if vocabulary is not None else VocabularyMatcher(known_vocabulary(projects, cv))
+    found = matcher.detect(
+        f"{application.get('position', '')} {application.get('job_description', '')}"
+    )
     inferred: dict[str, list[str]] = {}
-    for key, vocabulary in known.items():
-        detected = [item for item in vocabulary if normalize(item) in job_text]
+    for key, detected in found.items():
         existing = application.get(key, [])
         application[key] = dedupe([*existing, *detected])
         existing_normalized = {normalize(item) for item in existing}
@@ -332,64 +463,183 @@ def enrich_application(
 
 
 def phrase_matches(wanted: Iterable[str], available: Iterable[str]) -> list[str]:
-    available_normalized = {normalize(item) for item in available}
+    return normalized_phrase_matches(wanted, {normalize(item) for item in available})
+
+
+def normalized_phrase_matches(wanted: Iterable[str], available_normalized: frozenset[str] | set[str]) -> list[str]:
     return [clean_text(item) for item in wanted if normalize(item) in available_normalized]
 
 
-def rank_projects(projects: list[Project], application: dict[str, Any]) -> list[RankedProject]:
+def application_tokens(application: dict[str, Any]) -> set[str]:
     structured_text = " ".join(
         clean_text(item)
         for key in ("software", "skills", "focus")
         for item in application.get(key, [])
     )
-    job_tokens = meaningful_tokens(
+    return meaningful_tokens(
         f"{application.get('position', '')} {application.get('job_description', '')} {structured_text}"
     )
+
+
+def rank_key(item: RankedProject) -> tuple[float, float, str]:
+    return (-item.score, -item.project.priority, item.project.project_id)
+
+
+def score_project(
+    project: Project,
+    profile: ProjectTerms,
+    application: dict[str, Any],
+    keyword_matches: list[str],
+    keyword_points: float,
+    included: bool,
+) -> RankedProject:
+    """Add up one project's boosts; keyword credit comes from the scoring mode."""
+    score = project.priority
+    reasons: list[str] = []
+    if project.priority:
+        reasons.append(f"library priority +{project.priority:g}")
+
+    software_matches = normalized_phrase_matches(application.get("software", []), profile.software)
+    skill_matches = normalized_phrase_matches(application.get("skills", []), profile.skills)
+    focus_matches = normalized_phrase_matches(application.get("focus", []), profile.tags)
+    if software_matches:
+        points = 10 * len(software_matches)
+        score += points
+        reasons.append(f"software: {', '.join(software_matches)} +{points:g}")
+    if skill_matches:
+        points = 6 * len(skill_matches)
+        score += points
+        reasons.append(f"skills: {', '.join(skill_matches)} +{points:g}")
+    if focus_matches:
+        points = 5 * len(focus_matches)
+        score += points
+        reasons.append(f"focus: {', '.join(focus_matches)} +{points:g}")
+
+    if keyword_matches:
+        score += keyword_points
+        reasons.append(f"keywords: {', '.join(keyword_matches[:8])} +{keyword_points:g}")
+    if profile.selected:
+        score += 1
+        reasons.append("website #selected +1")
+    if included:
+        score += 1000
+        reasons.append("explicitly included +1000")
+    return RankedProject(project=project, score=score, reasons=reasons)
+
+
+class KeywordIndex:
+    """Postings of every project's keywords and phrases, for BM25 ranking.
+
+    ``rank()`` scores only the projects that share a keyword or a
+    software/skill/focus phrase with the application, or are explicitly
+    included, so its scoring cost follows the matching postings. Every other
+    project can only earn its priority and #selected points, which are ranked
+    once here and merged in behind the scored ones.
+    """
+
+    def __init__(self, projects: Iterable[Project], terms: dict[str, ProjectTerms]) -> None:
+        self.projects = {project.project_id: project for project in projects}
+        self.terms = terms
+        self.postings: dict[str, list[tuple[str, int]]] = defaultdict(list)
+        self.phrases: dict[str, dict[str, set[str]]] = {
+            "software": defaultdict(set), "skills": defaultdict(set), "focus": defaultdict(set),
+        }
+        self.lengths: dict[str, int] = {}
+        for project_id, project in self.projects.items():
+            counts = Counter(meaningful_token_list(project_text(project)))
+            self.lengths[project_id] = sum(counts.values())
+            for token, count in counts.items():
+                self.postings[token].append((project_id, count))
+            profile = terms[project_id]
+            for key, phrases in (("software", profile.software), ("skills", profile.skills), ("focus", profile.tags)):
+                for phrase in phrases:
+                    self.phrases[key][phrase].add(project_id)
+        count = len(self.projects)
+        self.average_length = sum(self.lengths.values()) / count if count else 0
+        self.idf = {
+            token: math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for token, postings in self.postings.items()
+        }
+        self.baseline = sorted(
+            (
+                score_project(project, terms[project_id], {}, [], 0, False)
+                for project_id, project in self.projects.items()
+                if not project.exclude
+            ),
+            key=rank_key,
+        )
+
+    def bm25(self, tokens: Iterable[str]) -> tuple[dict[str, float], dict[str, list[str]]]:
+        """Return each matching project's BM25 score and matched tokens."""
+        scores: dict[str, float] = defaultdict(float)
+        matches: dict[str, list[str]] = defaultdict(list)
+        for token in sorted(tokens):
+            idf = self.idf.get(token)
+            if idf is None:
+                continue
+            for project_id, frequency in self.postings[token]:
+                norm = 1 - BM25_B + BM25_B * self.lengths[project_id] / self.average_length
+                scores[project_id] += idf * frequency * (BM25_K1 + 1) / (frequency + BM25_K1 * norm)
+                matches[project_id].append(token)
+        return scores, matches
+
+    def rank(self, application: dict[str, Any]) -> list[RankedProject]:
+        included = {str(item) for item in application.get("include_projects", [])}
+        excluded = {str(item) for item in application.get("exclude_projects", [])}
+        scores, matches = self.bm25(application_tokens(application))
+        candidates = set(scores) | included
+        for key in ("software", "skills", "focus"):
+            for item in application.get(key, []):
+                candidates.update(self.phrases[key].get(normalize(item), ()))
+        ranked = []
+        for project_id in candidates:
+            project = self.projects.get(project_id)
+            if project is None or project.exclude or project_id in excluded:
+                continue
+            points = round(min(scores.get(project_id, 0), KEYWORD_POINTS_CAP), 2)
+            ranked.append(score_project(
+                project, self.terms[project_id], application,
+                matches.get(project_id, []), points, project_id in included,
+            ))
+        ranked.sort(key=rank_key)
+        rest = (
+            RankedProject(project=item.project, score=item.score, reasons=list(item.reasons))
+            for item in self.baseline
+            if item.project.project_id not in candidates and item.project.project_id not in excluded
+        )
+        return list(heapq.merge(ranked, rest, key=rank_key))
+
+
+def rank_projects(
+    projects: list[Project],
+    application: dict[str, Any],
+    terms: dict[str, ProjectTerms] | None = None,
+    keywords: KeywordIndex | None = None,
+) -> list[RankedProject]:
+    """Rank projects for an application.
+
+    ``keyword_scoring`` picks the keyword credit: ``flat`` (the default) gives
+    one point per shared keyword, at most 8; ``bm25`` weights them by rarity
+    and frequency through a ``KeywordIndex``, also capped at 8 points.
+    """
+    terms = terms or {project.project_id: project_terms(project) for project in projects}
+    if application.get("keyword_scoring") == "bm25":
+        return (keywords or KeywordIndex(projects, terms)).rank(application)
+
+    job_tokens = application_tokens(application)
     included = {str(item) for item in application.get("include_projects", [])}
     excluded = {str(item) for item in application.get("exclude_projects", [])}
     ranked: list[RankedProject] = []
-
     for project in projects:
         if project.exclude or project.project_id in excluded:
             continue
-        score = project.priority
-        reasons: list[str] = []
-        if project.priority:
-            reasons.append(f"library priority +{project.priority:g}")
-
-        software_matches = phrase_matches(application.get("software", []), project.software)
-        skill_matches = phrase_matches(application.get("skills", []), project.skills)
-        focus_matches = phrase_matches(application.get("focus", []), project.tags)
-        if software_matches:
-            points = 10 * len(software_matches)
-            score += points
-            reasons.append(f"software: {', '.join(software_matches)} +{points:g}")
-        if skill_matches:
-            points = 6 * len(skill_matches)
-            score += points
-            reasons.append(f"skills: {', '.join(skill_matches)} +{points:g}")
-        if focus_matches:
-            points = 5 * len(focus_matches)
-            score += points
-            reasons.append(f"focus: {', '.join(focus_matches)} +{points:g}")
-
-        project_text = " ".join(
-            [project.title, project.description, *project.tags, *project.software, *project.skills]
-        )
-        token_matches = sorted(job_tokens & meaningful_tokens(project_text))
-        if token_matches:
-            points = min(len(token_matches), 8)
-            score += points
-            reasons.append(f"keywords: {', '.join(token_matches[:8])} +{points:g}")
-        if "selected" in [normalize(tag) for tag in project.website_tags]:
-            score += 1
-            reasons.append("website #selected +1")
-        if project.project_id in included:
-            score += 1000
-            reasons.append("explicitly included +1000")
-        ranked.append(RankedProject(project=project, score=score, reasons=reasons))
-
-    return sorted(ranked, key=lambda item: (-item.score, -item.project.priority, item.project.project_id))
+        profile = terms[project.project_id]
+        token_matches = sorted(job_tokens & profile.tokens)
+        ranked.append(score_project(
+            project, profile, application,
+            token_matches, min(len(token_matches), KEYWORD_POINTS_CAP), project.project_id in included,
+        ))
+    return sorted(ranked, key=rank_key)
 
 
 def wrap_lines(text: str, font: str, size: float, max_width: float, max_lines: int | None = None) -> list[str]:
@@ -525,7 +775,8 @@ def render_portfolio_reportlab(
 ) -> None:
     destination.parent.mkdir(parents=True, exist_ok=True)
     page_width, page_height = landscape(A4)
-    pdf = canvas.Canvas(str(destination), pagesize=(page_width, page_height), pageCompression=1)
+    # invariant=1 drops the timestamp and random ID, so unchanged input gives identical bytes.
+    pdf = canvas.Canvas(str(destination), pagesize=(page_width, page_height), pageCompression=1, invariant=1)
     pdf.setTitle(f"{cv['name']} - Portfolio - {application['office']}")
     pdf.setAuthor(cv["name"])
 
@@ -646,7 +897,8 @@ def ensure_qr_asset() -> Path:
     size = 96
     drawing = Drawing(size, size, transform=[size / (x2 - x1), 0, 0, size / (y2 - y1), 0, 0])
     drawing.add(widget)
-    renderSVG.drawToFile(drawing, str(QR_ASSET))
+    with atomic_output(QR_ASSET) as destination:
+        renderSVG.drawToFile(drawing, str(destination))
     return QR_ASSET
 
 
@@ -669,7 +921,9 @@ def portfolio_image_asset(
         background.alpha_composite(image)
         flattened = background.convert("RGB")
         flattened.thumbnail((max_pixels, max_pixels), Image.Resampling.LANCZOS)
-        flattened.save(destination, "JPEG", quality=83, optimize=True, progressive=True)
+        # Parallel batch jobs can create the same derivative; each replaces it whole.
+        with atomic_output(destination) as temporary:
+            flattened.save(temporary, "JPEG", quality=83, optimize=True, progressive=True)
     return destination
 
 
@@ -705,7 +959,7 @@ def build_portfolio_html(
     selected: list[RankedProject],
     full_portfolio: bool = False,
 ) -> str:
-    template = PORTFOLIO_TEMPLATE.read_text(encoding="utf-8")
+    template = load_template(PORTFOLIO_TEMPLATE)
     stylesheet = PORTFOLIO_CSS.read_text(encoding="utf-8")
     qr_asset = ensure_qr_asset()
     portrait_folder = published_project_folders().get("2409")
@@ -1018,15 +1272,20 @@ def build_portfolio_html(
         styles = '<link rel="stylesheet" href="portfolio-export/templates/portfolio.css" />'
     else:
         styles = f"<style>{stylesheet}</style>"
-    return (template
-            .replace("{{DOCUMENT_TITLE}}", html.escape(title))
-            .replace("{{PORTFOLIO_STYLES}}", styles)
-            .replace("{{FAVICON_URL}}", portfolio_asset_url(REPO_ROOT / "assets" / "favicon" / "favicon.svg", html_destination))
-            .replace("{{EXPORT_ID}}", html.escape(export_id))
-            .replace("{{COVER}}", cover)
-            .replace("{{CONTENTS}}", cv_page_one + cv_page_two + contents)
-            .replace("{{PROJECTS}}", "\n".join(project_pages))
-            .replace("{{CLOSING}}", closing))
+    return template.render({
+        "DOCUMENT_TITLE": html.escape(title),
+        "PORTFOLIO_STYLES": styles,
+        "FAVICON_URL": portfolio_asset_url(REPO_ROOT / "assets" / "favicon" / "favicon.svg", html_destination),
+        "EXPORT_ID": html.escape(export_id),
+        "COVER": cover,
+        "CONTENTS": cv_page_one + cv_page_two + contents,
+        "PROJECTS": "\n".join(project_pages),
+        "CLOSING": closing,
+    })
+
+
+_print_pool: ChromePrintPool | None = None
+_print_pool_lock = threading.Lock()
 
 
 def chrome_executable() -> str | None:
@@ -1040,60 +1299,30 @@ def chrome_executable() -> str | None:
     return next((str(path) for path in candidates if path and Path(path).exists()), None)
 
 
+def print_pool() -> ChromePrintPool | None:
+    """Return this process's shared Chrome print pool, or None without Chrome."""
+    global _print_pool
+    with _print_pool_lock:
+        if _print_pool is None:
+            browser = chrome_executable()
+            if not browser or not chrome_print.supported():
+                return None
+            _print_pool = ChromePrintPool(browser, size=PRINT_BROWSERS)
+        return _print_pool
+
+
 def print_html_to_pdf(source: Path, destination: Path) -> bool:
-    browser = chrome_executable()
-    if not browser:
+    pool = print_pool()
+    if pool is None:
         return False
     destination.parent.mkdir(parents=True, exist_ok=True)
-    destination.unlink(missing_ok=True)
-    with tempfile.TemporaryDirectory(prefix="portfolio-chrome-") as profile:
-        process = subprocess.Popen(
-            [
-                browser,
-                "--headless=new",
-                "--disable-gpu",
-                "--disable-breakpad",
-                "--disable-extensions",
-                "--disable-dev-shm-usage",
-                "--no-sandbox",
-                "--no-first-run",
-                "--no-pdf-header-footer",
-                "--allow-file-access-from-files",
-                "--run-all-compositor-stages-before-draw",
-                "--virtual-time-budget=10000",
-                f"--user-data-dir={profile}",
-                f"--print-to-pdf={destination}",
-                source.resolve().as_uri(),
-            ],
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-        )
-        deadline = time.monotonic() + 90
-        previous_size = -1
-        stable_checks = 0
-        success = False
-        while time.monotonic() < deadline:
-            if destination.exists() and destination.stat().st_size > 1000:
-                size = destination.stat().st_size
-                stable_checks = stable_checks + 1 if size == previous_size else 0
-                previous_size = size
-                if stable_checks >= 4:
-                    success = True
-                    break
-            if process.poll() is not None:
-                success = destination.exists() and destination.stat().st_size > 1000
-                break
-            time.sleep(.25)
-        if process.poll() is None:
-            process.terminate()
-            try:
-                process.wait(timeout=5)
-            except subprocess.TimeoutExpired:
-                process.kill()
-                process.wait()
-    if not success:
-        print("Warning: browser PDF export did not complete.", file=sys.stderr)
-    return success
+    try:
+        pool.print_to_pdf(source, destination)
+    except (DevToolsError, OSError) as exc:
+        print(f"Warning: browser PDF export did not complete: {exc}", file=sys.stderr)
+        destination.unlink(missing_ok=True)
+        return False
+    return True
 
 
 def render_portfolio(
@@ -1106,38 +1335,45 @@ def render_portfolio(
 ) -> Path:
     """Render portfolio HTML from the shared template, then print that HTML to PDF."""
     html_destination = html_destination or destination.with_suffix(".html")
-    html_destination.parent.mkdir(parents=True, exist_ok=True)
-    html_destination.write_text(
-        build_portfolio_html(
+    with span("build_portfolio_html", "export", projects=len(selected)):
+        write_output(
             html_destination,
-            cv,
-            application,
-            selected,
-            full_portfolio,
-        ),
-        encoding="utf-8",
-    )
-    if not print_html_to_pdf(html_destination, destination):
-        print("Warning: falling back to the legacy ReportLab portfolio renderer.", file=sys.stderr)
-        render_portfolio_reportlab(destination, cv, application, selected)
+            build_portfolio_html(
+                html_destination,
+                cv,
+                application,
+                selected,
+                full_portfolio,
+            ),
+        )
+    with atomic_output(destination) as pdf_path:
+        with span("print_html_to_pdf", "export") as info:
+            info["printed"] = printed = print_html_to_pdf(html_destination, pdf_path)
+        if not printed:
+            print("Warning: falling back to the legacy ReportLab portfolio renderer.", file=sys.stderr)
+            with span("render_portfolio_reportlab", "export", projects=len(selected)):
+                render_portfolio_reportlab(pdf_path, cv, application, selected)
     return html_destination
 
 
 def generate_full_portfolio() -> tuple[Path, Path]:
     """Generate the canonical public portfolio containing every publishable project."""
-    cv_data = load_json(DATA_DIR / "cv.json")
-    projects = [project for project in load_projects() if not project.exclude]
-    selected = [RankedProject(project=project, score=0, reasons=[]) for project in projects]
-    html_path = REPO_ROOT / "portfolio.html"
-    pdf_path = REPO_ROOT / "assets" / "downloads" / "Ivan_Bagaturiya_Portfolio.pdf"
-    render_portfolio(
-        pdf_path,
-        cv_data,
-        {"office": "", "position": ""},
-        selected,
-        html_destination=html_path,
-        full_portfolio=True,
-    )
+    with span("generate_full_portfolio", "export"):
+        cv_data = load_json(DATA_DIR / "cv.json")
+        with span("load_projects", "export") as info:
+            projects = [project for project in load_projects() if not project.exclude]
+            info["projects"] = len(projects)
+        selected = [RankedProject(project=project, score=0, reasons=[]) for project in projects]
+        html_path = REPO_ROOT / "portfolio.html"
+        pdf_path = REPO_ROOT / "assets" / "downloads" / "Ivan_Bagaturiya_Portfolio.pdf"
+        render_portfolio(
+            pdf_path,
+            cv_data,
+            {"office": "", "position": ""},
+            selected,
+            html_destination=html_path,
+            full_portfolio=True,
+        )
     return html_path, pdf_path
 
 
@@ -1201,7 +1437,7 @@ def render_cv(
 ) -> None:
     destination.parent.mkdir(parents=True, exist_ok=True)
     page_width, page_height = A4
-    pdf = canvas.Canvas(str(destination), pagesize=A4, pageCompression=1)
+    pdf = canvas.Canvas(str(destination), pagesize=A4, pageCompression=1, invariant=1)
     pdf.setTitle(f"{cv['name']} - CV - {application['office']}")
     pdf.setAuthor(cv["name"])
     margin = 34
@@ -1390,19 +1626,87 @@ def prepare_application(application: dict[str, Any]) -> dict[str, Any]:
     prepared.setdefault("include_hobbies", True)
     prepared.setdefault("hobby_categories", [])
     prepared.setdefault("hobby_item_limit", 5)
+    prepared.setdefault("keyword_scoring", "flat")
     return prepared
 
 
+_library_lock = threading.Lock()
+_library_state: LibraryState | None = None
+
+
+def stat_signature(paths: Iterable[Path]) -> tuple[Any, ...]:
+    """Return the size and mtime of each path, or None for missing ones."""
+    signature = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            signature.append(None)
+        else:
+            signature.append((stat.st_size, stat.st_mtime_ns))
+    return tuple(signature)
+
+
+def library_watched_paths(library: ProjectLibrary) -> tuple[Path, ...]:
+    """Paths whose mtimes change whenever anything ranking reads changes.
+
+    Folder mtimes change when files are added, removed or renamed; text
+    files are listed on their own because editing one in place does not touch
+    its folder. Ranking only reads image names, so their contents are not
+    watched here; ``export_fingerprint`` adds them for generated packages.
+    """
+    paths = [DATA_DIR / "cv.json", DATA_DIR / "projects.json", PROJECTS_DIR]
+    for folder in library.projects:
+        paths.append(folder.path)
+        paths.extend(folder.path / item.name for item in folder.files if item.suffix == ".txt")
+    return tuple(paths)
+
+
+def library_state() -> LibraryState:
+    """Return the parsed CV and project library, re-reading them only after a change.
+
+    Checking costs one ``stat`` per watched path, so repeated previews no
+    longer re-read and re-parse the library on every call.
+    """
+    global _library_state
+    with _library_lock:
+        state = _library_state
+        if state is not None and stat_signature(state.watched) == state.signature:
+            return state
+        library = scan_library(PROJECTS_DIR)
+        watched = library_watched_paths(library)
+        # Sign before reading so an edit made during the reload triggers another one.
+        signature = stat_signature(watched)
+        cv_data = load_json(DATA_DIR / "cv.json")
+        projects = tuple(load_projects(library))
+        terms = {project.project_id: project_terms(project) for project in projects}
+        _library_state = LibraryState(
+            signature=signature,
+            watched=watched,
+            cv=cv_data,
+            projects=projects,
+            folders=library.folders(),
+            vocabulary=VocabularyMatcher(known_vocabulary(projects, cv_data)),
+            terms=terms,
+            keywords=KeywordIndex(projects, terms),
+        )
+        return _library_state
+
+
 def preview_application(
     application: dict[str, Any],
 ) -> tuple[dict[str, Any], dict[str, Any], list[Project], list[RankedProject]]:
     """Enrich an application and rank projects without writing any files."""
     prepared = prepare_application(application)
-    cv_data = load_json(DATA_DIR / "cv.json")
-    projects = load_projects()
-    prepared = enrich_application(prepared, projects, cv_data)
-    ranked = rank_projects(projects, prepared)
-    return prepared, cv_data, projects, ranked
+    state = library_state()
+    projects = list(state.projects)
+    prepared = enrich_application(prepared, projects, state.cv, state.vocabulary)
+    ranked = rank_projects(projects, prepared, state.terms, state.keywords)
+    return prepared, state.cv, projects, ranked
+
+
+def application_target_dir(prepared: dict[str, Any], output_dir: Path) -> Path:
+    return output_dir.resolve() / slugify(f"{prepared['office']} {prepared['position']}")
 
 
 def generate_application(
@@ -1411,14 +1715,24 @@ def generate_application(
     application_source: str | Path = "local application generator",
 ) -> dict[str, Any]:
     """Generate one tailored package and return its manifest."""
-    prepared, cv_data, _projects, ranked = preview_application(application)
+    with span("generate_application", "export"):
+        return _generate_application(application, output_dir, application_source)
+
+
+def _generate_application(
+    application: dict[str, Any],
+    output_dir: Path,
+    application_source: str | Path,
+) -> dict[str, Any]:
+    with span("preview_application", "export") as info:
+        prepared, cv_data, _projects, ranked = preview_application(application)
+        info["ranked"] = len(ranked)
     if not ranked:
         raise ValueError("No publishable projects are available for this application.")
 
     project_limit = max(1, min(int(prepared.get("project_limit", 4)), len(ranked)))
     selected = ranked[:project_limit]
-    target_slug = slugify(f"{prepared['office']} {prepared['position']}")
-    target_dir = output_dir.resolve() / target_slug
+    target_dir = application_target_dir(prepared, output_dir)
     target_dir.mkdir(parents=True, exist_ok=True)
     portfolio_path = target_dir / "Ivan_Bagaturiya_Portfolio.pdf"
     portfolio_html_path = target_dir / "Ivan_Bagaturiya_Portfolio.html"
@@ -1426,11 +1740,9 @@ def generate_application(
     manifest_path = target_dir / "selection.json"
     application_path = target_dir / "application.json"
 
-    application_path.write_text(
-        json.dumps(prepared, indent=2, ensure_ascii=False) + "\n",
-        encoding="utf-8",
-    )
-    render_cv(cv_path, cv_data, prepared, selected)
+    write_output(application_path, json.dumps(prepared, indent=2, ensure_ascii=False) + "\n")
+    with span("render_cv", "export"), atomic_output(cv_path) as cv_temporary:
+        render_cv(cv_temporary, cv_data, prepared, selected)
     render_portfolio(
         portfolio_path,
         cv_data,
@@ -1444,18 +1756,186 @@ def generate_application(
     manifest["outputs"]["application"] = str(application_path)
     manifest["outputs"]["portfolio_html"] = str(portfolio_html_path)
     manifest["outputs"]["selection"] = str(manifest_path)
-    manifest_path.write_text(
-        json.dumps(manifest, indent=2, ensure_ascii=False) + "\n",
-        encoding="utf-8",
-    )
+    write_output(manifest_path, json.dumps(manifest, indent=2, ensure_ascii=False) + "\n")
     return manifest
 
 
+def export_fingerprint() -> str:
+    """Hash everything besides the application that shapes a package.
+
+    Packages embed the project images, so besides the library signature every
+    file's size and mtime counts, as does the source of this script and of
+    every ``tools`` module it has loaded.
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps(library_state().signature).encode("utf-8"))
+    library = scan_library(PROJECTS_DIR)
+    files = [
+        [folder.name, [[item.name, item.size, item.mtime_ns] for item in folder.files]]
+        for folder in library.projects
+    ]
+    digest.update(json.dumps(files).encode("utf-8"))
+    modules = sorted(
+        Path(module.__file__) for name, module in list(sys.modules.items())
+        if name.startswith("tools.") and getattr(module, "__file__", None)
+    )
+    for path in (Path(__file__).resolve(), *modules, PORTFOLIO_TEMPLATE, PORTFOLIO_CSS, TITLE_PAGE_IMAGE):
+        try:
+            digest.update(path.read_bytes())
+        except OSError:
+            digest.update(b"-")
+    return digest.hexdigest()
+
+
+def application_files(directory: Path) -> list[Path]:
+    return sorted(
+        path for path in directory.iterdir()
+        if path.is_file() and path.suffix.lower() in APPLICATION_SUFFIXES
+    )
+
+
+def _batch_job(task: tuple[str, dict[str, Any], Path]) -> dict[str, Any]:
+    """Generate one package in a pool worker; failures are reported, not raised."""
+    source, application, output_dir = task
+    take_report()
+    started = time.perf_counter()
+    try:
+        manifest = generate_application(application, output_dir, source)
+    except Exception as exc:
+        return {
+            "source": source,
+            "status": "failed",
+            "seconds": round(time.perf_counter() - started, 3),
+            "error": f"{type(exc).__name__}: {exc}",
+        }
+    output = take_report()
+    return {
+        "source": source,
+        "status": "generated",
+        "seconds": round(time.perf_counter() - started, 3),
+        "output_directory": str(Path(manifest["outputs"]["portfolio"]).parent),
+        "selection": [item["project"] for item in manifest["selection"]],
+        "files_written": output.written,
+        "files_unchanged": output.unchanged,
+    }
+
+
+def generate_batch(
+    paths: list[Path],
+    args: argparse.Namespace,
+    output_dir: Path = DEFAULT_OUTPUT_DIR,
+    jobs: int = DEFAULT_BATCH_JOBS,
+    force: bool = False,
+) -> dict[str, Any]:
+    """Generate a package per vacancy file across a process pool; return the report.
+
+    A vacancy is skipped when its enriched ``application.json`` matches the
+    one from the last run, the library, templates and generator are unchanged,
+    and its outputs still exist. The report lists every job with its status
+    and timing and is written to ``batch-report.json`` in ``output_dir``.
+    """
+    output_dir = output_dir.resolve()
+    manifest_path = output_dir / BATCH_MANIFEST_NAME
+    try:
+        previous = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        previous = {}
+    state = library_state()
+    fingerprint = export_fingerprint()
+    # Create shared assets once, before workers could race to create them.
+    ensure_qr_asset()
+
+    results: list[dict[str, Any]] = []
+    digests: dict[str, str] = {}
+    tasks: list[tuple[str, dict[str, Any], Path]] = []
+    targets: dict[Path, str] = {}
+    with span("batch_plan", "export", applications=len(paths)):
+        for path in paths:
+            source = str(path.resolve())
+            try:
+                application = load_application(path, args)
+                prepared = enrich_application(prepare_application(application), [], state.cv, state.vocabulary)
+            except (OSError, ValueError) as exc:
+                results.append({"source": source, "status": "failed", "seconds": 0, "error": str(exc)})
+                continue
+            target_dir = application_target_dir(prepared, output_dir)
+            if target_dir in targets:
+                results.append({
+                    "source": source, "status": "failed", "seconds": 0,
+                    "error": f"same office and position as {targets[target_dir]}",
+                })
+                continue
+            targets[target_dir] = source
+            payload = json.dumps(prepared, indent=2, ensure_ascii=False) + "\n"
+            digests[source] = hashlib.sha256(f"{fingerprint}\n{payload}".encode("utf-8")).hexdigest()
+            outputs = [target_dir / name for name in (
+                "application.json", "selection.json", "Ivan_Bagaturiya_CV.pdf", "Ivan_Bagaturiya_Portfolio.pdf",
+            )]
+            current = (
+                not force
+                and previous.get(source) == digests[source]
+                and all(output.exists() for output in outputs)
+                and outputs[0].read_text(encoding="utf-8") == payload
+            )
+            if current:
+                results.append({"source": source, "status": "skipped", "seconds": 0, "output_directory": str(target_dir)})
+            else:
+                tasks.append((source, application, output_dir))
+
+    started = time.perf_counter()
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(tasks) or 1))
+    with span("generate_batch", "export", jobs=jobs, tasks=len(tasks)):
+        if jobs > 1:
+            # Workers inherit (or load once) the parsed library through library_state().
+            with ProcessPoolExecutor(max_workers=jobs, initializer=library_state) as executor:
+                results.extend(executor.map(_batch_job, tasks))
+        else:
+            results.extend(_batch_job(task) for task in tasks)
+
+    failed = {result["source"] for result in results if result["status"] == "failed"}
+    write_output(manifest_path, json.dumps({
+        source: digest for source, digest in sorted(digests.items()) if source not in failed
+    }, indent=2) + "\n")
+    order = {str(path.resolve()): index for index, path in enumerate(paths)}
+    results.sort(key=lambda result: order.get(result["source"], len(order)))
+    counts = Counter(result["status"] for result in results)
+    batch_report = {
+        "jobs": jobs,
+        "seconds": round(time.perf_counter() - started, 3),
+        "generated": counts["generated"],
+        "skipped": counts["skipped"],
+        "failed": counts["failed"],
+        "results": results,
+    }
+    write_output(output_dir / BATCH_REPORT_NAME, json.dumps(batch_report, indent=2, ensure_ascii=False) + "\n")
+    return batch_report
+
+
+def batch_main(args: argparse.Namespace, directory: Path) -> int:
+    paths = application_files(directory)
+    if not paths:
+        print(f"No application JSON or text files in {directory}", file=sys.stderr)
+        return 2
+    batch_report = generate_batch(paths, args, args.output_dir, args.jobs, args.force)
+    for result in batch_report["results"]:
+        detail = result.get("error") or result.get("output_directory", "")
+        print(f"{result['status']:>9}  {result['seconds']:7.2f}s  {Path(result['source']).name}  {detail}")
+    print(
+        f"{batch_report['generated']} generated, {batch_report['skipped']} skipped, "
+        f"{batch_report['failed']} failed in {batch_report['seconds']:.1f}s with {batch_report['jobs']} job(s). "
+        f"Report: {args.output_dir.resolve() / BATCH_REPORT_NAME}"
+    )
+    return 1 if batch_report["failed"] else 0
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Generate a tailored PDF portfolio and CV from the existing project library."
     )
-    parser.add_argument("application", type=Path, help="Application JSON or plain-text vacancy")
+    parser.add_argument(
+        "application", type=Path,
+        help="Application JSON or plain-text vacancy, or a folder of them to generate in a batch",
+    )
     parser.add_argument("--office")
     parser.add_argument("--position")
     parser.add_argument("--software", help="Comma-separated software")
@@ -1467,7 +1947,17 @@ def parse_args() -> argparse.Namespace:
     hobby_group.add_argument("--no-hobbies", dest="include_hobbies", action="store_false")
     parser.set_defaults(include_hobbies=None)
     parser.add_argument("--hobby-categories", help="Comma-separated hobby categories")
+    parser.add_argument(
+        "--keyword-scoring",
+        choices=KEYWORD_SCORING_MODES,
+        help="flat: one point per shared keyword; bm25: weight keywords by rarity (both capped at 8)",
+    )
     parser.add_argument("--output-dir", type=Path, default=DEFAULT_OUTPUT_DIR)
+    parser.add_argument(
+        "--jobs", type=int, default=DEFAULT_BATCH_JOBS, metavar="N",
+        help=f"batch only: packages generated in parallel (default: {DEFAULT_BATCH_JOBS}, 0 uses every CPU core)",
+    )
+    parser.add_argument("--force", action="store_true", help="batch only: regenerate unchanged vacancies too")
     return parser.parse_args()
 
 
@@ -1477,6 +1967,11 @@ def main() -> int:
     if not application_path.exists():
         print(f"Application file not found: {application_path}", file=sys.stderr)
         return 2
+    if args.jobs < 0:
+        print("--jobs must be 0 or a positive number.", file=sys.stderr)
+        return 2
+    if application_path.is_dir():
+        return batch_main(args, application_path)
 
     application = load_application(application_path, args)
     manifest = generate_application(
@@ -1491,6 +1986,7 @@ def main() -> int:
         "Selected projects: "
         + ", ".join(item["project"] for item in manifest["selection"])
     )
+    print(f"Output: {report().summary()}")
     return 0
 
 
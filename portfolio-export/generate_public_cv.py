@@ -5,6 +5,7 @@ from __future__ import annotations
 
 import argparse
 import json
+import sys
 from html import escape
 from pathlib import Path
 from typing import Any, Iterable
@@ -34,6 +35,12 @@ except ImportError as exc:
 
 
 ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.append(str(ROOT))
+
+from tools.output_writer import atomic_output, report
+from tools.tracing import span
+
 CV_PATH = Path(__file__).resolve().parent / "data" / "cv.json"
 DEFAULT_OUTPUT = ROOT / "assets" / "downloads" / "Ivan_Bagaturiya_CV.pdf"
 INK = HexColor("#11110f")
@@ -159,7 +166,7 @@ def build_public_cv(destination: Path) -> None:
     styles = make_styles()
     destination.parent.mkdir(parents=True, exist_ok=True)
     document = SimpleDocTemplate(
-        str(destination), pagesize=A4,
+        str(destination), pagesize=A4, invariant=1,
         leftMargin=20 * mm, rightMargin=20 * mm,
         topMargin=17 * mm, bottomMargin=19 * mm,
         title=f"{cv.get('name', '')} - Curriculum Vitae",
@@ -284,19 +291,22 @@ def build_public_cv(destination: Path) -> None:
             Spacer(1, 2 * mm),
         ]))
 
-    document.build(
-        story,
-        onFirstPage=lambda pdf, doc: page_footer(pdf, doc, cv.get("name", "")),
-        onLaterPages=lambda pdf, doc: page_footer(pdf, doc, cv.get("name", "")),
-    )
+    with span("public_cv.build", "export", flowables=len(story)):
+        document.build(
+            story,
+            onFirstPage=lambda pdf, doc: page_footer(pdf, doc, cv.get("name", "")),
+            onLaterPages=lambda pdf, doc: page_footer(pdf, doc, cv.get("name", "")),
+        )
 
 
 def main() -> int:
     parser = argparse.ArgumentParser(description="Generate the public comprehensive CV PDF.")
     parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
     args = parser.parse_args()
-    build_public_cv(args.output.resolve())
+    with atomic_output(args.output.resolve()) as destination:
+        build_public_cv(destination)
     print(f"Public CV: {args.output.resolve()}")
+    print(f"Output: {report().summary()}")
     return 0
 
 
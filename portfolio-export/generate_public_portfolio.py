@@ -2,9 +2,11 @@
 """Generate the canonical full HTML and PDF portfolio."""
 
 from generate import generate_full_portfolio
+from tools.output_writer import report
 
 
 if __name__ == "__main__":
     html_path, pdf_path = generate_full_portfolio()
     print(f"Full portfolio HTML: {html_path}")
     print(f"Full portfolio PDF: {pdf_path}")
+    print(f"Output: {report().summary()}")
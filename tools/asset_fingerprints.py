@@ -0,0 +1,74 @@
+"""Content-hashed copies of the site's CSS and JS for immutable caching.
+
+Each stylesheet and script in ``assets/css`` and ``assets/js`` is copied to
+``assets/dist/<name>.<hash>.<ext>``. A changed file gets a new name, so the
+host can serve everything in ``assets/dist/`` with
+``Cache-Control: public, max-age=31536000, immutable``. ``manifest.json`` in
+the same folder maps every source path to its current copy; the generated
+pages resolve their links through it.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+
+from tools.output_writer import write_output
+
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+ASSET_SOURCE_DIRS = ("assets/css", "assets/js")
+ASSET_DIST_DIR = ROOT_DIR / "assets" / "dist"
+ASSET_MANIFEST = ASSET_DIST_DIR / "manifest.json"
+ASSET_HASH_LENGTH = 10
+
+
+def fingerprinted_name(path: Path, data: bytes | None = None) -> str:
+    digest = hashlib.sha256(path.read_bytes() if data is None else data).hexdigest()[:ASSET_HASH_LENGTH]
+    return f"{path.stem}.{digest}{path.suffix}"
+
+
+def fingerprint_assets(root: Path = ROOT_DIR, dist_dir: Path = ASSET_DIST_DIR) -> dict[str, str]:
+    """Copy changed assets into ``dist_dir``, prune stale copies and write the manifest.
+
+    Returns the mapping of source paths to fingerprinted paths, both relative
+    to ``root`` and using forward slashes.
+    """
+    dist_dir.mkdir(parents=True, exist_ok=True)
+    mapping: dict[str, str] = {}
+    for source_dir in ASSET_SOURCE_DIRS:
+        for path in sorted((root / source_dir).glob("*")):
+            if path.suffix.lower() not in (".css", ".js") or not path.is_file():
+                continue
+            data = path.read_bytes()
+            target = dist_dir / fingerprinted_name(path, data)
+            write_output(target, data)
+            mapping[path.relative_to(root).as_posix()] = target.relative_to(root).as_posix()
+    current = {Path(value).name for value in mapping.values()} | {ASSET_MANIFEST.name}
+    for stale in dist_dir.iterdir():
+        if stale.name not in current and not stale.name.endswith((".gz", ".zst")):
+            stale.unlink()
+    write_output(dist_dir / ASSET_MANIFEST.name, json.dumps(mapping, indent=2, sort_keys=True) + "\n")
+    return mapping
+
+
+@lru_cache(maxsize=None)
+def _load_manifest(path: str, _mtime_ns: int) -> dict[str, str]:
+    try:
+        with open(path, "r", encoding="utf-8") as handle:
+            data = json.load(handle)
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def asset_manifest(path: Path = ASSET_MANIFEST) -> dict[str, str]:
+    """Return the current mapping, re-reading it only after the file changes."""
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return {}
+    return _load_manifest(os.fspath(path), mtime_ns)
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""Scaling benchmark for the site generator on synthetic project libraries.
+
+Builds a throwaway library in a temporary directory, points the generator at
+it, and times each stage separately: folder discovery, the library scan,
+``get_media``, metadata collection, related-project ranking, page rendering,
+the drone-gallery manifest, and the index. Every stage is then run once more
+under ``tracemalloc`` to record the peak Python memory it allocates. Results are written as
+JSON, and comparing against a stored baseline exits non-zero on a regression.
+
+    python3 tools/benchmark_site_generator.py --projects 1000
+    python3 tools/benchmark_site_generator.py --projects 10000 --archive-images 5000 \\
+        --output .cache/bench.json --baseline benchmarks/baseline.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+from tools import site_generator
+from tools.project_library import scan_library
+
+
+FILTER_TAGS = ("#selected", "#architecture", "#tech", "#art", "#music")
+TOPIC_TAGS = tuple(f"#topic{index}" for index in range(200))
+# A JPEG with nothing but start and end markers: enough for every stage that
+# never decodes pixels, and tiny enough for libraries of many thousand files.
+PLACEHOLDER_JPEG = b"\xff\xd8\xff\xd9"
+ICON_SVG = '<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 10 10"><rect width="10" height="10"/></svg>\n'
+# Ignore differences below this many seconds when comparing with a baseline.
+NOISE_FLOOR_SECONDS = 0.005
+
+
+def synthesize_library(root: Path, projects: int, media: int, archive_images: int, seed: int) -> Path:
+    """Write ``projects`` project folders (plus an optional 0010 archive) under ``root``."""
+    rng = random.Random(seed)
+    projects_dir = root / "projects"
+    projects_dir.mkdir(parents=True)
+    numbers = (number for number in range(11, 10 ** 6) if number != 2409)
+    for _ in range(projects):
+        number = next(numbers)
+        folder = projects_dir / f"{number:04d}-bench-project-{number}"
+        folder.mkdir()
+        tags = rng.sample(FILTER_TAGS, 2) + rng.sample(TOPIC_TAGS, 3)
+        (folder / "title.txt").write_text(f"Bench project {number}\n", encoding="utf-8")
+        (folder / "titledescription.txt").write_text(f"Synthetic project {number}\n", encoding="utf-8")
+        (folder / "description.txt").write_text("Lorem ipsum dolor sit amet. " * 20 + "\n", encoding="utf-8")
+        (folder / "hashtags.txt").write_text(" ".join(tags) + "\n", encoding="utf-8")
+        (folder / "skill.txt").write_text("#rhino #grasshopper\n", encoding="utf-8")
+        (folder / "icon.svg").write_text(ICON_SVG, encoding="utf-8")
+        for index in range(1, media + 1):
+            (folder / f"image{index}.jpg").write_bytes(PLACEHOLDER_JPEG)
+    if archive_images:
+        folder = projects_dir / "0010-droneimages"
+        folder.mkdir()
+        (folder / "title.txt").write_text("Drone images\n", encoding="utf-8")
+        (folder / "hashtags.txt").write_text("#art #fun\n", encoding="utf-8")
+        dates = {}
+        for index in range(1, archive_images + 1):
+            name = f"image{index:05d}.jpg"
+            (folder / name).write_bytes(PLACEHOLDER_JPEG)
+            dates[name] = 1_600_000_000 + rng.randrange(100_000_000)
+        (folder / "media-dates.json").write_text(json.dumps(dates, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    return projects_dir
+
+
+def benchmark_stages(projects_dir: Path) -> list[tuple[str, Callable[[dict], Any]]]:
+    """Return the stages in build order; each reads and extends a shared state dict."""
+
+    def discover(state: dict) -> None:
+        state["folders"] = site_generator.discover_project_folders()
+
+    def scan(state: dict) -> None:
+        state["library"] = scan_library(projects_dir)
+
+    def get_media(state: dict) -> None:
+        for folder in state["folders"].values():
+            site_generator.get_media(projects_dir / folder)
+
+    def collect(state: dict) -> None:
+        state["projects"] = site_generator.collect_projects(state["library"])
+
+    def related(state: dict) -> None:
+        site_generator.attach_related_projects(state["projects"])
+
+    def render_pages(state: dict) -> None:
+        projects = state["projects"]
+        snapshots = state["library"].projects
+        for index, (project, snapshot) in enumerate(zip(projects, snapshots)):
+            previous = projects[index - 1]["num"] if index else ""
+            site_generator.render_project_page(project, snapshot, previous, projects)
+
+    def drone_manifest(state: dict) -> None:
+        for project in state["projects"]:
+            if project["num"] == "0010":
+                site_generator.generate_drone_gallery_manifest(project["media"])
+
+    def index(state: dict) -> None:
+        site_generator.write_index_pages(state["projects"])
+
+    return [
+        ("discover_project_folders", discover),
+        ("scan_library", scan),
+        ("get_media", get_media),
+        ("collect_projects", collect),
+        ("related_projects", related),
+        ("render_pages", render_pages),
+        ("drone_manifest", drone_manifest),
+        ("index", index),
+    ]
+
+
+def run_benchmark(args: argparse.Namespace) -> dict[str, Any]:
+    with tempfile.TemporaryDirectory(prefix="site-bench-") as temp:
+        root = Path(temp)
+        started = time.perf_counter()
+        projects_dir = synthesize_library(root, args.projects, args.media, args.archive_images, args.seed)
+        synthesize_seconds = time.perf_counter() - started
+        (root / site_generator.PROJECT_HTML_DIR).mkdir()
+
+        saved = site_generator.PROJECTS_DIR, site_generator.OUTPUT_DIR
+        site_generator.PROJECTS_DIR, site_generator.OUTPUT_DIR = str(projects_dir), str(root)
+        try:
+            stages = benchmark_stages(projects_dir)
+            timings: dict[str, list[float]] = {name: [] for name, _stage in stages}
+            for _ in range(args.repeat):
+                state: dict = {}
+                for name, stage in stages:
+                    started = time.perf_counter()
+                    stage(state)
+                    timings[name].append(time.perf_counter() - started)
+
+            peaks: dict[str, int] = {}
+            state = {}
+            tracemalloc.start()
+            try:
+                for name, stage in stages:
+                    # Peak on top of what earlier stages still hold.
+                    before = tracemalloc.get_traced_memory()[0]
+                    tracemalloc.reset_peak()
+                    stage(state)
+                    peaks[name] = tracemalloc.get_traced_memory()[1] - before
+            finally:
+                tracemalloc.stop()
+        finally:
+            site_generator.PROJECTS_DIR, site_generator.OUTPUT_DIR = saved
+
+    return {
+        "config": {
+            "projects": args.projects,
+            "media_per_project": args.media,
+            "archive_images": args.archive_images,
+            "repeat": args.repeat,
+            "seed": args.seed,
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "synthesize_seconds": round(synthesize_seconds, 4),
+        "stages": {
+            name: {
+                "seconds": round(min(values), 6),
+                "median_seconds": round(sorted(values)[len(values) // 2], 6),
+                "peak_kib": round(peaks[name] / 1024, 1),
+            }
+            for name, values in timings.items()
+        },
+    }
+
+
+def compare(result: dict[str, Any], baseline: dict[str, Any], tolerance: float) -> list[str]:
+    """Return a line per stage that got slower than ``1 + tolerance`` times its baseline."""
+    if result["config"] != baseline.get("config"):
+        print("Warning: the baseline was recorded with a different configuration.")
+    regressions = []
+    for name, stage in result["stages"].items():
+        before = baseline.get("stages", {}).get(name)
+        if not before:
+            continue
+        seconds, previous = stage["seconds"], before["seconds"]
+        if seconds > previous * (1 + tolerance) and seconds - previous > NOISE_FLOOR_SECONDS:
+            regressions.append(f"{name}: {previous:.4f}s -> {seconds:.4f}s")
+        if stage["peak_kib"] > before["peak_kib"] * (1 + tolerance):
+            regressions.append(f"{name}: peak {before['peak_kib']:.0f} KiB -> {stage['peak_kib']:.0f} KiB")
+    return regressions
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the site generator on a synthetic project library.")
+    parser.add_argument("--projects", type=int, default=1000, help="number of regular projects (default: 1000)")
+    parser.add_argument("--media", type=int, default=4, help="numbered images per project (default: 4)")
+    parser.add_argument("--archive-images", type=int, default=0, help="images in a synthetic 0010 drone archive")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per stage; the fastest is reported")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="write the results to this JSON file")
+    parser.add_argument("--baseline", type=Path, help="compare against a results file from an earlier run")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.25,
+        help="allowed slowdown or memory growth before a stage counts as a regression (default: 0.25)",
+    )
+    args = parser.parse_args(argv)
+    if args.projects < 0 or args.media < 0 or args.archive_images < 0 or args.repeat < 1:
+        parser.error("sizes must be non-negative and --repeat at least 1")
+    return args
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    result = run_benchmark(args)
+    print(f"{'stage':<26}{'seconds':>10}{'peak KiB':>12}")
+    for name, stage in result["stages"].items():
+        print(f"{name:<26}{stage['seconds']:>10.4f}{stage['peak_kib']:>12.0f}")
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(result, indent=2) + "\n", encoding="utf-8")
+        print(f"Results written to {args.output}")
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare(result, baseline, args.tolerance)
+        if regressions:
+            print("Regressions against the baseline:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print("No regressions against the baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,399 @@
+"""Headless Chrome kept alive for printing HTML to PDF over the DevTools protocol.
+
+Starting Chrome with ``--print-to-pdf`` costs a browser launch and a fresh
+profile per document, and the caller can only tell that printing finished by
+watching the output file stop growing. ``ChromePrintPool`` instead keeps up to
+``size`` browsers running with ``--remote-debugging-pipe`` and sends each job
+as DevTools commands: open a tab, navigate, wait for the load event, then run
+``READY_SCRIPT``, which resolves once web fonts are loaded and every image is
+decoded, and print with ``Page.printToPDF``. The PDF is streamed straight into
+the destination file. Jobs from several threads queue for the next idle
+browser; a browser that fails a job is closed and replaced on the next one.
+
+The pipe carries NUL-terminated JSON messages: Chrome reads commands from its
+file descriptor 3 and writes replies and events to descriptor 4. Any program
+that speaks this protocol can stand in for Chrome.
+"""
+
+from __future__ import annotations
+
+import base64
+import itertools
+import json
+import multiprocessing.util
+import os
+import queue
+import shutil
+import signal
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from pathlib import Path
+from typing import Any, Callable
+from weakref import WeakSet
+
+
+PRINT_TIMEOUT_SECONDS = 90
+CLOSE_TIMEOUT_SECONDS = 5
+STREAM_CHUNK_BYTES = 1 << 20
+CHROME_ARGUMENTS = (
+    "--headless=new",
+    "--disable-gpu",
+    "--disable-breakpad",
+    "--disable-extensions",
+    "--disable-dev-shm-usage",
+    "--no-sandbox",
+    "--no-first-run",
+    "--allow-file-access-from-files",
+    "--run-all-compositor-stages-before-draw",
+    "--remote-debugging-pipe",
+)
+# Evaluated after the load event; printing starts once the promise resolves.
+READY_SCRIPT = """(async () => {
+  await document.fonts.ready;
+  await Promise.all(Array.from(document.images, (image) => {
+    image.loading = "eager";
+    return image.decode().catch(() => null);
+  }));
+  return document.readyState;
+})()"""
+PDF_OPTIONS = {
+    "printBackground": True,
+    "preferCSSPageSize": True,
+    "displayHeaderFooter": False,
+    "transferMode": "ReturnAsStream",
+}
+
+
+class DevToolsError(RuntimeError):
+    """A DevTools command failed, timed out, or the browser went away."""
+
+
+def supported() -> bool:
+    """Return True if this platform can hand Chrome the debugging pipe."""
+    return hasattr(os, "posix_spawn")
+
+
+class ChromeBrowser:
+    """One headless Chrome process and its DevTools pipe."""
+
+    def __init__(self, executable: str) -> None:
+        self.profile = tempfile.mkdtemp(prefix="portfolio-chrome-")
+        # Chrome reads commands from fd 3 and writes messages to fd 4.
+        command_read, self._command_fd = os.pipe()
+        self._message_fd, message_write = os.pipe()
+        try:
+            self.pid = os.posix_spawn(
+                executable,
+                [executable, *CHROME_ARGUMENTS, f"--user-data-dir={self.profile}", "about:blank"],
+                os.environ,
+                file_actions=[
+                    (os.POSIX_SPAWN_OPEN, 0, os.devnull, os.O_RDONLY, 0),
+                    (os.POSIX_SPAWN_OPEN, 1, os.devnull, os.O_WRONLY, 0),
+                    (os.POSIX_SPAWN_OPEN, 2, os.devnull, os.O_WRONLY, 0),
+                    (os.POSIX_SPAWN_DUP2, command_read, 3),
+                    (os.POSIX_SPAWN_DUP2, message_write, 4),
+                ],
+            )
+        except OSError:
+            os.close(self._command_fd)
+            os.close(self._message_fd)
+            shutil.rmtree(self.profile, ignore_errors=True)
+            raise
+        finally:
+            os.close(command_read)
+            os.close(message_write)
+        self.returncode: int | None = None
+        self._ids = itertools.count(1)
+        self._write_lock = threading.Lock()
+        self._state_lock = threading.Lock()
+        self._pending: dict[int, Future] = {}
+        self._expected: dict[tuple[str | None, str], list[Future]] = {}
+        self._closed = False
+        self._reader = threading.Thread(target=self._read_messages, name=f"chrome-{self.pid}", daemon=True)
+        self._reader.start()
+
+    # -- protocol ---------------------------------------------------------
+
+    def _read_messages(self) -> None:
+        buffer = b""
+        try:
+            while True:
+                chunk = os.read(self._message_fd, 1 << 16)
+                if not chunk:
+                    break
+                buffer += chunk
+                *messages, buffer = buffer.split(b"\0")
+                for message in messages:
+                    if message:
+                        self._dispatch(json.loads(message))
+        except (OSError, ValueError):
+            pass
+        self._fail_waiters(DevToolsError("the browser closed the DevTools pipe"))
+
+    def _dispatch(self, message: dict[str, Any]) -> None:
+        with self._state_lock:
+            if "id" in message:
+                future = self._pending.pop(message["id"], None)
+                waiters = [future] if future else []
+            else:
+                waiters = self._expected.pop((message.get("sessionId"), message.get("method", "")), [])
+        for future in waiters:
+            if "error" in message:
+                error = message["error"]
+                future.set_exception(DevToolsError(f"{error.get('message', 'error')} ({error.get('code')})"))
+            elif not future.done():
+                future.set_result(message.get("result", message.get("params", {})))
+
+    def _fail_waiters(self, error: DevToolsError) -> None:
+        with self._state_lock:
+            self._closed = True
+            waiters = list(self._pending.values())
+            waiters.extend(future for futures in self._expected.values() for future in futures)
+            self._pending.clear()
+            self._expected.clear()
+        for future in waiters:
+            if not future.done():
+                future.set_exception(error)
+
+    def expect(self, method: str, session_id: str | None = None) -> Future:
+        """Return a future for the next ``method`` event; call before triggering it."""
+        future: Future = Future()
+        with self._state_lock:
+            if self._closed:
+                raise DevToolsError("the browser is not running")
+            self._expected.setdefault((session_id, method), []).append(future)
+        return future
+
+    def send(
+        self,
+        method: str,
+        params: dict[str, Any] | None = None,
+        session_id: str | None = None,
+        timeout: float = PRINT_TIMEOUT_SECONDS,
+    ) -> dict[str, Any]:
+        message: dict[str, Any] = {"id": next(self._ids), "method": method, "params": params or {}}
+        if session_id:
+            message["sessionId"] = session_id
+        future: Future = Future()
+        with self._state_lock:
+            if self._closed:
+                raise DevToolsError("the browser is not running")
+            self._pending[message["id"]] = future
+        payload = json.dumps(message).encode("utf-8") + b"\0"
+        try:
+            with self._write_lock:
+                view = memoryview(payload)
+                while view:
+                    view = view[os.write(self._command_fd, view):]
+        except OSError as exc:
+            with self._state_lock:
+                self._pending.pop(message["id"], None)
+            raise DevToolsError(f"{method}: could not write to the browser") from exc
+        return wait(future, timeout, method)
+
+    # -- printing ---------------------------------------------------------
+
+    def print_to_pdf(self, source: Path, destination: Path, timeout: float = PRINT_TIMEOUT_SECONDS) -> None:
+        """Print ``source`` to ``destination`` in a new tab, then close the tab."""
+        deadline = time.monotonic() + timeout
+
+        def remaining() -> float:
+            return max(0.0, deadline - time.monotonic())
+
+        target = self.send("Target.createTarget", {"url": "about:blank"}, timeout=remaining())["targetId"]
+        try:
+            session = self.send(
+                "Target.attachToTarget", {"targetId": target, "flatten": True}, timeout=remaining(),
+            )["sessionId"]
+            self.send("Page.enable", session_id=session, timeout=remaining())
+            loaded = self.expect("Page.loadEventFired", session)
+            navigation = self.send("Page.navigate", {"url": source.resolve().as_uri()}, session, remaining())
+            if navigation.get("errorText"):
+                raise DevToolsError(f"could not open {source}: {navigation['errorText']}")
+            wait(loaded, remaining(), "Page.loadEventFired")
+            ready = self.send(
+                "Runtime.evaluate",
+                {"expression": READY_SCRIPT, "awaitPromise": True, "returnByValue": True},
+                session,
+                remaining(),
+            )
+            if ready.get("exceptionDetails"):
+                raise DevToolsError(f"the page readiness check failed: {ready['exceptionDetails'].get('text')}")
+            stream = self.send("Page.printToPDF", PDF_OPTIONS, session, remaining())["stream"]
+            self.read_stream(stream, destination, remaining)
+        finally:
+            if not self._closed:
+                try:
+                    self.send("Target.closeTarget", {"targetId": target}, timeout=CLOSE_TIMEOUT_SECONDS)
+                except DevToolsError:
+                    pass
+
+    def read_stream(self, stream: str, destination: Path, remaining: Callable[[], float]) -> None:
+        try:
+            with open(destination, "wb") as handle:
+                while True:
+                    chunk = self.send("IO.read", {"handle": stream, "size": STREAM_CHUNK_BYTES}, timeout=remaining())
+                    data = chunk.get("data", "")
+                    handle.write(base64.b64decode(data) if chunk.get("base64Encoded") else data.encode("latin-1"))
+                    if chunk.get("eof"):
+                        break
+        finally:
+            if not self._closed:
+                self.send("IO.close", {"handle": stream}, timeout=CLOSE_TIMEOUT_SECONDS)
+
+    # -- lifetime ---------------------------------------------------------
+
+    def alive(self) -> bool:
+        if self.returncode is None and not self._closed:
+            try:
+                pid, status = os.waitpid(self.pid, os.WNOHANG)
+            except ChildProcessError:
+                pid, status = self.pid, 0
+            if pid:
+                self.returncode = os.waitstatus_to_exitcode(status)
+        return self.returncode is None and not self._closed
+
+    def _wait_exit(self, timeout: float) -> bool:
+        deadline = time.monotonic() + timeout
+        while self.returncode is None:
+            try:
+                pid, status = os.waitpid(self.pid, os.WNOHANG)
+            except ChildProcessError:
+                pid, status = self.pid, 0
+            if pid:
+                self.returncode = os.waitstatus_to_exitcode(status)
+            elif time.monotonic() >= deadline:
+                return False
+            else:
+                time.sleep(0.05)
+        return True
+
+    def close(self) -> None:
+        """Ask Chrome to quit, kill it if it does not, and remove its profile."""
+        if self.alive():
+            try:
+                self.send("Browser.close", timeout=CLOSE_TIMEOUT_SECONDS)
+            except DevToolsError:
+                pass
+        if not self._wait_exit(CLOSE_TIMEOUT_SECONDS):
+            for sig in (signal.SIGTERM, signal.SIGKILL):
+                try:
+                    os.kill(self.pid, sig)
+                except ProcessLookupError:
+                    break
+                if self._wait_exit(CLOSE_TIMEOUT_SECONDS):
+                    break
+        self.forget()
+        self._reader.join(timeout=CLOSE_TIMEOUT_SECONDS)
+        os.close(self._message_fd)
+        shutil.rmtree(self.profile, ignore_errors=True)
+
+    def forget(self) -> None:
+        """Drop this side of the command pipe without waiting for Chrome."""
+        with self._state_lock:
+            self._closed = True
+            fd, self._command_fd = self._command_fd, -1
+        if fd >= 0:
+            os.close(fd)
+
+
+def wait(future: Future, timeout: float, what: str) -> dict[str, Any]:
+    try:
+        return future.result(timeout=timeout)
+    except FutureTimeoutError:
+        raise DevToolsError(f"{what} timed out") from None
+
+
+class ChromePrintPool:
+    """Up to ``size`` long-lived browsers shared by every print job in this process.
+
+    Browsers start on first use. ``print_to_pdf`` blocks until a browser is
+    idle, so concurrent callers queue instead of starting more Chrome
+    processes. Pools close themselves when the process exits, including
+    ``multiprocessing`` workers, which skip ``atexit`` handlers.
+    """
+
+    def __init__(self, executable: str, size: int = 1, timeout: float = PRINT_TIMEOUT_SECONDS) -> None:
+        self.executable = executable
+        self.size = max(1, size)
+        self.timeout = timeout
+        self._slots: queue.Queue[ChromeBrowser | None] = queue.Queue()
+        for _ in range(self.size):
+            self._slots.put(None)
+        self._browsers: set[ChromeBrowser] = set()
+        self._lock = threading.Lock()
+        self._closed = False
+        _pools.add(self)
+        multiprocessing.util.Finalize(self, self.close, exitpriority=10)
+
+    def print_to_pdf(self, source: Path, destination: Path) -> None:
+        """Print ``source`` to ``destination``; raise DevToolsError or OSError on failure."""
+        if self._closed:
+            raise DevToolsError("the print pool is closed")
+        browser = self._slots.get()
+        try:
+            if browser is not None and not browser.alive():
+                self._discard(browser)
+                browser = None
+            if browser is None:
+                browser = ChromeBrowser(self.executable)
+                with self._lock:
+                    self._browsers.add(browser)
+            browser.print_to_pdf(source, destination, self.timeout)
+        except BaseException:
+            if browser is not None:
+                self._discard(browser)
+                browser = None
+            raise
+        finally:
+            if self._closed and browser is not None:
+                self._discard(browser)
+                browser = None
+            self._slots.put(browser)
+
+    def _discard(self, browser: ChromeBrowser) -> None:
+        with self._lock:
+            self._browsers.discard(browser)
+        browser.close()
+
+    def close(self) -> None:
+        """Close every browser; jobs still printing close theirs when they finish."""
+        self._closed = True
+        while True:
+            try:
+                browser = self._slots.get_nowait()
+            except queue.Empty:
+                break
+            if browser is not None:
+                self._discard(browser)
+
+    def _forget_after_fork(self) -> None:
+        # A forked child shares the parent's pipes but not its reader threads;
+        # it drops them, leaving the browsers to the parent, and starts its own.
+        # The parent's locks may be held at the fork, so nothing here takes one.
+        for browser in self._browsers:
+            for fd in (browser._command_fd, browser._message_fd):
+                if fd >= 0:
+                    os.close(fd)
+        self._browsers = set()
+        self._lock = threading.Lock()
+        self._slots = queue.Queue()
+        for _ in range(self.size):
+            self._slots.put(None)
+        # Finalizers only run in the process that registered them.
+        multiprocessing.util.Finalize(self, self.close, exitpriority=10)
+
+
+_pools: WeakSet[ChromePrintPool] = WeakSet()
+
+
+def _reset_after_fork() -> None:
+    for pool in list(_pools):
+        pool._forget_after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
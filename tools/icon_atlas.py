@@ -0,0 +1,186 @@
+"""Sprite atlases of the project icons shown on the index page.
+
+The index grid shows every project icon at no more than 140 CSS pixels, yet
+the icons in the project folders are often photos thousands of pixels wide.
+The site build scales each raster icon to a square tile of ``ICON_TILE_SIZE``
+pixels (twice the displayed size, for high-density screens) and packs the tiles
+into a few atlas images in ``assets/icon-atlas/``, written as WebP plus a PNG
+fallback. The index cards then show their tile as a CSS background, so the
+landing page loads a couple of images instead of one per project.
+
+``manifest.json`` records each icon's content hash and the atlas layout. The
+atlases are repacked only when an icon is added, removed, reordered or
+changed, and their file names carry a hash of their contents so they can be
+cached indefinitely. SVG icons and animated GIFs keep their own ``<img>``.
+Pillow is optional: without it a current atlas is still used, otherwise the
+index links the original icons.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import os
+from pathlib import Path
+
+from tools.image_derivatives import load_json_file, pillow_available, sha256_file
+from tools.output_writer import atomic_output, write_output
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = None
+
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+ICON_ATLAS_DIR = ROOT_DIR / "assets" / "icon-atlas"
+ICON_ATLAS_STAT_CACHE = ROOT_DIR / ".cache" / "icon-atlas-stat.json"
+ICON_TILE_SIZE = 280
+ICON_ATLAS_COLUMNS = 8
+ICON_ATLAS_TILES = 64
+ICON_SOURCE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".webp"}
+WEBP_QUALITY = 82
+# Bump when the packing or encoding changes so existing atlases are rebuilt.
+ICON_ATLAS_VERSION = 1
+
+
+def is_animated(path: str | Path) -> bool:
+    # Camera JPEGs can be multi-frame MPO files; only these formats animate.
+    with Image.open(path) as image:
+        return image.format in ("GIF", "PNG", "WEBP") and getattr(image, "n_frames", 1) > 1
+
+
+def atlas_layout(count: int) -> tuple[int, int]:
+    columns = min(ICON_ATLAS_COLUMNS, count)
+    return columns, math.ceil(count / columns)
+
+
+def render_tile(path: str | Path) -> "Image.Image":
+    """Scale one icon into a transparent square tile, centred like ``object-fit: contain``."""
+    tile = Image.new("RGBA", (ICON_TILE_SIZE, ICON_TILE_SIZE), (0, 0, 0, 0))
+    with Image.open(path) as original:
+        original.seek(0)
+        image = ImageOps.exif_transpose(original).convert("RGBA")
+        image = ImageOps.contain(image, (ICON_TILE_SIZE, ICON_TILE_SIZE), Image.Resampling.LANCZOS)
+    tile.paste(image, ((ICON_TILE_SIZE - image.width) // 2, (ICON_TILE_SIZE - image.height) // 2))
+    return tile
+
+
+class IconAtlas:
+    """Atlas state for one site build."""
+
+    def __init__(self, output_dir: str | Path = ICON_ATLAS_DIR) -> None:
+        self.output_dir = Path(output_dir)
+        self.manifest_path = self.output_dir / "manifest.json"
+        self.manifest = load_json_file(self.manifest_path)
+        self.stat_cache = load_json_file(ICON_ATLAS_STAT_CACHE)
+        self.placements: dict[str, tuple[int, int, int]] = {}
+
+    def prepare(self, sources: list[tuple[str, str, int, int]]) -> bool:
+        """Place ``(key, path, size, mtime_ns)`` icons in the atlases, repacking if needed.
+
+        Returns True if the atlases were (re)written. Icons that cannot go in
+        an atlas, and every icon when no current atlas can be produced, have
+        no placement and keep their original file.
+        """
+        previous = self.manifest.get("icons", {})
+        icons: dict[str, dict] = {}
+        packed: list[tuple[str, str]] = []
+        for key, path, size, mtime_ns in sources:
+            if os.path.splitext(path)[1].lower() not in ICON_SOURCE_EXTENSIONS:
+                continue
+            signature = f"{size}:{mtime_ns}"
+            entry = previous.get(key)
+            if not entry or self.stat_cache.get(key) != signature:
+                digest = sha256_file(path)
+                if not entry or entry.get("sha256") != digest:
+                    if not pillow_available():
+                        continue
+                    entry = {"sha256": digest, "animated": is_animated(path)}
+                self.stat_cache[key] = signature
+            icons[key] = entry
+            if not entry["animated"]:
+                packed.append((key, path))
+
+        digest = hashlib.sha256(json.dumps(
+            [ICON_ATLAS_VERSION, ICON_TILE_SIZE, ICON_ATLAS_COLUMNS, [(key, icons[key]["sha256"]) for key, _path in packed]],
+        ).encode("utf-8")).hexdigest()[:10]
+        current = self.manifest.get("digest") == digest and self.files_exist()
+        rebuilt = False
+        if not current:
+            if not pillow_available() or not packed:
+                self.manifest = {"icons": icons, "atlases": []}
+                return False
+            self.manifest = {"digest": digest, "icons": icons, "atlases": self.pack(packed, digest)}
+            rebuilt = True
+        self.manifest["icons"] = icons
+        for index, atlas in enumerate(self.manifest["atlases"]):
+            for position, key in enumerate(atlas["icons"]):
+                self.placements[key] = (index, position % atlas["columns"], position // atlas["columns"])
+        return rebuilt
+
+    def pack(self, packed: list[tuple[str, str]], digest: str) -> list[dict]:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        atlases = []
+        for start in range(0, len(packed), ICON_ATLAS_TILES):
+            chunk = packed[start:start + ICON_ATLAS_TILES]
+            columns, rows = atlas_layout(len(chunk))
+            sheet = Image.new("RGBA", (columns * ICON_TILE_SIZE, rows * ICON_TILE_SIZE), (0, 0, 0, 0))
+            for position, (_key, path) in enumerate(chunk):
+                column, row = position % columns, position // columns
+                sheet.paste(render_tile(path), (column * ICON_TILE_SIZE, row * ICON_TILE_SIZE))
+            stem = f"icons-{digest}-{len(atlases)}"
+            with atomic_output(self.output_dir / f"{stem}.webp") as temporary:
+                sheet.save(temporary, "WEBP", quality=WEBP_QUALITY, method=6)
+            with atomic_output(self.output_dir / f"{stem}.png") as temporary:
+                sheet.save(temporary, "PNG", optimize=True)
+            atlases.append({
+                "webp": f"{stem}.webp",
+                "png": f"{stem}.png",
+                "columns": columns,
+                "rows": rows,
+                "icons": [key for key, _path in chunk],
+            })
+        return atlases
+
+    def files_exist(self) -> bool:
+        return all(
+            (self.output_dir / atlas[extension]).exists()
+            for atlas in self.manifest.get("atlases", [])
+            for extension in ("webp", "png")
+        )
+
+    def atlases(self, base_dir: str | Path) -> list[dict]:
+        """Return each atlas with its image URLs relative to ``base_dir``."""
+        return [
+            {
+                **atlas,
+                "webp": os.path.relpath(self.output_dir / atlas["webp"], base_dir).replace("\\", "/"),
+                "png": os.path.relpath(self.output_dir / atlas["png"], base_dir).replace("\\", "/"),
+            }
+            for atlas in self.manifest.get("atlases", [])
+        ]
+
+    def sprite(self, key: str) -> dict | None:
+        """Return the atlas index and CSS background position of a placed icon."""
+        placement = self.placements.get(key)
+        if placement is None:
+            return None
+        index, column, row = placement
+        atlas = self.manifest["atlases"][index]
+        x = column * 100 / (atlas["columns"] - 1) if atlas["columns"] > 1 else 0
+        y = row * 100 / (atlas["rows"] - 1) if atlas["rows"] > 1 else 0
+        return {"atlas": index, "position": f"{x:g}% {y:g}%"}
+
+    def save(self) -> None:
+        """Persist the manifests and delete atlases that are no longer referenced."""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        current = {atlas[extension] for atlas in self.manifest.get("atlases", []) for extension in ("webp", "png")}
+        for path in self.output_dir.glob("icons-*"):
+            if path.name not in current:
+                path.unlink()
+        write_output(self.manifest_path, json.dumps(self.manifest, indent=2, sort_keys=True) + "\n")
+        for key in set(self.stat_cache) - set(self.manifest.get("icons", {})):
+            del self.stat_cache[key]
+        write_output(ICON_ATLAS_STAT_CACHE, json.dumps(self.stat_cache, sort_keys=True) + "\n")
@@ -0,0 +1,253 @@
+"""Resized WebP and JPEG/PNG derivatives for the public website.
+
+Project folders hold full-resolution camera files. The site build writes
+smaller copies at a few widths into ``assets/responsive/`` and the pages point
+``srcset`` at those instead. ``manifest.json`` beside the derivatives records
+each source's content hash and the widths written, so derivatives are rebuilt
+only when the source itself changes, also after a fresh clone. A local stat
+cache in ``.cache/`` avoids re-hashing untouched sources on every build.
+The manifest also keeps a blurred placeholder of at most ``PLACEHOLDER_SIZE``
+pixels per source, as a WebP data URI, plus its average colour; the pages show
+them behind each image until it arrives.
+Pillow is optional: without it, up-to-date committed derivatives are still
+used and any other image keeps linking its original.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import io
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from tools.output_writer import OutputReport, atomic_output, report, take_report, write_output
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = None
+
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+RESPONSIVE_DIR = ROOT_DIR / "assets" / "responsive"
+RESPONSIVE_STAT_CACHE = ROOT_DIR / ".cache" / "responsive-stat.json"
+RESPONSIVE_WIDTHS = (480, 960, 1600)
+RESPONSIVE_SOURCE_EXTENSIONS = {".jpg", ".jpeg", ".png"}
+WEBP_QUALITY = 80
+JPEG_QUALITY = 82
+PLACEHOLDER_SIZE = 24
+PLACEHOLDER_QUALITY = 40
+
+
+def pillow_available() -> bool:
+    return Image is not None
+
+
+def derivative_widths(width: int) -> list[int]:
+    """Return the target widths for a source, never upscaling it."""
+    widths = {value for value in RESPONSIVE_WIDTHS if value < width}
+    widths.add(min(width, RESPONSIVE_WIDTHS[-1]))
+    return sorted(widths)
+
+
+def derivative_stem(name: str) -> str:
+    # Keep the extension in the stem: image00042.jpg and image00042.jpeg coexist.
+    return re.sub(r"[^a-zA-Z0-9_-]+", "-", name).strip("-") or "image"
+
+
+def sha256_file(path: str | Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def placeholder_entry(image: "Image.Image") -> dict:
+    """Return a tiny WebP data URI and the average colour of an upright image.
+
+    Images with transparent pixels get neither: the placeholder would show
+    through them once the image has loaded.
+    """
+    if image.mode == "RGBA" and image.getchannel("A").getextrema()[0] < 255:
+        return {"placeholder": None, "color": None}
+    small = image.convert("RGB")
+    small.thumbnail((PLACEHOLDER_SIZE, PLACEHOLDER_SIZE), Image.Resampling.BOX)
+    buffer = io.BytesIO()
+    small.save(buffer, "WEBP", quality=PLACEHOLDER_QUALITY, method=6)
+    red, green, blue = small.resize((1, 1), Image.Resampling.BOX).getpixel((0, 0))
+    return {
+        "placeholder": "data:image/webp;base64," + base64.b64encode(buffer.getvalue()).decode("ascii"),
+        "color": f"#{red:02x}{green:02x}{blue:02x}",
+    }
+
+
+def encode_placeholder(source: str) -> dict:
+    with Image.open(source) as original:
+        original.seek(0)
+        original.draft("RGB", (PLACEHOLDER_SIZE * 8, PLACEHOLDER_SIZE * 8))
+        image = ImageOps.exif_transpose(original)
+        return placeholder_entry(image.convert("RGBA" if source.lower().endswith(".png") else "RGB"))
+
+
+def encode_derivatives(task: tuple[str, str, str]) -> dict:
+    """Write every width of one source and return its manifest entry."""
+    source, destination_dir, stem = task
+    destination_dir = Path(destination_dir)
+    destination_dir.mkdir(parents=True, exist_ok=True)
+    fallback = "png" if source.lower().endswith(".png") else "jpg"
+    with Image.open(source) as original:
+        original.seek(0)
+        image = ImageOps.exif_transpose(original)
+        if fallback == "png":
+            image = image.convert("RGBA")
+        else:
+            image = image.convert("RGB")
+        widths = derivative_widths(image.width)
+        for width in widths:
+            height = max(1, round(image.height * width / image.width))
+            resized = image if width == image.width else image.resize((width, height), Image.Resampling.LANCZOS)
+            with atomic_output(destination_dir / f"{stem}-{width}w.webp") as temporary:
+                resized.save(temporary, "WEBP", quality=WEBP_QUALITY, method=4)
+            with atomic_output(destination_dir / f"{stem}-{width}w.{fallback}") as temporary:
+                if fallback == "png":
+                    resized.save(temporary, "PNG", optimize=True)
+                else:
+                    resized.save(temporary, "JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+        return {
+            "sha256": sha256_file(source),
+            "width": image.width,
+            "height": image.height,
+            "widths": widths,
+            "fallback": fallback,
+            **placeholder_entry(image),
+        }
+
+
+def _encode_in_worker(task: tuple[str, str, str]) -> tuple[dict, OutputReport]:
+    """Encode one source and hand the worker's output counts back to the parent."""
+    return encode_derivatives(task), take_report()
+
+
+def load_json_file(path: Path) -> dict:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+class ResponsiveImages:
+    """Derivative state for one site build."""
+
+    def __init__(self, output_dir: str | Path = RESPONSIVE_DIR) -> None:
+        self.output_dir = Path(output_dir)
+        self.manifest_path = self.output_dir / "manifest.json"
+        self.manifest = load_json_file(self.manifest_path)
+        self.stat_cache = load_json_file(RESPONSIVE_STAT_CACHE)
+        self.seen: set[str] = set()
+        self.ready: set[str] = set()
+        self.missing: list[str] = []
+
+    def prepare(self, sources: list[tuple[str, str, int, int]], jobs: int = 1) -> int:
+        """Build derivatives for ``(key, path, size, mtime_ns)`` sources that changed.
+
+        Returns the number of sources that were (re)encoded. Without Pillow,
+        changed sources are listed in ``missing`` and keep their originals.
+        Current entries from before placeholders existed only get a placeholder.
+        """
+        stale = []
+        unplaced = []
+        for key, path, size, mtime_ns in sources:
+            if os.path.splitext(path)[1].lower() not in RESPONSIVE_SOURCE_EXTENSIONS:
+                continue
+            self.seen.add(key)
+            signature = f"{size}:{mtime_ns}"
+            entry = self.manifest.get(key)
+            if entry and self.stat_cache.get(key) == signature and self.files_exist(key, entry):
+                self.ready.add(key)
+            elif entry and self.files_exist(key, entry) and entry.get("sha256") == sha256_file(path):
+                self.stat_cache[key] = signature
+                self.ready.add(key)
+            else:
+                stale.append((key, path, signature))
+                continue
+            if "placeholder" not in entry:
+                unplaced.append((key, path))
+        if pillow_available():
+            for key, path in unplaced:
+                self.manifest[key].update(encode_placeholder(path))
+        if not pillow_available():
+            self.missing = [key for key, _path, _signature in stale]
+            return 0
+        if not stale:
+            return 0
+        tasks = [
+            (path, str(self.output_dir / os.path.dirname(key)), derivative_stem(os.path.basename(key)))
+            for key, path, _signature in stale
+        ]
+        jobs = min(jobs or os.cpu_count() or 1, len(tasks))
+        if jobs > 1:
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                entries = []
+                for entry, counts in executor.map(_encode_in_worker, tasks):
+                    entries.append(entry)
+                    report().add(counts)
+        else:
+            entries = [encode_derivatives(task) for task in tasks]
+        for (key, _path, signature), entry in zip(stale, entries):
+            self.manifest[key] = entry
+            self.stat_cache[key] = signature
+            self.ready.add(key)
+        return len(stale)
+
+    def derivative_path(self, key: str, width: int, extension: str) -> Path:
+        return self.output_dir / os.path.dirname(key) / f"{derivative_stem(os.path.basename(key))}-{width}w.{extension}"
+
+    def files_exist(self, key: str, entry: dict) -> bool:
+        return all(
+            self.derivative_path(key, width, extension).exists()
+            for width in entry.get("widths", [])
+            for extension in ("webp", entry.get("fallback", "jpg"))
+        )
+
+    def variants(self, key: str, base_dir: str | Path) -> dict | None:
+        """Return srcset data for a prepared source, with URLs relative to ``base_dir``."""
+        entry = self.manifest.get(key)
+        if key not in self.ready or not entry:
+            return None
+
+        def srcset(extension: str) -> str:
+            return ", ".join(
+                f"{os.path.relpath(self.derivative_path(key, width, extension), base_dir)} {width}w".replace("\\", "/")
+                for width in entry["widths"]
+            )
+
+        largest = entry["widths"][-1]
+        fallback = entry["fallback"]
+        return {
+            "webp": srcset("webp"),
+            "fallback": srcset(fallback),
+            "src": os.path.relpath(self.derivative_path(key, largest, fallback), base_dir).replace("\\", "/"),
+            "thumb": os.path.relpath(self.derivative_path(key, entry["widths"][0], "webp"), base_dir).replace("\\", "/"),
+            "width": entry["width"],
+            "height": entry["height"],
+            "placeholder": entry.get("placeholder"),
+            "color": entry.get("color"),
+        }
+
+    def save(self) -> None:
+        """Persist the manifests and delete derivatives of removed sources."""
+        for key in sorted(set(self.manifest) - self.seen):
+            entry = self.manifest.pop(key)
+            for width in entry.get("widths", []):
+                for extension in ("webp", entry.get("fallback", "jpg")):
+                    self.derivative_path(key, width, extension).unlink(missing_ok=True)
+            self.stat_cache.pop(key, None)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        write_output(self.manifest_path, json.dumps(self.manifest, indent=2, sort_keys=True) + "\n")
+        write_output(RESPONSIVE_STAT_CACHE, json.dumps(self.stat_cache, sort_keys=True) + "\n")
@@ -0,0 +1,146 @@
+"""Pixel dimensions of project images, read from file headers only.
+
+The pages give every ``<img>`` its ``width`` and ``height`` so browsers can
+reserve space before the image arrives. JPEG, PNG, GIF, WebP and SVG sizes
+come from the first bytes of each file; JPEG and PNG sizes are swapped when
+their EXIF orientation rotates the picture by 90 degrees, because browsers
+display them rotated. A local cache in ``.cache/`` keyed by path, size and
+mtime means later builds open only new or changed images.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import struct
+from pathlib import Path
+
+from tools.media_dates import PNG_SIGNATURE, parse_exif_orientation, read_exif_block
+from tools.output_writer import write_output
+
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+IMAGE_DIMENSIONS_CACHE = ROOT_DIR / ".cache" / "image-dimensions.json"
+DIMENSION_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".webp", ".svg"}
+SVG_HEAD_BYTES = 4096
+SVG_TAG_PATTERN = re.compile(rb"<svg\b[^>]*>", re.S)
+SVG_LENGTH_PATTERN = re.compile(r"^\s*([0-9.]+)\s*(px)?\s*$")
+# Orientations 5-8 rotate by 90 or 270 degrees.
+ROTATED_ORIENTATIONS = {5, 6, 7, 8}
+
+
+def jpeg_size(handle) -> tuple[int, int] | None:
+    handle.seek(2)
+    while True:
+        byte = handle.read(1)
+        while byte == b"\xff":
+            byte = handle.read(1)
+        if not byte:
+            return None
+        marker = byte[0]
+        if marker == 0x01 or 0xD0 <= marker <= 0xD7:
+            continue
+        if marker in (0xD9, 0xDA):
+            return None
+        length = struct.unpack(">H", handle.read(2))[0] - 2
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            height, width = struct.unpack(">xHH", handle.read(5))
+            return width, height
+        handle.seek(length, os.SEEK_CUR)
+
+
+def webp_size(head: bytes) -> tuple[int, int] | None:
+    chunk = head[12:16]
+    if chunk == b"VP8 " and head[23:26] == b"\x9d\x01\x2a":
+        width, height = struct.unpack("<HH", head[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b"VP8L" and head[20] == 0x2F:
+        bits = int.from_bytes(head[21:25], "little")
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b"VP8X":
+        return int.from_bytes(head[24:27], "little") + 1, int.from_bytes(head[27:30], "little") + 1
+    return None
+
+
+def svg_size(head: bytes) -> tuple[int, int] | None:
+    """Use the root element's pixel width and height, else its viewBox."""
+    match = SVG_TAG_PATTERN.search(head)
+    if not match:
+        return None
+    tag = match.group(0).decode("utf-8", "replace")
+    attributes = dict(re.findall(r'([\w:-]+)\s*=\s*["\']([^"\']*)["\']', tag))
+    width = SVG_LENGTH_PATTERN.match(attributes.get("width", ""))
+    height = SVG_LENGTH_PATTERN.match(attributes.get("height", ""))
+    if width and height:
+        return round(float(width.group(1))), round(float(height.group(1)))
+    view_box = attributes.get("viewBox", "").replace(",", " ").split()
+    if len(view_box) == 4:
+        try:
+            return round(float(view_box[2])), round(float(view_box[3]))
+        except ValueError:
+            return None
+    return None
+
+
+def read_dimensions(path: str | Path) -> tuple[int, int] | None:
+    """Return the displayed ``(width, height)`` of an image, or None if unknown."""
+    try:
+        with open(path, "rb") as handle:
+            head = handle.read(32)
+            if head[:2] == b"\xff\xd8":
+                size = jpeg_size(handle)
+            elif head[:8] == PNG_SIGNATURE and head[12:16] == b"IHDR":
+                size = struct.unpack(">II", head[16:24])
+            elif head[:6] in (b"GIF87a", b"GIF89a"):
+                size = struct.unpack("<HH", head[6:10])
+            elif head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+                size = webp_size(head)
+            elif os.path.splitext(os.fspath(path))[1].lower() == ".svg":
+                handle.seek(0)
+                return svg_size(handle.read(SVG_HEAD_BYTES))
+            else:
+                return None
+        if size and (head[:2] == b"\xff\xd8" or head[:8] == PNG_SIGNATURE):
+            tiff = read_exif_block(path)
+            if tiff and parse_exif_orientation(tiff) in ROTATED_ORIENTATIONS:
+                size = size[1], size[0]
+    except (OSError, struct.error, IndexError):
+        return None
+    if not size or not all(size):
+        return None
+    return int(size[0]), int(size[1])
+
+
+class ImageDimensions:
+    """Dimension lookups for one site build, backed by the stat-keyed cache."""
+
+    def __init__(self, cache_path: Path = IMAGE_DIMENSIONS_CACHE) -> None:
+        self.cache_path = cache_path
+        try:
+            data = json.loads(cache_path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            data = {}
+        self.cache: dict[str, list] = data if isinstance(data, dict) else {}
+        self.seen: set[str] = set()
+        self.changed = False
+
+    def get(self, path: str | Path, size: int, mtime_ns: int) -> tuple[int, int] | None:
+        key = os.path.relpath(path, ROOT_DIR).replace("\\", "/")
+        self.seen.add(key)
+        entry = self.cache.get(key)
+        if entry and entry[:2] == [size, mtime_ns]:
+            return tuple(entry[2:]) if entry[2] else None
+        dimensions = read_dimensions(path)
+        self.cache[key] = [size, mtime_ns, *(dimensions or (None, None))]
+        self.changed = True
+        return dimensions
+
+    def save(self) -> None:
+        """Write the cache if an entry was added, changed, or no longer requested."""
+        stale = set(self.cache) - self.seen
+        for key in stale:
+            del self.cache[key]
+        if not (self.changed or stale):
+            return
+        write_output(self.cache_path, json.dumps(self.cache, sort_keys=True) + "\n")
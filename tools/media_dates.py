@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""Capture dates for project images, kept in each folder's ``media-dates.json``.
+
+File creation and modification times change whenever images are copied or
+cloned, so the drone gallery orders images by the EXIF ``DateTimeOriginal``
+stored in the files themselves. Times without an ``OffsetTimeOriginal`` are
+read in ``MEDIA_TIMEZONE``, the zone the pages also format dates in. Only the
+JPEG ``APP1`` segment or PNG ``eXIf`` chunk is read, never the pixel data. A local stat cache in ``.cache/`` records
+the size and mtime of every file already checked, so later builds only open new
+or changed images. Dates already stored in ``media-dates.json`` are trusted,
+which keeps hand-entered dates for images without EXIF data. Filesystem dates
+are never stored: an image with neither EXIF nor a hand-entered date is left
+out, and the site build falls back to its file date at build time.
+
+Run directly to create or refresh the dates of one or more project folders:
+    python3 tools/media_dates.py projects/0010-droneimages
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import struct
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+from tools.output_writer import write_output
+from tools.project_library import MEDIA_DATES_FILE, ProjectFolder, ProjectLibrary, scan_project
+
+
+MEDIA_DATES_STAT_CACHE = ROOT_DIR / ".cache" / "media-dates-stat.json"
+# EXIF times without an offset are camera wall-clock times, read in this zone;
+# the pages format every media date in it too, so no build depends on the
+# machine's own time zone.
+MEDIA_TIMEZONE = ZoneInfo("Europe/Zurich")
+DATED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif"}
+EXIF_IFD_POINTER = 0x8769
+DATETIME = 0x0132
+DATETIME_ORIGINAL = 0x9003
+DATETIME_DIGITIZED = 0x9004
+OFFSET_TIME_ORIGINAL = 0x9011
+ORIENTATION = 0x0112
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def read_ifd(tiff: bytes, offset: int, byte_order: str) -> dict[int, str]:
+    """Return the ASCII-valued tags and the Exif IFD pointer of one TIFF IFD."""
+    values: dict[int, str] = {}
+    (count,) = struct.unpack_from(byte_order + "H", tiff, offset)
+    for index in range(count):
+        tag, kind, length, value = struct.unpack_from(byte_order + "HHI4s", tiff, offset + 2 + index * 12)
+        if tag == EXIF_IFD_POINTER:
+            values[tag] = str(struct.unpack(byte_order + "I", value)[0])
+        elif kind == 2:
+            if length > 4:
+                start = struct.unpack(byte_order + "I", value)[0]
+                value = tiff[start:start + length]
+            values[tag] = value[:length].split(b"\0", 1)[0].decode("ascii", "replace").strip()
+    return values
+
+
+def parse_exif_datetime(tiff: bytes) -> float | None:
+    """Return the capture time stored in a TIFF-structured EXIF block."""
+    try:
+        byte_order = {b"II": "<", b"MM": ">"}[tiff[:2]]
+        ifd0 = read_ifd(tiff, struct.unpack_from(byte_order + "I", tiff, 4)[0], byte_order)
+        exif = read_ifd(tiff, int(ifd0[EXIF_IFD_POINTER]), byte_order) if EXIF_IFD_POINTER in ifd0 else {}
+    except (KeyError, struct.error, ValueError):
+        return None
+    stamp = exif.get(DATETIME_ORIGINAL) or exif.get(DATETIME_DIGITIZED) or ifd0.get(DATETIME)
+    try:
+        captured = datetime.strptime(stamp or "", "%Y:%m:%d %H:%M:%S")
+    except ValueError:
+        return None
+    offset = exif.get(OFFSET_TIME_ORIGINAL, "")
+    if len(offset) == 6 and offset[0] in "+-" and offset[3] == ":":
+        sign = -1 if offset[0] == "-" else 1
+        delta = timedelta(hours=int(offset[1:3]), minutes=int(offset[4:6]))
+        captured = captured.replace(tzinfo=timezone(sign * delta))
+    else:
+        captured = captured.replace(tzinfo=MEDIA_TIMEZONE)
+    return captured.timestamp()
+
+
+def parse_exif_orientation(tiff: bytes) -> int:
+    """Return the EXIF orientation (1-8) of a TIFF-structured block; 1 if unset."""
+    try:
+        byte_order = {b"II": "<", b"MM": ">"}[tiff[:2]]
+        offset = struct.unpack_from(byte_order + "I", tiff, 4)[0]
+        (count,) = struct.unpack_from(byte_order + "H", tiff, offset)
+        for index in range(count):
+            tag, kind, _length, value = struct.unpack_from(byte_order + "HHI4s", tiff, offset + 2 + index * 12)
+            if tag == ORIENTATION and kind == 3:
+                orientation = struct.unpack_from(byte_order + "H", value)[0]
+                return orientation if 1 <= orientation <= 8 else 1
+    except (KeyError, struct.error):
+        pass
+    return 1
+
+
+def read_exif_block(path: str | Path) -> bytes | None:
+    """Read the raw EXIF block from a JPEG or PNG header, stopping before image data."""
+    with open(path, "rb") as handle:
+        head = handle.read(8)
+        if head[:2] == b"\xff\xd8":
+            handle.seek(2)
+            while True:
+                marker = handle.read(4)
+                if len(marker) < 4 or marker[0] != 0xFF or marker[1] in (0xD9, 0xDA):
+                    return None
+                length = struct.unpack(">H", marker[2:])[0] - 2
+                if marker[1] == 0xE1:
+                    data = handle.read(length)
+                    if data.startswith(b"Exif\0\0"):
+                        return data[6:]
+                else:
+                    handle.seek(length, os.SEEK_CUR)
+        if head == PNG_SIGNATURE:
+            while True:
+                chunk = handle.read(8)
+                if len(chunk) < 8 or chunk[4:] in (b"IDAT", b"IEND"):
+                    return None
+                length = struct.unpack(">I", chunk[:4])[0]
+                if chunk[4:] == b"eXIf":
+                    return handle.read(length)
+                handle.seek(length + 4, os.SEEK_CUR)
+    return None
+
+
+def read_capture_time(path: str | Path) -> float | None:
+    """Return the EXIF capture time of an image as a Unix timestamp, if it has one."""
+    try:
+        tiff = read_exif_block(path)
+    except (OSError, struct.error):
+        return None
+    return parse_exif_datetime(tiff) if tiff else None
+
+
+def load_stat_cache(path: Path = MEDIA_DATES_STAT_CACHE) -> dict[str, str]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def save_stat_cache(stat_cache: dict[str, str], path: Path = MEDIA_DATES_STAT_CACHE) -> None:
+    write_output(path, json.dumps(stat_cache, sort_keys=True) + "\n")
+
+
+def is_dated_media(name: str) -> bool:
+    stem, suffix = os.path.splitext(name)
+    return suffix.lower() in DATED_EXTENSIONS and stem.lower() not in ("icon", "trailer")
+
+
+def update_media_dates(project: ProjectFolder, stat_cache: dict[str, str]) -> bool:
+    """Bring one folder's ``media-dates.json`` up to date; return True if it was rewritten."""
+    stored = dict(project.media_dates)
+    dates = dict(stored)
+    for item in project.files:
+        if not is_dated_media(item.name):
+            continue
+        key = f"{project.name}/{item.name}"
+        signature = f"{item.size}:{item.mtime_ns}"
+        cached = stat_cache.get(key)
+        # A matching signature means the file was already read, including
+        # files without EXIF, which stay out of media-dates.json.
+        if cached == signature or (cached is None and item.name in dates):
+            stat_cache[key] = signature
+            continue
+        captured = read_capture_time(project.path / item.name)
+        if captured is not None:
+            dates[item.name] = int(captured)
+        stat_cache[key] = signature
+    prefix = f"{project.name}/"
+    for key in [key for key in stat_cache if key.startswith(prefix)]:
+        if not project.has(key[len(prefix):]):
+            del stat_cache[key]
+    if dates == stored and project.has(MEDIA_DATES_FILE):
+        return False
+    return write_output(project.path / MEDIA_DATES_FILE, json.dumps(dates, indent=2, sort_keys=True) + "\n")
+
+
+def refresh_library_dates(library: ProjectLibrary) -> ProjectLibrary:
+    """Update every folder that keeps a ``media-dates.json`` and return the refreshed snapshot."""
+    stat_cache = load_stat_cache()
+    before = dict(stat_cache)
+    projects = []
+    for project in library.projects:
+        if project.has(MEDIA_DATES_FILE) and update_media_dates(project, stat_cache):
+            project = scan_project(project.path, project.project_id)
+        projects.append(project)
+    if stat_cache != before:
+        save_stat_cache(stat_cache)
+    return ProjectLibrary(root=library.root, projects=tuple(projects))
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Fill media-dates.json from EXIF capture dates.")
+    parser.add_argument("folders", nargs="+", type=Path, help="project folders to date")
+    args = parser.parse_args(argv)
+    stat_cache = load_stat_cache()
+    for folder in args.folders:
+        if not folder.is_dir():
+            raise SystemExit(f"Not a project folder: {folder}")
+        updated = update_media_dates(scan_project(folder.resolve()), stat_cache)
+        print(f"{folder}: {'updated' if updated else 'up to date'}")
+    save_stat_cache(stat_cache)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""Atomic, write-if-changed output for every generated file.
+
+The site build and the portfolio export regenerate many files whose bytes
+usually do not change. ``write_output()`` compares the new bytes with the file
+already on disk by size and SHA-256 and leaves an identical file untouched, so
+its mtime, downstream caches and rsync deltas stay intact. Changed files are
+written to a temporary file in the same directory and moved into place with
+``os.replace``, so an interrupted run never leaves a half-written output.
+``atomic_output()`` does the same for libraries that write to a path
+themselves, such as ReportLab, Chrome and ``zipfile``.
+
+Each process counts written and unchanged files and bytes in ``report()``;
+worker processes hand theirs back with ``take_report()``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterator
+
+
+@dataclass
+class OutputReport:
+    written: int = 0
+    unchanged: int = 0
+    bytes_written: int = 0
+    bytes_unchanged: int = 0
+
+    def add(self, other: "OutputReport") -> None:
+        self.written += other.written
+        self.unchanged += other.unchanged
+        self.bytes_written += other.bytes_written
+        self.bytes_unchanged += other.bytes_unchanged
+
+    def summary(self) -> str:
+        return (
+            f"{self.written} file(s) written ({self.bytes_written / 1024:.1f} KiB), "
+            f"{self.unchanged} unchanged ({self.bytes_unchanged / 1024:.1f} KiB)"
+        )
+
+
+_report = OutputReport()
+
+
+def report() -> OutputReport:
+    """Return this process's running totals."""
+    return _report
+
+
+def take_report() -> OutputReport:
+    """Return this process's totals and start counting from zero."""
+    global _report
+    taken, _report = _report, OutputReport()
+    return taken
+
+
+@lru_cache(maxsize=None)
+def _default_mode() -> int:
+    # mkstemp creates 0600 files; new outputs get the usual umask-based mode.
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+def _sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for block in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _same_file(path: Path, size: int, sha256: str) -> bool:
+    try:
+        return path.stat().st_size == size and _sha256_file(path) == sha256
+    except OSError:
+        return False
+
+
+def _temporary_path(path: Path) -> Path:
+    handle, name = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp" + path.suffix, dir=path.parent)
+    os.close(handle)
+    return Path(name)
+
+
+def _commit(temporary: Path, path: Path) -> bool:
+    """Move ``temporary`` over ``path`` unless the contents are identical."""
+    size = temporary.stat().st_size
+    if _same_file(path, size, _sha256_file(temporary)):
+        temporary.unlink()
+        _report.unchanged += 1
+        _report.bytes_unchanged += size
+        return False
+    try:
+        mode = path.stat().st_mode & 0o7777
+    except OSError:
+        mode = _default_mode()
+    os.chmod(temporary, mode)
+    os.replace(temporary, path)
+    _report.written += 1
+    _report.bytes_written += size
+    return True
+
+
+def write_output(path: str | Path, data: str | bytes, encoding: str = "utf-8") -> bool:
+    """Write ``data`` to ``path`` unless it already holds it; return True if written."""
+    path = Path(path)
+    payload = data.encode(encoding) if isinstance(data, str) else data
+    if _same_file(path, len(payload), hashlib.sha256(payload).hexdigest()):
+        _report.unchanged += 1
+        _report.bytes_unchanged += len(payload)
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = _temporary_path(path)
+    try:
+        temporary.write_bytes(payload)
+        return _commit(temporary, path)
+    finally:
+        temporary.unlink(missing_ok=True)
+
+
+@contextmanager
+def atomic_output(path: str | Path) -> Iterator[Path]:
+    """Yield a temporary path to write ``path`` through.
+
+    On a clean exit the temporary file replaces ``path`` if its contents
+    differ; it is discarded if they match, if nothing was written to it, or if
+    the block raised.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = _temporary_path(path)
+    try:
+        temporary.unlink()
+        yield temporary
+        if temporary.exists():
+            _commit(temporary, path)
+    finally:
+        temporary.unlink(missing_ok=True)
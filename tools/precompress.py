@@ -0,0 +1,118 @@
+"""Precompressed ``.gz`` and ``.zst`` sidecars for the published text assets.
+
+Static hosts that support precompressed files can answer
+``Accept-Encoding: gzip`` or ``zstd`` with ``page.html.gz`` or
+``page.html.zst`` directly instead of compressing every response. Sidecars are
+written at maximum compression and only when they are smaller than the
+original. ``precompressed.json`` records each file's size and SHA-256 together
+with its sidecars, and lets later runs skip files that have not changed.
+The zstd sidecars need the optional ``zstandard`` package.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from tools.output_writer import write_output
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+ROOT_DIR = Path(__file__).resolve().parents[1]
+PRECOMPRESS_MANIFEST = ROOT_DIR / "precompressed.json"
+PRECOMPRESS_EXTENSIONS = {".html", ".css", ".js", ".svg", ".json"}
+# Glob patterns relative to the site root.
+PRECOMPRESS_SOURCES = ("index.html", "index-*.html", "index-*.json", "index.search.json", "projecthtml", "assets")
+# Derivative manifests and similar build bookkeeping are never requested by pages.
+PRECOMPRESS_SKIP_DIRS = {"responsive", "icon-atlas", "portfolio-images"}
+
+
+def zstd_available() -> bool:
+    return zstandard is not None
+
+
+def gzip_bytes(data: bytes) -> bytes:
+    # mtime=0 keeps the output byte-identical between builds.
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def zstd_bytes(data: bytes) -> bytes:
+    return zstandard.ZstdCompressor(level=zstandard.MAX_COMPRESSION_LEVEL).compress(data)
+
+
+def precompress_candidates(root: Path = ROOT_DIR) -> list[Path]:
+    files: list[Path] = []
+    paths = [path for source in PRECOMPRESS_SOURCES for path in sorted(root.glob(source))]
+    for path in paths:
+        if path.is_file():
+            files.append(path)
+            continue
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames[:] = sorted(name for name in dirnames if name not in PRECOMPRESS_SKIP_DIRS)
+            files.extend(
+                Path(dirpath, name) for name in sorted(filenames)
+                if os.path.splitext(name)[1].lower() in PRECOMPRESS_EXTENSIONS
+            )
+    return files
+
+
+def write_sidecar(path: Path, suffix: str, compressed: bytes, size: int) -> dict | None:
+    """Write ``path + suffix`` if it saves bytes, otherwise remove any stale sidecar."""
+    sidecar = path.with_name(path.name + suffix)
+    if len(compressed) >= size:
+        sidecar.unlink(missing_ok=True)
+        return None
+    write_output(sidecar, compressed)
+    return {"size": len(compressed)}
+
+
+def sidecars_current(path: Path, entry: dict, encodings: dict) -> bool:
+    """True if ``entry`` covers exactly the active encodings and its sidecars exist."""
+    if set(entry) - {"size", "sha256"} != {name for name, _compress in encodings.values()}:
+        return False
+    return all(
+        (entry[name] is not None) == path.with_name(path.name + suffix).exists()
+        for suffix, (name, _compress) in encodings.items()
+    )
+
+
+def precompress_site(root: Path = ROOT_DIR, manifest_path: Path = PRECOMPRESS_MANIFEST) -> dict[str, int]:
+    """Refresh every sidecar and the manifest; return counts of compressed and unchanged files."""
+    try:
+        previous = json.loads(manifest_path.read_text(encoding="utf-8")).get("files", {})
+    except (OSError, json.JSONDecodeError, AttributeError):
+        previous = {}
+    encodings = {".gz": ("gzip", gzip_bytes)}
+    if zstd_available():
+        encodings[".zst"] = ("zstd", zstd_bytes)
+
+    files = {}
+    counts = {"compressed": 0, "unchanged": 0}
+    for path in precompress_candidates(root):
+        key = path.relative_to(root).as_posix()
+        data = path.read_bytes()
+        entry = {"size": len(data), "sha256": hashlib.sha256(data).hexdigest()}
+        old = previous.get(key, {})
+        if old.get("sha256") == entry["sha256"] and sidecars_current(path, old, encodings):
+            files[key] = old
+            counts["unchanged"] += 1
+            continue
+        for suffix, (name, compress) in encodings.items():
+            entry[name] = write_sidecar(path, suffix, compress(data), len(data))
+        if not zstd_available():
+            path.with_name(path.name + ".zst").unlink(missing_ok=True)
+        files[key] = entry
+        counts["compressed"] += 1
+
+    for key in sorted(set(previous) - set(files)):
+        for suffix in (".gz", ".zst"):
+            (root / (key + suffix)).unlink(missing_ok=True)
+    write_output(manifest_path, json.dumps({"files": files}, indent=2, sort_keys=True) + "\n")
+    return counts
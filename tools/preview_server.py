@@ -0,0 +1,150 @@
+"""Local preview server for the generated website.
+
+Serves the repository root the way GitHub Pages does, so ``index.html`` and the
+``../projects`` and ``../assets`` links of the project pages resolve. Every
+response carries an ``ETag`` and ``Last-Modified`` so reloads after a rebuild
+revalidate cheaply, and single byte ranges are honoured so browsers can seek
+inside the mp4 trailers.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import threading
+from email.utils import parsedate_to_datetime
+from functools import partial
+from http import HTTPStatus
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, BinaryIO
+
+
+HOST = "127.0.0.1"
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+COPY_BLOCK_SIZE = 1 << 16
+IMMUTABLE_PREFIX = "/assets/dist/"
+
+
+def byte_range(header: str, size: int) -> tuple[int, int] | None:
+    """Parse a single ``bytes=`` range into inclusive offsets; None if unsatisfiable.
+
+    Multiple ranges are not supported and raise ValueError so the caller can
+    fall back to a full response.
+    """
+    match = RANGE_PATTERN.match(header.strip())
+    if not match or match.group(1) == match.group(2) == "":
+        raise ValueError(header)
+    first, last = match.groups()
+    if first == "":
+        start, end = max(0, size - int(last)), size - 1
+    else:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return None
+    return start, end
+
+
+class PreviewRequestHandler(SimpleHTTPRequestHandler):
+    server_version = "SitePreview/1.0"
+
+    def log_message(self, fmt: str, *args: Any) -> None:
+        print(f"[{self.log_date_time_string()}] {fmt % args}")
+
+    def end_headers(self) -> None:
+        path = self.path.split("?", 1)[0]
+        if path.startswith(IMMUTABLE_PREFIX) and not path.endswith("/manifest.json"):
+            # Fingerprinted names change with their content.
+            self.send_header("Cache-Control", "public, max-age=31536000, immutable")
+        else:
+            # Always revalidate: the build may rewrite any file between requests.
+            self.send_header("Cache-Control", "no-cache")
+        super().end_headers()
+
+    def not_modified(self, etag: str, mtime: float) -> bool:
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is not None:
+            tags = [tag.strip() for tag in if_none_match.split(",")]
+            return "*" in tags or etag in tags or f"W/{etag}" in tags
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_modified_since:
+            try:
+                return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError, IndexError, OverflowError):
+                return False
+        return False
+
+    def send_head(self) -> BinaryIO | None:
+        self.range_remaining = None
+        path = self.translate_path(self.path)
+        if not os.path.isfile(path) or self.path.split("?", 1)[0].endswith("/"):
+            return super().send_head()
+        try:
+            handle = open(path, "rb")
+        except OSError:
+            self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+            return None
+        stat = os.fstat(handle.fileno())
+        etag = f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+        last_modified = self.date_time_string(int(stat.st_mtime))
+
+        if self.not_modified(etag, stat.st_mtime):
+            handle.close()
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", last_modified)
+            self.end_headers()
+            return None
+
+        selected = (0, stat.st_size - 1)
+        status = HTTPStatus.OK
+        range_header = self.headers.get("Range")
+        if_range = self.headers.get("If-Range")
+        if range_header and (if_range is None or if_range in (etag, last_modified)):
+            try:
+                selected = byte_range(range_header, stat.st_size)
+                status = HTTPStatus.PARTIAL_CONTENT
+            except ValueError:
+                selected = (0, stat.st_size - 1)
+            if selected is None:
+                handle.close()
+                self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+                self.send_header("Content-Range", f"bytes */{stat.st_size}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return None
+
+        start, end = selected
+        self.send_response(status)
+        self.send_header("Content-Type", self.guess_type(path))
+        self.send_header("Content-Length", str(max(0, end - start + 1)))
+        self.send_header("Accept-Ranges", "bytes")
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", last_modified)
+        if status == HTTPStatus.PARTIAL_CONTENT:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{stat.st_size}")
+            handle.seek(start)
+        self.end_headers()
+        self.range_remaining = max(0, end - start + 1)
+        return handle
+
+    def copyfile(self, source: BinaryIO, outputfile: BinaryIO) -> None:
+        remaining = self.range_remaining
+        if remaining is None:
+            super().copyfile(source, outputfile)
+            return
+        while remaining > 0:
+            block = source.read(min(COPY_BLOCK_SIZE, remaining))
+            if not block:
+                break
+            outputfile.write(block)
+            remaining -= len(block)
+
+
+def start_preview_server(directory: str | Path, port: int) -> ThreadingHTTPServer:
+    """Serve ``directory`` on ``127.0.0.1:port`` from a background thread."""
+    handler = partial(PreviewRequestHandler, directory=os.fspath(directory))
+    server = ThreadingHTTPServer((HOST, port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
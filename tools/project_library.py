@@ -0,0 +1,211 @@
+"""Single-pass, read-only snapshot of the published project library.
+
+Both the website generator and the tailored portfolio export read the same
+``projects/NNNN-readable-slug/`` folders. This module walks them once with
+``os.scandir`` and keeps every folder's text metadata, media-date overrides and
+file stat information in frozen dataclasses, so later passes never have to go
+back to the disk.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+from dataclasses import dataclass
+from functools import cached_property
+from pathlib import Path
+
+
+PROJECT_FOLDER_PATTERN = re.compile(
+    r"^(?P<project_id>\d{4,})(?:-(?P<slug>[a-z0-9]+(?:-[a-z0-9]+)*))?$"
+)
+ICON_EXTENSIONS = (".svg", ".png", ".jpg", ".jpeg", ".gif")
+TRAILER_NAMES = ("trailer.txt", "trailer.mp4", "trailer.gif")
+MEDIA_DATES_FILE = "media-dates.json"
+
+
+@dataclass(frozen=True)
+class ProjectFile:
+    name: str
+    size: int
+    mtime_ns: int
+    created: float
+
+    @property
+    def stem(self) -> str:
+        return os.path.splitext(self.name)[0]
+
+    @property
+    def suffix(self) -> str:
+        return os.path.splitext(self.name)[1].lower()
+
+
+@dataclass(frozen=True)
+class ProjectFolder:
+    project_id: str | None
+    name: str
+    path: Path
+    files: tuple[ProjectFile, ...]
+    texts: tuple[tuple[str, str], ...]
+    media_dates: tuple[tuple[str, float], ...]
+
+    @cached_property
+    def files_by_name(self) -> dict[str, ProjectFile]:
+        return {item.name: item for item in self.files}
+
+    @cached_property
+    def texts_by_name(self) -> dict[str, str]:
+        return dict(self.texts)
+
+    @cached_property
+    def dates_by_name(self) -> dict[str, float]:
+        return dict(self.media_dates)
+
+    def file(self, name: str) -> ProjectFile | None:
+        return self.files_by_name.get(name)
+
+    def has(self, name: str) -> bool:
+        return name in self.files_by_name
+
+    def text(self, name: str) -> str:
+        """Return the stripped contents of a ``.txt`` file, or an empty string."""
+        return self.texts_by_name.get(name, "")
+
+    @property
+    def icon(self) -> ProjectFile | None:
+        return next(
+            (self.file(f"icon{ext}") for ext in ICON_EXTENSIONS if self.has(f"icon{ext}")),
+            None,
+        )
+
+    @property
+    def trailer(self) -> ProjectFile | None:
+        """Return the trailer, preferring an embed ``trailer.txt`` over video."""
+        return next((self.file(name) for name in TRAILER_NAMES if self.has(name)), None)
+
+
+@dataclass(frozen=True)
+class ProjectLibrary:
+    root: Path
+    projects: tuple[ProjectFolder, ...]
+
+    @cached_property
+    def by_id(self) -> dict[str, ProjectFolder]:
+        return {project.project_id: project for project in self.projects}
+
+    def get(self, project_id: str) -> ProjectFolder | None:
+        return self.by_id.get(project_id)
+
+    def folders(self) -> dict[str, Path]:
+        return {project.project_id: project.path for project in self.projects}
+
+
+def parse_project_folder(name: str) -> str | None:
+    match = PROJECT_FOLDER_PATTERN.fullmatch(name)
+    return match.group("project_id") if match else None
+
+
+def find_project_folders(projects_dir: str | Path) -> dict[str, Path]:
+    """List published project folders by ID, validating names and duplicates."""
+    root = Path(projects_dir).resolve()
+    projects: dict[str, Path] = {}
+    invalid: list[str] = []
+    with os.scandir(root) as entries:
+        for entry in entries:
+            if entry.name.startswith("_") or not entry.is_dir():
+                continue
+            project_id = parse_project_folder(entry.name)
+            if project_id is None:
+                if entry.name[:1].isdigit():
+                    invalid.append(entry.name)
+                continue
+            path = Path(entry.path).resolve()
+            try:
+                path.relative_to(root)
+            except ValueError as exc:
+                raise ValueError("Unsafe path detected!") from exc
+            if project_id in projects:
+                raise ValueError(
+                    f"Duplicate project ID {project_id}: "
+                    f"{projects[project_id].name} and {entry.name}"
+                )
+            projects[project_id] = path
+    if invalid:
+        raise ValueError(
+            "Invalid project folder name(s): " + ", ".join(sorted(invalid))
+            + ". Use NNNN-lowercase-hyphenated-title."
+        )
+    return projects
+
+
+def read_stripped(path: str | Path) -> str:
+    try:
+        with open(path, "r", encoding="utf-8") as handle:
+            return handle.read().strip()
+    except (OSError, UnicodeDecodeError):
+        return ""
+
+
+def load_media_dates(path: str | Path) -> tuple[tuple[str, float], ...]:
+    try:
+        with open(path, "r", encoding="utf-8") as handle:
+            stored = json.load(handle)
+    except (OSError, json.JSONDecodeError):
+        return ()
+    if not isinstance(stored, dict):
+        return ()
+    return tuple(
+        (str(name), value) for name, value in sorted(stored.items())
+        if isinstance(value, (int, float))
+    )
+
+
+def scan_project(path: str | Path, project_id: str | None = None) -> ProjectFolder:
+    """Read one project folder: a single directory listing plus its text files."""
+    path = Path(path)
+    if project_id is None:
+        project_id = parse_project_folder(path.name)
+    files: list[ProjectFile] = []
+    texts: list[tuple[str, str]] = []
+    media_dates: tuple[tuple[str, float], ...] = ()
+    try:
+        entries = list(os.scandir(path))
+    except FileNotFoundError:
+        entries = []
+    for entry in entries:
+        if not entry.is_file():
+            continue
+        stat = entry.stat()
+        files.append(ProjectFile(
+            name=entry.name,
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            created=getattr(stat, "st_birthtime", stat.st_mtime),
+        ))
+        if entry.name.lower().endswith(".txt"):
+            texts.append((entry.name, read_stripped(entry.path)))
+        elif entry.name == MEDIA_DATES_FILE:
+            media_dates = load_media_dates(entry.path)
+    files.sort(key=lambda item: item.name)
+    texts.sort()
+    return ProjectFolder(
+        project_id=project_id,
+        name=path.name,
+        path=path,
+        files=tuple(files),
+        texts=tuple(texts),
+        media_dates=media_dates,
+    )
+
+
+def scan_library(projects_dir: str | Path) -> ProjectLibrary:
+    """Snapshot every published project, ordered newest (highest ID) first."""
+    folders = find_project_folders(projects_dir)
+    return ProjectLibrary(
+        root=Path(projects_dir).resolve(),
+        projects=tuple(
+            scan_project(folders[project_id], project_id)
+            for project_id in sorted(folders, key=int, reverse=True)
+        ),
+    )
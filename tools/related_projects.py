@@ -0,0 +1,110 @@
+"""Hashtag-based "u might also like" suggestions.
+
+The index maps every hashtag to the projects using it, so related candidates
+come from the postings of a project's own tags instead of a scan of the whole
+library. Candidates are ranked by IDF-weighted Jaccard similarity: rare shared
+tags count for more than the broad filter tags most projects carry. Tags are
+visited from the rarest up. A tag with a long postings list only re-ranks the
+candidates already found once no other project can still reach the top
+results (see ``HashtagIndex.settled``), so the ranking stays the same as an
+exhaustive scan while the build stays far from quadratic at thousands of
+projects. Weights are summed in a fixed tag order and scores are rounded to
+``SCORE_DIGITS`` before ties go to the higher ID, so the suggestions do not
+depend on ``PYTHONHASHSEED``.
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+from collections import defaultdict
+from typing import Iterable
+
+
+BROAD_TAG_POSTINGS = 256
+SCORE_DIGITS = 12
+
+
+class HashtagIndex:
+    def __init__(self, projects: Iterable[tuple[str, Iterable[str]]]) -> None:
+        self.tags: dict[str, frozenset[str]] = {}
+        self.postings: dict[str, list[str]] = defaultdict(list)
+        for project_id, hashtags in projects:
+            tags = frozenset(hashtags)
+            self.tags[project_id] = tags
+            for tag in tags:
+                self.postings[tag].append(project_id)
+        self.member_sets: dict[str, frozenset[str]] = {}
+        total = len(self.tags)
+        self.idf = {tag: math.log(1 + total / len(ids)) for tag, ids in self.postings.items()}
+        self.weights = {
+            project_id: sum(self.idf[tag] for tag in sorted(tags))
+            for project_id, tags in self.tags.items()
+        }
+        self.lightest = {
+            tag: min(self.weights[project_id] for project_id in ids)
+            for tag, ids in self.postings.items()
+        }
+
+    def members(self, tag: str) -> frozenset[str]:
+        if tag not in self.member_sets:
+            self.member_sets[tag] = frozenset(self.postings[tag])
+        return self.member_sets[tag]
+
+    def related(self, project_id: str, limit: int) -> list[str]:
+        """Return up to ``limit`` other project IDs sharing a tag, most similar first.
+
+        Equal scores prefer the higher, newer project ID.
+        """
+        shared: dict[str, float] = defaultdict(float)
+        own = self.weights.get(project_id, 0.0)
+        tags = sorted(self.tags.get(project_id, ()), key=lambda tag: (len(self.postings[tag]), tag))
+        # Weight of the tags not processed yet: the most a project found only
+        # from here on can still share. Such a project carries one of those
+        # tags, so it weighs at least the lightest project among their postings.
+        remaining = sum(self.idf[tag] for tag in tags)
+        lightest = [math.inf] * (len(tags) + 1)
+        for position in range(len(tags) - 1, -1, -1):
+            lightest[position] = min(self.lightest[tags[position]], lightest[position + 1])
+        # The bound only shrinks and the candidates' scores only grow, so once
+        # settled, the rest of the tags are too.
+        settled = False
+        for position, tag in enumerate(tags):
+            weight = self.idf[tag]
+            postings = self.postings[tag]
+            if len(postings) > BROAD_TAG_POSTINGS and not settled:
+                settled = self.settled(shared, own, remaining, lightest[position], limit)
+            if len(postings) > BROAD_TAG_POSTINGS and settled:
+                members = self.members(tag)
+                for other in shared:
+                    if other in members:
+                        shared[other] += weight
+            else:
+                for other in postings:
+                    if other != project_id:
+                        shared[other] += weight
+            remaining -= weight
+        scored = (
+            (self.similarity(own, other, overlap), int(other), other)
+            for other, overlap in shared.items()
+        )
+        return [other for _score, _number, other in heapq.nlargest(limit, scored)]
+
+    def similarity(self, own: float, other: str, overlap: float) -> float:
+        # Rounded so that last-bit differences never decide the ID tie-break.
+        return round(overlap / (own + self.weights[other] - overlap), SCORE_DIGITS)
+
+    def settled(self, shared: dict[str, float], own: float, remaining: float, lightest: float, limit: int) -> bool:
+        """Return True if no project outside ``shared`` can still reach the top ``limit``.
+
+        A project found only through the remaining tags shares at most
+        ``remaining`` and weighs at least ``lightest``, which bounds its
+        similarity. The scores of the candidates in ``shared`` only grow as
+        more tags are added, so once the current ``limit``-th best is strictly
+        higher than that bound, a broad tag's postings need not be scanned.
+        """
+        if len(shared) < limit or own <= 0:
+            return False
+        bound = round(remaining / (own + max(lightest, remaining) - remaining), SCORE_DIGITS)
+        kth = heapq.nlargest(limit, (self.similarity(own, other, overlap) for other, overlap in shared.items()))[-1]
+        return kth > bound
@@ -0,0 +1,64 @@
+"""Tag and title index behind the filter bar and search field of the index page.
+
+``index.search.json`` lists the projects in grid order once and refers to
+them by position everywhere else: every hashtag and every word of a project's
+number, title and short description maps to the sorted positions of the
+projects that carry it. The front end answers a filter with one lookup and a
+search with a binary search over the sorted words, instead of reading the
+attributes of every card.
+
+The filter buttons come from the same data. Every tag used by at least
+``FILTER_MIN_PROJECTS`` projects gets one: the established filters first, the
+rest by how many projects use them. ``FILTER_HIDDEN_TAGS`` stay metadata only.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import defaultdict
+from typing import Any, Iterable
+
+
+FILTER_TAG_ORDER = ("#selected", "#architecture", "#tech", "#art")
+FILTER_HIDDEN_TAGS = frozenset({"#music"})
+FILTER_MIN_PROJECTS = 2
+FILTER_MAX_TAGS = 8
+# Letters and digits only; site.js splits search input with the same rule.
+TOKEN_PATTERN = re.compile(r"[^\W_]+")
+
+
+def tokenize(text: str) -> list[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def filter_tags(projects: Iterable[dict[str, Any]]) -> list[str]:
+    """Return the tags that get a filter button, in display order."""
+    counts: dict[str, int] = defaultdict(int)
+    for project in projects:
+        for tag in set(project["hashtags"]):
+            counts[tag] += 1
+    eligible = [
+        tag for tag, count in counts.items()
+        if count >= FILTER_MIN_PROJECTS and tag not in FILTER_HIDDEN_TAGS
+    ]
+    rank = {tag: index for index, tag in enumerate(FILTER_TAG_ORDER)}
+    eligible.sort(key=lambda tag: (rank.get(tag, len(rank)), -counts[tag], tag))
+    return eligible[:FILTER_MAX_TAGS]
+
+
+def build_search_index(projects: list[dict[str, Any]]) -> dict[str, Any]:
+    """Return the JSON-ready index for ``projects`` in grid order."""
+    tags: dict[str, list[int]] = defaultdict(list)
+    tokens: dict[str, list[int]] = defaultdict(list)
+    for position, project in enumerate(projects):
+        for tag in sorted(set(project["hashtags"])):
+            tags[tag].append(position)
+        text = " ".join((project["num"], project.get("title", ""), project.get("titledesc", "")))
+        for token in sorted(set(tokenize(text))):
+            tokens[token].append(position)
+    return {
+        "projects": [project["num"] for project in projects],
+        "filters": filter_tags(projects),
+        "tags": dict(sorted(tags.items())),
+        "tokens": dict(sorted(tokens.items())),
+    }
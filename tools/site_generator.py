@@ -1,11 +1,39 @@
+import argparse
+import hashlib
 import json
 import os
 import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from html import escape
 from pathlib import Path
 
 ROOT_DIR = Path(__file__).resolve().parents[1]
+if str(ROOT_DIR) not in sys.path:
+    sys.path.append(str(ROOT_DIR))
+
+from tools.asset_fingerprints import ASSET_DIST_DIR, asset_manifest, fingerprint_assets
+from tools.icon_atlas import ICON_ATLAS_DIR, IconAtlas
+from tools.image_derivatives import RESPONSIVE_DIR, ResponsiveImages, pillow_available
+from tools.image_dimensions import DIMENSION_EXTENSIONS, ImageDimensions
+from tools.media_dates import MEDIA_TIMEZONE, refresh_library_dates
+from tools.output_writer import take_report, write_output
+from tools.precompress import precompress_site, zstd_available
+from tools.preview_server import HOST, start_preview_server
+from tools.project_library import (
+    find_project_folders,
+    parse_project_folder,
+    scan_library,
+    scan_project,
+)
+from tools.related_projects import HashtagIndex
+from tools.search_index import build_search_index, filter_tags
+from tools.template_engine import load_template
+from tools.tracing import span
+
 PROJECTS_DIR = str(ROOT_DIR / "projects")
 OUTPUT_DIR = str(ROOT_DIR)
 PROJECT_HTML_DIR = "projecthtml"
@@ -13,9 +41,21 @@ PROJECT_TEMPLATE = ROOT_DIR / "templates" / "project.html"
 DRONE_GALLERY_TEMPLATE = ROOT_DIR / "templates" / "drone-gallery.html"
 ABOUT_TEMPLATE = ROOT_DIR / "templates" / "about.html"
 CV_DATA_PATH = ROOT_DIR / "portfolio-export" / "data" / "cv.json"
-PROJECT_FOLDER_PATTERN = re.compile(
-    r"^(?P<project_id>\d{4,})(?:-(?P<slug>[a-z0-9]+(?:-[a-z0-9]+)*))?$"
-)
+BUILD_MANIFEST_PATH = ROOT_DIR / ".cache" / "site-build-manifest.json"
+SEARCH_INDEX_NAME = "index.search.json"
+# Cards inlined in index.html; the rest load from index-N.json chunks of the
+# same size, which double as the static index-N.html pages for crawlers.
+INDEX_PAGE_SIZE = 60
+INDEX_PAGE_PATTERN = re.compile(r"^index-(\d+)\.(html|json)$")
+PROJECT_MEDIA_SIZES = "(max-width: 1400px) 100vw, 1320px"
+PROJECT_MEDIA_MULTI_SIZES = "(max-width: 700px) 100vw, (max-width: 1400px) 50vw, 660px"
+DRONE_CARD_SIZES = "(max-width: 700px) 50vw, (max-width: 1000px) 33vw, 25vw"
+# Roughly one screenful of the four-column grid; the rest loads from the manifest.
+DRONE_GALLERY_INITIAL_CARDS = 24
+RELATED_PROJECTS_LIMIT = 3
+TEXT_INPUT_EXTENSIONS = {".txt", ".json", ".html"}
+WATCH_DIRS = (ROOT_DIR / "projects", ROOT_DIR / "templates", ROOT_DIR / "assets")
+WATCH_POLL_SECONDS = 0.25
 
 
 #generates the index.html and project pages based on the contents of the projects folder
@@ -43,10 +83,6 @@ copyright = '''
 </span>
 '''
 
-def parse_project_folder(name):
-    match = PROJECT_FOLDER_PATTERN.fullmatch(name)
-    return match.group("project_id") if match else None
-
 def safe_join(base, *paths):
     base_path = Path(base).resolve()
     final_path = base_path.joinpath(*paths).resolve()
@@ -57,28 +93,10 @@ def safe_join(base, *paths):
     return str(final_path)
 
 def discover_project_folders():
-    projects = {}
-    invalid = []
-    for name in os.listdir(PROJECTS_DIR):
-        path = Path(safe_join(PROJECTS_DIR, name))
-        if not path.is_dir() or name.startswith("_"):
-            continue
-        project_id = parse_project_folder(name)
-        if project_id is None:
-            if name[:1].isdigit():
-                invalid.append(name)
-            continue
-        if project_id in projects:
-            raise ValueError(
-                f"Duplicate project ID {project_id}: {projects[project_id]} and {name}"
-            )
-        projects[project_id] = name
-    if invalid:
-        raise ValueError(
-            "Invalid project folder name(s): " + ", ".join(sorted(invalid))
-            + ". Use NNNN-lowercase-hyphenated-title."
-        )
-    return projects
+    return {
+        project_id: path.name
+        for project_id, path in find_project_folders(PROJECTS_DIR).items()
+    }
 
 def read_file(path):
     try:
@@ -87,14 +105,26 @@ def read_file(path):
     except Exception:
         return ""
 
+def asset_url(name, page_dir=PROJECT_HTML_DIR):
+    """Return the link to a CSS or JS file such as "assets/css/project.css" from a page in page_dir.
+
+    Links point at the content-hashed copy in assets/dist when one exists.
+    """
+    target = asset_manifest().get(name, name)
+    return Path(os.path.relpath(os.path.join(OUTPUT_DIR, target), os.path.join(OUTPUT_DIR, page_dir))).as_posix()
+
+
+def project_src(project, name):
+    # compute path relative to where project html files will live
+    project_base = os.path.join(OUTPUT_DIR, PROJECT_HTML_DIR)
+    return os.path.relpath(os.path.join(project.path, name), project_base).replace("\\", "/")
+
 def get_icon(folder):
-    for ext in [".svg", ".png", ".jpg", ".jpeg", ".gif"]:
-        icon_path = safe_join(folder, f"icon{ext}")
-        if os.path.exists(icon_path):
-            # compute path relative to where project html files will live
-            project_base = os.path.join(OUTPUT_DIR, PROJECT_HTML_DIR)
-            return os.path.relpath(icon_path, project_base).replace("\\", "/")
-    return ""
+    return project_icon(scan_project(folder))
+
+def project_icon(project):
+    icon = project.icon
+    return project_src(project, icon.name) if icon else ""
 
 def parse_media_number(name):
     base, _ = os.path.splitext(name)
@@ -117,69 +147,93 @@ def media_sort_key(name):
 
 
 def get_media(folder):
-    media = []
-    exts = {".jpg", ".jpeg", ".gif", ".mp4", ".mp3", ".png", ".pdf", ".txt"}
-    stored_dates = {}
+    return project_media(scan_project(folder))
 
-    dates_path = Path(folder) / "media-dates.json"
-    if dates_path.exists():
-        try:
-            stored_dates = json.loads(dates_path.read_text(encoding="utf-8"))
-        except (OSError, json.JSONDecodeError):
-            stored_dates = {}
 
-    try:
-        files = os.listdir(folder)
-    except FileNotFoundError:
-        return media
+def project_media(project):
+    media = []
+    exts = {".jpg", ".jpeg", ".gif", ".mp4", ".mp3", ".png", ".pdf", ".txt"}
+    stored_dates = project.dates_by_name
 
-    for fname in sorted(files, key=media_sort_key):
+    for fname in sorted(project.files_by_name, key=media_sort_key):
         base, ext = os.path.splitext(fname)
 
         # accept numbered files such as 0001_name.jpg, 0002_name.png, or older
         # image1/image00001 style names.
         if ext.lower() in exts and (re.match(r'^\d+', base) or re.search(r'^image\s*\d+$', base, re.I)):
-            media_path = safe_join(folder, fname)
-            project_base = os.path.join(OUTPUT_DIR, PROJECT_HTML_DIR)
-            rel_path = os.path.relpath(media_path, project_base).replace("\\", "/")
-            media.append({
-                "src": rel_path,
+            item = {
+                "src": project_src(project, fname),
                 "number": parse_media_number(fname),
                 "name": fname,
-                "created": stored_dates.get(fname, media_created_at(media_path)),
-            })
+                "created": stored_dates.get(fname, project.file(fname).created),
+            }
+            if ext.lower() == ".txt":
+                item["text"] = project.text(fname)
+            media.append(item)
 
     return media
 
 
-def media_created_at(path):
-    """Return the file creation time, falling back to modification time."""
-    stat = os.stat(path)
-    return getattr(stat, "st_birthtime", stat.st_mtime)
-
-
-def generate_drone_gallery_html(project_num, project_folder, title, desc, media, next_project, prev_project, all_projects):
-    """Generate the chronological, image-first layout used only by project 0010."""
-    with DRONE_GALLERY_TEMPLATE.open("r", encoding="utf-8") as handle:
-        template = handle.read()
-
+def drone_gallery_images(media):
+    """Return the gallery's images, newest first."""
     images = [
         item for item in media
         if item["src"].lower().endswith((".jpg", ".jpeg", ".png", ".gif"))
     ]
     images.sort(key=lambda item: (item["created"], item["name"].lower()), reverse=True)
+    return images
+
+
+def drone_gallery_manifest_name(project_num):
+    return f"project{project_num}.gallery.json"
+
+
+def generate_drone_gallery_manifest(media):
+    """Compact JSON list of every gallery image for drone-gallery.js to page through."""
+    items = []
+    for item in drone_gallery_images(media):
+        responsive = item.get("responsive") or {}
+        items.append([
+            responsive.get("thumb", item["src"]),
+            responsive.get("src", item["src"]),
+            datetime.fromtimestamp(item["created"], MEDIA_TIMEZONE).strftime("%Y-%m-%dT%H:%M:%S"),
+            responsive.get("width", item.get("width")),
+            responsive.get("height", item.get("height")),
+            responsive.get("color"),
+        ])
+    return json.dumps(
+        {"fields": ["thumb", "full", "created", "width", "height", "color"], "items": items},
+        ensure_ascii=False, separators=(",", ":"),
+    )
+
+
+def generate_drone_gallery_html(project_num, project_folder, title, desc, media, next_project, prev_project, all_projects, project=None, related=None):
+    """Generate the chronological, image-first layout used only by project 0010.
+
+    Only the first screenful of cards is inlined; drone-gallery.js loads the
+    rest from the JSON manifest written next to the page.
+    """
+    template = load_template(DRONE_GALLERY_TEMPLATE)
+    images = drone_gallery_images(media)
 
     cards = []
-    for index, item in enumerate(images):
-        created = datetime.fromtimestamp(item["created"])
+    preload_html = ""
+    for index, item in enumerate(images[:DRONE_GALLERY_INITIAL_CARDS]):
+        created = datetime.fromtimestamp(item["created"], MEDIA_TIMEZONE)
         machine_date = created.strftime("%Y-%m-%dT%H:%M:%S")
         display_date = created.strftime("%d.%m.%Y")
         src = escape(item["src"], quote=True)
         alt = escape(f"{title} — aerial image {index + 1}", quote=True)
+        loading = loading_attributes(index == 0)
+        image_html = f'<img src="{src}" alt="{alt}"{dimension_attributes(media_size(item))} {loading} />'
+        if item.get("responsive"):
+            image_html = responsive_picture_html(item["responsive"], f'alt="{alt}" {loading}', DRONE_CARD_SIZES)
+        if index == 0:
+            preload_html = preload_image_html(item["src"], item.get("responsive"), DRONE_CARD_SIZES)
         cards.append(
             f'<button class="drone-card" type="button" data-created="{machine_date}" '
-            f'data-index="{index}" aria-label="Open aerial image from {display_date}">'
-            f'<img src="{src}" alt="{alt}" loading="lazy" decoding="async" />'
+            f'data-index="{index}" aria-label="Open aerial image from {display_date}"{placeholder_style(item.get("responsive"))}>'
+            f'{image_html}'
             f'<time datetime="{machine_date}">{display_date}</time>'
             '</button>'
         )
@@ -195,48 +249,131 @@ def generate_drone_gallery_html(project_num, project_folder, title, desc, media,
                 f'<a class="nav-btn" href="../index.html" aria-label="Back to all projects">{svg_up}</a>'
                 f'{next_link}</nav>')
 
-    also_like_html = ""
-    current_hashtags = set(get_hashtags(safe_join(PROJECTS_DIR, project_folder)))
-    related_projects = [
-        project for project in all_projects
-        if project["num"] != project_num and set(project["hashtags"]) & current_hashtags
+    if related is None:
+        related = related_projects(project_num, all_projects)
+    also_like_html = generate_also_like_html(related)
+
+    return template.render({
+        "PROJECT_NUM": escape(project_num),
+        "TITLE": escape(title),
+        "DESC": escape(desc),
+        "IMAGE_COUNT": str(len(images)),
+        "MANIFEST_URL": escape(drone_gallery_manifest_name(project_num), quote=True),
+        "GALLERY": "\n".join(cards),
+        "NAV": nav_html,
+        "ALSO_LIKE": also_like_html,
+        "PRELOAD": preload_html,
+        "STYLESHEET": asset_url("assets/css/drone-gallery.css"),
+        "SCRIPT": asset_url("assets/js/drone-gallery.js"),
+    })
+
+def get_hashtags(folder):
+    hashtags_path = safe_join(folder, "hashtags.txt")
+    return parse_hashtags(read_file(hashtags_path))
+
+def parse_hashtags(hashtags):
+    tags = re.findall(r'#\w+', hashtags)
+    return [tag.lower() for tag in tags]
+
+def related_entry(project):
+    return {
+        "num": project["num"],
+        "folder": project["folder"],
+        "icon": project["icon"],
+        "icon_size": icon_dimensions(project),
+    }
+
+
+def attach_related_projects(projects, limit=RELATED_PROJECTS_LIMIT):
+    """Store each project's top "u might also like" suggestions from one hashtag index."""
+    index = HashtagIndex((project["num"], project["hashtags"]) for project in projects)
+    by_num = {project["num"]: project for project in projects}
+    for project in projects:
+        project["related"] = [
+            related_entry(by_num[num])
+            for num in index.related(project["num"], limit)
+        ]
+
+
+def related_projects(project_num, all_projects, limit=RELATED_PROJECTS_LIMIT):
+    """Return the suggestions for one page when main() has not attached them."""
+    all_projects = all_projects or []
+    index = HashtagIndex((project["num"], project["hashtags"]) for project in all_projects)
+    by_num = {project["num"]: project for project in all_projects}
+    return [
+        related_entry(by_num[num])
+        for num in index.related(project_num, limit)
     ]
-    if related_projects:
-        related = sorted(related_projects, key=lambda project: project["num"], reverse=True)[0]
-        icon_src = related["icon"] or f'../projects/{related["folder"]}/icon.svg'
-        also_like_html = f'''<section class="also-like-section">
+
+
+def generate_also_like_html(related):
+    if not related:
+        return ""
+    links = []
+    for suggestion in related:
+        icon_src = suggestion["icon"] or f'../projects/{suggestion["folder"]}/icon.svg'
+        size = dimension_attributes(suggestion.get("icon_size"))
+        links.append(f'''        <a class="also-like-project" href="project{suggestion['num']}.html">
+          <img src="{escape(icon_src, quote=True)}" alt=""{size} class="also-like-img" loading="lazy" decoding="async" />
+          <span class="also-like-label">{suggestion['num']}</span>
+        </a>''')
+    links_html = "\n".join(links)
+    return f'''<section class="also-like-section">
       <p class="also-like-title">u might also like</p>
       <div class="also-like-container">
-        <a class="also-like-project" href="project{related['num']}.html">
-          <img src="{icon_src}" alt="" class="also-like-img" />
-          <span class="also-like-label">{related['num']}</span>
-        </a>
+{links_html}
       </div>
     </section>'''
 
-    replacements = {
-        "{{PROJECT_NUM}}": escape(project_num),
-        "{{TITLE}}": escape(title),
-        "{{DESC}}": escape(desc),
-        "{{IMAGE_COUNT}}": str(len(images)),
-        "{{GALLERY}}": "\n".join(cards),
-        "{{NAV}}": nav_html,
-        "{{ALSO_LIKE}}": also_like_html,
-    }
-    for placeholder, value in replacements.items():
-        template = template.replace(placeholder, value)
-    return template
+def dimension_attributes(size):
+    """`` width="…" height="…"`` for a known ``(width, height)``, else nothing."""
+    if not size or not size[0] or not size[1]:
+        return ""
+    return f' width="{size[0]}" height="{size[1]}"'
+
+
+def loading_attributes(priority):
+    # The first image of a page is the likely largest contentful paint.
+    return 'loading="eager" fetchpriority="high"' if priority else 'loading="lazy" decoding="async"'
 
-def get_hashtags(folder):
-    hashtags_path = safe_join(folder, "hashtags.txt")
-    hashtags = read_file(hashtags_path)
-    tags = re.findall(r'#\w+', hashtags)
-    return [tag.lower() for tag in tags]
 
-def media_html_tag(src, alt_text="Project media"):
+def preload_image_html(src, responsive=None, sizes=None):
+    """A high-priority preload for a page's first image, placed in <head>."""
+    if responsive:
+        return (
+            f'<link rel="preload" as="image" imagesrcset="{escape(responsive["webp"], quote=True)}" '
+            f'imagesizes="{sizes}" type="image/webp" fetchpriority="high" />\n    '
+        )
+    return f'<link rel="preload" as="image" href="{escape(src, quote=True)}" fetchpriority="high" />\n    '
+
+
+def is_image(src):
+    return src.lower().endswith(('.jpg', '.jpeg', '.gif', '.png', '.svg'))
+
+
+def placeholder_style(responsive):
+    """Inline style that shows the blurred placeholder until the image covers it."""
+    if not responsive or not responsive.get("placeholder"):
+        return ""
+    return f' style="background-color:{responsive["color"]};background-image:url({responsive["placeholder"]})"'
+
+
+def responsive_picture_html(responsive, img_attributes, sizes):
+    """Wrap an image in <picture> with WebP and fallback srcsets."""
+    size = dimension_attributes((responsive.get("width"), responsive.get("height")))
+    return (
+        f'<picture><source type="image/webp" srcset="{escape(responsive["webp"], quote=True)}" sizes="{sizes}" />'
+        f'<img src="{escape(responsive["src"], quote=True)}" srcset="{escape(responsive["fallback"], quote=True)}" '
+        f'sizes="{sizes}"{size} {img_attributes} /></picture>'
+    )
+
+def media_html_tag(src, alt_text="Project media", text=None, responsive=None, sizes=PROJECT_MEDIA_SIZES, size=None, priority=False):
     safe_alt = escape(alt_text, quote=True)
-    if src.lower().endswith(('.jpg', '.jpeg', '.gif', '.png', '.svg')):
-        return f'<div class="project-media-item"><img class="project-media" src="{src}" alt="{safe_alt}" loading="lazy" decoding="async" /></div>'
+    if responsive:
+        picture = responsive_picture_html(responsive, f'class="project-media" alt="{safe_alt}" {loading_attributes(priority)}', sizes)
+        return f'<div class="project-media-item"{placeholder_style(responsive)}>{picture}</div>'
+    if is_image(src):
+        return f'<div class="project-media-item"><img class="project-media" src="{src}" alt="{safe_alt}"{dimension_attributes(size)} {loading_attributes(priority)} /></div>'
     elif src.lower().endswith('.mp4'):
         return f'<div class="project-media-item"><video class="project-media" src="{src}" controls loop muted playsinline aria-label="{safe_alt}"></video></div>'
     elif src.lower().endswith('.mp3'):
@@ -245,8 +382,10 @@ def media_html_tag(src, alt_text="Project media"):
         return f'<div class="project-media-item"><a href="{src}" target="_blank" rel="noopener noreferrer">View PDF</a></div>'
     elif src.lower().endswith('.txt'):
         # src is relative to projecthtml, for example ../projects/0056-sinuswall/image1.txt
-        full_path = os.path.join(OUTPUT_DIR, PROJECT_HTML_DIR, src)
-        content = read_file(full_path)
+        content = text
+        if content is None:
+            full_path = os.path.join(OUTPUT_DIR, PROJECT_HTML_DIR, src)
+            content = read_file(full_path)
         if content.startswith('http'):
             return f'<div class="project-media-item"><a href="{content}" target="_blank" rel="noopener noreferrer">View Website</a></div>'
         else:
@@ -254,32 +393,130 @@ def media_html_tag(src, alt_text="Project media"):
     else:
         return ''
 
-def generate_index_html(projects):
-    filter_html = '''
+def icon_atlas_head_html(atlases, preload=None):
+    """Define one background class per atlas and preload the WebP atlases in ``preload``."""
+    if not atlases:
+        return ""
+    preloads = []
+    rules = []
+    for index, atlas in enumerate(atlases):
+        webp, png = escape(atlas["webp"], quote=True), escape(atlas["png"], quote=True)
+        if preload is None or index in preload:
+            preloads.append(f'<link rel="preload" as="image" href="{webp}" type="image/webp" />')
+        rules.append(
+            f'.icon-atlas-{index} {{ background-image: url("{png}"); '
+            f'background-image: image-set(url("{webp}") type("image/webp"), url("{png}") type("image/png")); '
+            f'background-size: {atlas["columns"] * 100}% {atlas["rows"] * 100}%; }}'
+        )
+    return "".join(f"{link}\n    " for link in preloads) + "<style>\n      " + "\n      ".join(rules) + "\n    </style>\n    "
+
+
+def search_index_json(projects):
+    return json.dumps(build_search_index(projects), separators=(",", ":"), ensure_ascii=False) + "\n"
+
+
+def write_search_index(projects):
+    """Write index.search.json if it changed; return its cache-busting URL."""
+    payload = search_index_json(projects)
+    write_output(os.path.join(OUTPUT_DIR, SEARCH_INDEX_NAME), payload)
+    return search_index_url(payload)
+
+
+def search_index_url(payload):
+    return f"{SEARCH_INDEX_NAME}?v={hashlib.sha256(payload.encode('utf-8')).hexdigest()[:10]}"
+
+
+def index_icon_src(proj):
+    icon_src = proj["icon"]
+    if icon_src.startswith("../"):
+        icon_src = icon_src[3:]
+    return icon_src or f"projects/{proj['num']}/icon.svg"
+
+
+def index_card_html(proj):
+    sprite = proj.get("icon_sprite")
+    if sprite:
+        logo_html = (
+            f'<span class="project-logo project-logo-sprite icon-atlas-{sprite["atlas"]}" role="img" '
+            f'aria-label="icon" style="background-position: {sprite["position"]}"></span>'
+        )
+    else:
+        logo_html = f'<img src="{index_icon_src(proj)}" alt="icon"{dimension_attributes(icon_dimensions(proj))} class="project-logo" />'
+    return f'''
+        <a class="project" data-project="{proj['num']}" data-hashtags="{' '.join(proj['hashtags'])}" href="{PROJECT_HTML_DIR}/project{proj['num']}.html">
+          {logo_html}
+          <span class="project-label">{proj['num']}</span>
+          <span class="project-tooltip">{escape(proj.get('titledesc','')).replace(chr(10),'<br />')}</span>
+        </a>
+        '''
+
+
+def index_card_data(proj):
+    """The fields site.js needs to build the same card as index_card_html."""
+    card = {
+        "num": proj["num"],
+        "href": f"{PROJECT_HTML_DIR}/project{proj['num']}.html",
+        "hashtags": proj["hashtags"],
+        "titledesc": proj.get("titledesc", ""),
+    }
+    if proj.get("icon_sprite"):
+        card["sprite"] = proj["icon_sprite"]
+    else:
+        card["icon"] = index_icon_src(proj)
+        card["size"] = icon_dimensions(proj)
+    return card
+
+
+def index_page_name(page):
+    return "index.html" if page == 1 else f"index-{page}.html"
+
+
+def index_pages_html(page, page_count):
+    """Plain links to every index page, so crawlers reach the cards loaded by script."""
+    if page_count < 2:
+        return ""
+    current = ' aria-current="page"'
+    links = "\n".join(
+        f'      <a href="{index_page_name(number)}"{current if number == page else ""}>{number}</a>'
+        for number in range(1, page_count + 1)
+    )
+    return f'''<nav class="index-pages" id="indexPages" aria-label="Project pages">
+{links}
+    </nav>
+    '''
+
+
+def generate_index_html(projects, icon_atlases=(), search_index=None, page=1, page_size=0, chunk_urls=(), filters=None):
+    """Render one index page: every card, or page ``page`` of ``page_size`` cards.
+
+    Page 1 lists ``chunk_urls`` for site.js to load the remaining cards from.
+    """
+    if filters is None:
+        filters = filter_tags(projects)
+    buttons = "\n".join(
+        f'      <button class="filter-btn" data-filter="{escape(tag, quote=True)}">{escape(tag.upper())}</button>'
+        for tag in filters
+    )
+    filter_html = f'''
     <div class="filter-bar" id="filterBar">
-      <button class="filter-btn" data-filter="#selected">#SELECTED</button>
-      <button class="filter-btn" data-filter="#architecture">#ARCHITECTURE</button>
-      <button class="filter-btn" data-filter="#tech">#TECH</button>
-      <button class="filter-btn" data-filter="#art">#ART</button>
+      <input class="filter-search" id="projectSearch" type="search" placeholder="search" aria-label="Search projects" autocomplete="off" />
+{buttons}
       <button class="filter-btn" data-action="toggle">#FUN</button>
     </div>
     '''
-    import html as _html
-    cards = []
-    for proj in projects:
-        icon_src = proj["icon"]
-        if icon_src.startswith("../"):
-            icon_src = icon_src[3:]
-        if not icon_src:
-            icon_src = f"projects/{proj['num']}/icon.svg"
-        cards.append(f'''
-        <a class="project" data-project="{proj['num']}" data-hashtags="{' '.join(proj['hashtags'])}" href="{PROJECT_HTML_DIR}/project{proj['num']}.html">
-          <img src="{icon_src}" alt="icon" class="project-logo" />
-          <span class="project-label">{proj['num']}</span>
-          <span class="project-tooltip">{_html.escape(proj.get('titledesc','')).replace(chr(10),'<br />')}</span>
-        </a>
-        ''')
-    grid_html = "\n".join(cards)
+    if search_index is None:
+        search_index = search_index_url(search_index_json(projects))
+    if page_size:
+        page_count = max(1, -(-len(projects) // page_size))
+        page_projects = projects[(page - 1) * page_size:page * page_size]
+    else:
+        page_count = 1
+        page_projects = projects
+    grid_attributes = f'data-search-index="{escape(search_index, quote=True)}"'
+    if page == 1 and chunk_urls:
+        grid_attributes += f' data-chunks="{escape(json.dumps(list(chunk_urls)), quote=True)}"'
+    grid_html = "\n".join(index_card_html(proj) for proj in page_projects)
+    used_atlases = {proj["icon_sprite"]["atlas"] for proj in page_projects if proj.get("icon_sprite")}
     return f'''<!DOCTYPE html>
 <html lang="en">
   <head>
@@ -287,17 +524,17 @@ def generate_index_html(projects):
     <meta name="viewport" content="width=device-width, initial-scale=1" />
     <title>Ivan Bagaturiya</title>
     <link rel="icon" href="assets/favicon/favicon.svg" type="image/svg+xml" />
-    <link rel="stylesheet" href="assets/css/index.css" />
+    {icon_atlas_head_html(icon_atlases, used_atlases)}<link rel="stylesheet" href="{asset_url("assets/css/index.css", "")}" />
   </head>
   <body>
     {filter_html}
     <main class="main">
-      <div class="grid" id="projectGrid">
+      <div class="grid" id="projectGrid" {grid_attributes}>
         {grid_html}
       </div>
     </main>
-    <script src="https://cdnjs.cloudflare.com/ajax/libs/matter-js/0.19.0/matter.min.js"></script>
-    <script src="assets/js/site.js"></script>
+    {index_pages_html(page, page_count)}    <script src="https://cdnjs.cloudflare.com/ajax/libs/matter-js/0.19.0/matter.min.js"></script>
+    <script src="{asset_url("assets/js/site.js", "")}"></script>
     <div class="mouse-line-vertical"></div>
     <div class="mouse-line-horizontal"></div>
     <script>
@@ -334,6 +571,30 @@ def generate_index_html(projects):
 '''
 
 
+def write_index_pages(projects, icon_atlases=(), search_index=None, page_size=INDEX_PAGE_SIZE):
+    """Write index.html plus, past ``page_size`` cards, the index-N chunks and pages."""
+    page_count = max(1, -(-len(projects) // page_size)) if page_size else 1
+    if search_index is None:
+        search_index = search_index_url(search_index_json(projects))
+    filters = filter_tags(projects)
+    chunk_urls = []
+    for page in range(2, page_count + 1):
+        payload = json.dumps(
+            {"cards": [index_card_data(proj) for proj in projects[(page - 1) * page_size:page * page_size]]},
+            separators=(",", ":"), ensure_ascii=False,
+        ) + "\n"
+        write_output(os.path.join(OUTPUT_DIR, f"index-{page}.json"), payload)
+        chunk_urls.append(f"index-{page}.json?v={hashlib.sha256(payload.encode('utf-8')).hexdigest()[:10]}")
+    for page in range(1, page_count + 1):
+        html = generate_index_html(projects, icon_atlases, search_index, page, page_size, chunk_urls, filters)
+        write_output(os.path.join(OUTPUT_DIR, index_page_name(page)), html)
+    for name in os.listdir(OUTPUT_DIR):
+        match = INDEX_PAGE_PATTERN.match(name)
+        if match and int(match.group(1)) > page_count:
+            os.remove(os.path.join(OUTPUT_DIR, name))
+    return page_count
+
+
 def html_items(values, class_name="cv-list"):
     items = "".join(f"<li>{escape(str(value))}</li>" for value in values if value)
     return f'<ul class="{class_name}">{items}</ul>' if items else ""
@@ -388,8 +649,7 @@ def contact_icon_svg(key):
 def generate_about_html(project_folder):
     with CV_DATA_PATH.open("r", encoding="utf-8") as handle:
         cv = json.load(handle)
-    with ABOUT_TEMPLATE.open("r", encoding="utf-8") as handle:
-        template = handle.read()
+    template = load_template(ABOUT_TEMPLATE)
 
     contact_rows = []
     icon_links = []
@@ -485,54 +745,48 @@ def generate_about_html(project_folder):
             '</article>'
         )
 
-    replacements = {
-        "{{CV_NAME}}": escape(cv.get("name", "")),
-        "{{CV_INITIALS}}": escape(cv.get("initials", "")),
-        "{{CV_HEADLINE}}": escape(cv.get("headline", "")),
-        "{{CV_HEADLINE_DE}}": escape(cv.get("headline_de", cv.get("headline", ""))),
-        "{{CV_PORTRAIT}}": f"../projects/{escape(project_folder, quote=True)}/image1.png",
-        "{{CV_CONTACT}}": "".join(contact_rows),
-        "{{CV_CONTACT_ICONS}}": "".join(icon_links),
-        "{{CV_PROFILES}}": "".join(profile_blocks),
-        "{{CV_SKILLS}}": "".join(skill_groups),
-        "{{CV_EXPERIENCE}}": "".join(experience_entries),
-        "{{CV_EDUCATION}}": "".join(education_entries),
-        "{{CV_LANGUAGES}}": html_items(cv.get("languages", []), "chip-list"),
-        "{{CV_HOBBIES}}": "".join(hobby_groups),
-    }
-    for placeholder, value in replacements.items():
-        template = template.replace(placeholder, value)
-    return template
+    return template.render({
+        "STYLESHEET": asset_url("assets/css/about.css"),
+        "CV_NAME": escape(cv.get("name", "")),
+        "CV_HEADLINE": escape(cv.get("headline", "")),
+        "CV_PORTRAIT": f"../projects/{escape(project_folder, quote=True)}/image1.png",
+        "CV_CONTACT": "".join(contact_rows),
+        "CV_CONTACT_ICONS": "".join(icon_links),
+        "CV_PROFILES": "".join(profile_blocks),
+        "CV_SKILLS": "".join(skill_groups),
+        "CV_EXPERIENCE": "".join(experience_entries),
+        "CV_EDUCATION": "".join(education_entries),
+        "CV_LANGUAGES": html_items(cv.get("languages", []), "chip-list"),
+        "CV_HOBBIES": "".join(hobby_groups),
+    })
 
-def generate_project_html(project_num, project_folder, title, desc, icon, media, next_project, prev_project, all_projects=None):
-    # Read the template
-    with PROJECT_TEMPLATE.open("r", encoding="utf-8") as f:
-        template = f.read()
+def generate_project_html(project_num, project_folder, title, desc, icon, media, next_project, prev_project, all_projects=None, project=None, related=None, dimensions=None):
+    project = project or scan_project(safe_join(PROJECTS_DIR, project_folder))
+    template = load_template(PROJECT_TEMPLATE)
 
     # Find trailer (mp4, gif, or txt for embed)
     trailer = ""
     trailer_ext = ""
     trailer_html = ""
+    preload_html = ""
+    dimensions = dimensions or {}
     # Check for trailer.txt (embed code)
-    trailer_txt_path = safe_join(PROJECTS_DIR, project_folder, "trailer.txt")
-    if os.path.exists(trailer_txt_path):
-      trailer_html = read_file(trailer_txt_path)
+    if project.has("trailer.txt"):
+      trailer_html = project.text("trailer.txt")
       if trailer_html.startswith('http'):
         trailer_html = f'<a href="{trailer_html}" target="_blank" rel="noopener noreferrer">View Website</a>'
     else:
-      for ext in [".mp4", ".gif"]:
-        trailer_path = safe_join(PROJECTS_DIR, project_folder, f"trailer{ext}")
-        if os.path.exists(trailer_path):
-          # compute path relative to where project html files will live
-          project_base = os.path.join(OUTPUT_DIR, PROJECT_HTML_DIR)
-          trailer = os.path.relpath(trailer_path, project_base).replace("\\", "/")
-          trailer_ext = ext
-          break
+      trailer_file = project.trailer
+      if trailer_file:
+        trailer = project_src(project, trailer_file.name)
+        trailer_ext = trailer_file.suffix
       if trailer:
         if trailer_ext == ".mp4":
           trailer_html = f'<video class="project-trailer" src="{trailer}" autoplay loop muted playsinline></video>'
         elif trailer_ext == ".gif":
-          trailer_html = f'<img class="project-trailer" src="{trailer}" alt="Trailer" />'
+          size = dimension_attributes(dimensions.get(trailer_file.name))
+          trailer_html = f'<img class="project-trailer" src="{trailer}" alt="Trailer"{size} {loading_attributes(True)} />'
+          preload_html = preload_image_html(trailer)
 
     # Media (exclude trailer) - group by numbered prefix so items with the same
     # number share a row and later numbers appear below in order.
@@ -548,9 +802,17 @@ def generate_project_html(project_num, project_folder, title, desc, icon, media,
     media_index = 0
     for group in grouped_media:
         group_items = []
+        sizes = PROJECT_MEDIA_SIZES if len(group) == 1 else PROJECT_MEDIA_MULTI_SIZES
         for item in group:
             media_index += 1
-            group_items.append(media_html_tag(item["src"], f"{title} — image {media_index}"))
+            # Without a trailer, the first media item is the first image on screen.
+            priority = media_index == 1 and not trailer_html and is_image(item["src"])
+            if priority:
+                preload_html = preload_image_html(item["src"], item.get("responsive"), sizes)
+            group_items.append(media_html_tag(
+                item["src"], f"{title} — image {media_index}", item.get("text"), item.get("responsive"), sizes,
+                media_size(item), priority,
+            ))
         items_html = "".join(group_items)
         row_class = "project-media-row" if len(group) == 1 else "project-media-row project-media-row--multi"
         rows_html.append(f'<div class="{row_class}">{items_html}</div>')
@@ -574,56 +836,310 @@ def generate_project_html(project_num, project_folder, title, desc, icon, media,
     nav_html += '</nav>'
 
     # Generate "You might also like" section
-    also_like_html = ""
-    if all_projects:
-        # Get current project hashtags
-        current_hashtags = set(get_hashtags(safe_join(PROJECTS_DIR, project_folder)))
-        # Find projects with shared hashtags
-        related_projects = [p for p in all_projects if p['num'] != project_num and set(p['hashtags']) & current_hashtags]
-        if related_projects:
-            random_project = sorted(
-                related_projects, key=lambda project: project["num"], reverse=True
-            )[0]
-            icon_src = random_project['icon'] if random_project['icon'] else f"../projects/{random_project['folder']}/icon.svg"
-            also_like_html = f'''<div class="also-like-section">
-      <p class="also-like-title">u might also like</p>
-      <div class="also-like-container">
-        <a class="also-like-project" href="project{random_project['num']}.html">
-          <img src="{icon_src}" alt="icon" class="also-like-img" />
-          <span class="also-like-label">{random_project['num']}</span>
-        </a>
-      </div>
-    </div>
-    '''
+    if related is None and all_projects:
+        related = related_projects(project_num, all_projects)
+    also_like_html = generate_also_like_html(related)
 
-    # Replace placeholders in template
-    html = template
-    if project_num == "2409":
-        html = html.replace("../assets/css/project.css", "../assets/css/about.css")
-    html = html.replace("{{PROJECT_NUM}}", project_num)
-    html = html.replace("{{TITLE}}", title)
-    html = html.replace("{{DESC}}", desc.replace('\n', '<br />'))
-    html = html.replace("{{TRAILER}}", trailer_html)
-    html = html.replace("{{IMAGES}}", images_html)
-    html = html.replace("{{NAV}}", nav_html)
-    html = html.replace("{{ALSO_LIKE}}", also_like_html)
+    html = template.render({
+        "PROJECT_NUM": project_num,
+        "TITLE": title,
+        "DESC": desc.replace('\n', '<br />'),
+        "TRAILER": trailer_html,
+        "IMAGES": images_html,
+        "NAV": nav_html,
+        "ALSO_LIKE": also_like_html,
+        "PRELOAD": preload_html,
+        "STYLESHEET": asset_url("assets/css/about.css" if project_num == "2409" else "assets/css/project.css"),
+    })
     return html
 
-def main():
-    folder_by_id = discover_project_folders()
-    project_ids = sorted(folder_by_id, key=int, reverse=True)
+def render_project_page(project, snapshot, prev_project, all_projects):
+    project_id = project["num"]
+    if project_id == "2409":
+        return generate_about_html(project["folder"])
+    if project_id == "0010":
+        return generate_drone_gallery_html(
+            project_id, project["folder"], project["title"], project["desc"], project["media"],
+            project["next"], prev_project, all_projects, snapshot, project.get("related")
+        )
+    return generate_project_html(
+        project_id, project["folder"], project["title"], project["desc"], project["icon"],
+        project["media"], project["next"], prev_project, all_projects, snapshot, project.get("related"),
+        project.get("dimensions"),
+    )
+
+
+def write_project_page(project, snapshot, prev_project, all_projects, out_dir):
+    with span("render_page", project=project["num"]):
+        html = render_project_page(project, snapshot, prev_project, all_projects)
+    write_output(os.path.join(out_dir, f"project{project['num']}.html"), html)
+    if project["num"] == "0010":
+        write_output(
+            os.path.join(out_dir, drone_gallery_manifest_name(project["num"])),
+            generate_drone_gallery_manifest(project["media"]),
+        )
+
+
+_worker_state = {}
+
+
+def _init_page_worker(projects, snapshots):
+    _worker_state["projects"] = projects
+    _worker_state["snapshots"] = snapshots
+
+
+def _write_page_in_worker(task):
+    """Write one page and hand the worker's output counts back to the parent."""
+    idx, prev_project, out_dir = task
+    projects = _worker_state["projects"]
+    write_project_page(projects[idx], _worker_state["snapshots"][idx], prev_project, projects, out_dir)
+    return take_report()
+
+
+@lru_cache(maxsize=None)
+def generator_fingerprint():
+    """Hash this module and every loaded ``tools`` module, so code changes invalidate every incremental page."""
+    modules = sorted({
+        Path(module.__file__).resolve()
+        for name, module in list(sys.modules.items())
+        if name.startswith("tools.") and getattr(module, "__file__", None)
+    } | {Path(__file__).resolve()})
+    digest = hashlib.sha256()
+    for path in modules:
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def file_fingerprint(path):
+    """Hash text inputs by content and media by size and modification time.
+
+    Pages only embed the names and dates of binary media, so re-reading
+    multi-megabyte images on every build would cost more than it saves.
+    """
+    path = Path(path)
+    try:
+        if path.suffix.lower() in TEXT_INPUT_EXTENSIONS:
+            return hashlib.sha256(path.read_bytes()).hexdigest()
+        stat = path.stat()
+    except OSError:
+        return ""
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def project_fingerprint(project):
+    """Fingerprint a project snapshot without touching the disk again."""
+    fingerprint = []
+    for item in project.files:
+        if item.suffix == ".txt":
+            value = hashlib.sha256(project.text(item.name).encode("utf-8")).hexdigest()
+        else:
+            value = f"{item.size}:{item.mtime_ns}"
+        fingerprint.append([item.name, value])
+    fingerprint.append(["media-dates", project.media_dates])
+    return fingerprint
+
+
+def inputs_digest(inputs):
+    payload = json.dumps(
+        {"generator": generator_fingerprint(), **inputs},
+        sort_keys=True, ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def attach_responsive_images(projects, snapshots, jobs):
+    """Build missing derivatives and record their srcsets on each media item."""
+    responsive = ResponsiveImages()
+    sources = []
+    for project, snapshot in zip(projects, snapshots):
+        for item in project["media"]:
+            source = snapshot.file(item["name"])
+            sources.append((
+                f'{project["num"]}/{item["name"]}',
+                os.path.join(snapshot.path, item["name"]),
+                source.size,
+                source.mtime_ns,
+            ))
+    encoded = responsive.prepare(sources, jobs)
+    base_dir = os.path.join(OUTPUT_DIR, PROJECT_HTML_DIR)
+    for project in projects:
+        for item in project["media"]:
+            variants = responsive.variants(f'{project["num"]}/{item["name"]}', base_dir)
+            if variants:
+                item["responsive"] = variants
+    responsive.save()
+    if encoded:
+        print(f"Responsive images: encoded {encoded} new or changed source(s).")
+    if responsive.missing and not pillow_available():
+        print(
+            f"Warning: Pillow is not installed; {len(responsive.missing)} image(s) link their originals. "
+            "Run: python3 -m pip install -r portfolio-export/requirements.txt"
+        )
+
+
+def media_size(item):
+    if item.get("width") and item.get("height"):
+        return item["width"], item["height"]
+    return None
+
 
-    # First pass: collect all project metadata
+def icon_dimensions(project):
+    return project.get("dimensions", {}).get(project["icon"].rsplit("/", 1)[-1]) if project["icon"] else None
+
+
+def attach_image_dimensions(projects, snapshots):
+    """Record the header dimensions of every image in each project folder."""
+    cache = ImageDimensions()
+    for project, snapshot in zip(projects, snapshots):
+        dimensions = {}
+        for source in snapshot.files:
+            if os.path.splitext(source.name)[1].lower() not in DIMENSION_EXTENSIONS:
+                continue
+            size = cache.get(os.path.join(snapshot.path, source.name), source.size, source.mtime_ns)
+            if size:
+                dimensions[source.name] = list(size)
+        project["dimensions"] = dimensions
+        for item in project["media"]:
+            if item["name"] in dimensions:
+                item["width"], item["height"] = dimensions[item["name"]]
+    cache.save()
+
+
+def attach_icon_sprites(projects, snapshots):
+    """Pack the raster icons into atlases and record each card's tile; return the atlases."""
+    atlas = IconAtlas()
+    sources = []
+    for project, snapshot in zip(projects, snapshots):
+        name = project["icon"].rsplit("/", 1)[-1]
+        source = snapshot.file(name) if project["icon"] else None
+        if source:
+            sources.append((f'{project["num"]}/{name}', os.path.join(snapshot.path, name), source.size, source.mtime_ns))
+    rebuilt = atlas.prepare(sources)
+    for project in projects:
+        sprite = atlas.sprite(f'{project["num"]}/{project["icon"].rsplit("/", 1)[-1]}')
+        if sprite:
+            project["icon_sprite"] = sprite
+    atlas.save()
+    atlases = atlas.atlases(OUTPUT_DIR)
+    if rebuilt:
+        print(f"Icon atlas: packed {sum(len(entry['icons']) for entry in atlases)} icon(s) into {len(atlases)} atlas(es).")
+    return atlases
+
+
+def project_page_digest(project, snapshot, prev_project, all_projects):
+    if project["num"] == "2409":
+        template = ABOUT_TEMPLATE
+    elif project["num"] == "0010":
+        template = DRONE_GALLERY_TEMPLATE
+    else:
+        template = PROJECT_TEMPLATE
+    inputs = {
+        "template": file_fingerprint(template),
+        "files": project_fingerprint(snapshot),
+        "prev": prev_project,
+        "next": project["next"],
+        "related": project.get("related"),
+        "responsive": [item.get("responsive") for item in project["media"]],
+        "assets": asset_manifest(),
+    }
+    if project["num"] == "2409":
+        inputs["cv"] = file_fingerprint(CV_DATA_PATH)
+    return inputs_digest(inputs)
+
+
+def index_digest(projects, icon_atlases=(), page_size=INDEX_PAGE_SIZE):
+    return inputs_digest({
+        "page_size": page_size,
+        "index": [
+            [
+                proj["num"], proj["folder"], proj["title"], proj["icon"], icon_dimensions(proj),
+                proj.get("icon_sprite"), proj["hashtags"], proj["titledesc"],
+            ]
+            for proj in projects
+        ],
+        "icon_atlases": list(icon_atlases),
+        "assets": asset_manifest(),
+    })
+
+
+def load_build_manifest():
+    try:
+        manifest = json.loads(BUILD_MANIFEST_PATH.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return manifest.get("pages", {}) if isinstance(manifest, dict) else {}
+
+
+def save_build_manifest(pages):
+    write_output(BUILD_MANIFEST_PATH, json.dumps({"pages": pages}, indent=2, sort_keys=True) + "\n")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Generate index.html and the project pages from the projects folder."
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="only regenerate pages whose inputs changed since the last build",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        metavar="N",
+        help="render project pages across N worker processes (0 uses every CPU core)",
+    )
+    parser.add_argument(
+        "--no-responsive-images",
+        dest="responsive_images",
+        action="store_false",
+        help="link original images instead of the resized WebP/JPEG derivatives",
+    )
+    parser.add_argument(
+        "--no-icon-atlas",
+        dest="icon_atlas",
+        action="store_false",
+        help="link each original icon on the index instead of the packed icon atlases",
+    )
+    parser.add_argument(
+        "--index-page-size",
+        type=int,
+        default=INDEX_PAGE_SIZE,
+        metavar="N",
+        help=f"inline the first N cards in index.html and load the rest in chunks of N (default: {INDEX_PAGE_SIZE}, 0 inlines all)",
+    )
+    parser.add_argument(
+        "--precompress",
+        action="store_true",
+        help="write .gz (and, with zstandard installed, .zst) sidecars for HTML, CSS, JS and SVG files",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="keep running and rebuild the affected pages whenever projects/, templates/ or assets/ change",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="serve the site on a local preview server",
+    )
+    parser.add_argument("--port", type=int, default=8000, help="preview server port (default: 8000)")
+    return parser.parse_args(argv)
+
+
+def collect_projects(library):
+    """First pass: collect all project metadata from the single library scan."""
+    project_ids = [snapshot.project_id for snapshot in library.projects]
     projects = []
-    for idx, project_id in enumerate(project_ids):
-        folder = folder_by_id[project_id]
-        folder_path = safe_join(PROJECTS_DIR, folder)
-        title = read_file(safe_join(folder_path, "title.txt"))
-        desc = read_file(safe_join(folder_path, "description.txt"))
+    for idx, snapshot in enumerate(library.projects):
+        project_id = snapshot.project_id
+        title = snapshot.text("title.txt")
+        desc = snapshot.text("description.txt")
         # new file containing short description used on index hover tooltip
-        titledesc = read_file(safe_join(folder_path, "titledescription.txt"))
-        icon = get_icon(folder_path)
-        media = get_media(folder_path)
+        titledesc = snapshot.text("titledescription.txt")
+        icon = project_icon(snapshot)
+        media = project_media(snapshot)
         if project_id == "0010" and not icon:
             first_image = next(
                 (item for item in media if item["src"].lower().endswith((".jpg", ".jpeg", ".png", ".gif"))),
@@ -631,12 +1147,11 @@ def main():
             )
             if first_image:
                 icon = first_image["src"]
-        hashtags = get_hashtags(folder_path)
+        hashtags = parse_hashtags(snapshot.text("hashtags.txt"))
         next_project = project_ids[idx + 1] if idx + 1 < len(project_ids) else ""
-        prev_project = project_ids[idx - 1] if idx - 1 >= 0 else ""
         projects.append({
             "num": project_id,
-            "folder": folder,
+            "folder": snapshot.name,
             "title": title,
             "desc": desc,
             "titledesc": titledesc,
@@ -645,40 +1160,176 @@ def main():
             "hashtags": hashtags,
             "next": next_project
         })
+    return projects
+
+
+def build_site(args):
+    """Build index.html and the project pages once."""
+    with span("site.build", incremental=args.incremental, jobs=args.jobs):
+        _build_site(args)
+
+
+def _build_site(args):
+    with span("fingerprint_assets") as info:
+        info["assets"] = len(fingerprint_assets())
+    with span("scan_library") as info:
+        library = scan_library(PROJECTS_DIR)
+        info["projects"] = len(library.projects)
+    # Folders with a media-dates.json get EXIF dates for new or changed images.
+    with span("media_dates"):
+        library = refresh_library_dates(library)
+    project_ids = [snapshot.project_id for snapshot in library.projects]
+    with span("collect_projects") as info:
+        projects = collect_projects(library)
+        info["media"] = sum(len(project["media"]) for project in projects)
+
+    with span("image_dimensions"):
+        attach_image_dimensions(projects, library.projects)
+    with span("related_projects"):
+        attach_related_projects(projects)
+    if args.responsive_images:
+        with span("responsive_images"):
+            attach_responsive_images(projects, library.projects, args.jobs)
+    icon_atlases = []
+    if args.icon_atlas:
+        with span("icon_atlas"):
+            icon_atlases = attach_icon_sprites(projects, library.projects)
+
+    previous_digests = load_build_manifest() if args.incremental else {}
+    digests = {}
+    skipped = []
+    out_dir = os.path.join(OUTPUT_DIR, PROJECT_HTML_DIR)
+    os.makedirs(out_dir, exist_ok=True)
+
+    def is_current(page_name, digest):
+        digests[page_name] = digest
+        if previous_digests.get(page_name) == digest and os.path.exists(os.path.join(OUTPUT_DIR, page_name)):
+            skipped.append(page_name)
+            return True
+        return False
 
     # Second pass: generate HTML files with complete projects list
-    for idx, project_id in enumerate(project_ids):
-        if project_id == "2409":
-            out_dir = os.path.join(OUTPUT_DIR, PROJECT_HTML_DIR)
-            os.makedirs(out_dir, exist_ok=True)
-            with open(os.path.join(out_dir, "project2409.html"), "w", encoding="utf-8") as f:
-                f.write(generate_about_html(folder_by_id[project_id]))
+    output = take_report()
+    tasks = []
+    with span("page_digests"):
+        for idx, (project, snapshot) in enumerate(zip(projects, library.projects)):
+            page_name = f"{PROJECT_HTML_DIR}/project{project['num']}.html"
+            prev_project = project_ids[idx - 1] if idx - 1 >= 0 else ""
+            if not is_current(page_name, project_page_digest(project, snapshot, prev_project, projects)):
+                tasks.append((idx, prev_project, out_dir))
+
+    jobs = min(args.jobs or os.cpu_count() or 1, len(tasks))
+    with span("render_pages", pages=len(tasks), jobs=jobs):
+        if jobs > 1:
+            # Workers receive the read-only metadata once, then only page indices.
+            with ProcessPoolExecutor(
+                max_workers=jobs,
+                initializer=_init_page_worker,
+                initargs=(projects, library.projects),
+            ) as executor:
+                for counts in executor.map(_write_page_in_worker, tasks, chunksize=max(1, len(tasks) // (jobs * 4))):
+                    output.add(counts)
+        else:
+            for idx, prev_project, page_dir in tasks:
+                write_project_page(projects[idx], library.projects[idx], prev_project, projects, page_dir)
+
+    with span("search_index"):
+        search_index = write_search_index(projects)
+    if not is_current("index.html", index_digest(projects, icon_atlases, args.index_page_size)):
+        with span("index", projects=len(projects)) as info:
+            info["pages"] = write_index_pages(projects, icon_atlases, search_index, args.index_page_size)
+    save_build_manifest(digests)
+    output.add(take_report())
+    print(f"Site generated! {len(digests) - len(skipped)} page(s) rendered; {output.summary()}.")
+    if skipped:
+        print(f"Skipped {len(skipped)} unchanged page(s): " + ", ".join(skipped))
+    if args.precompress:
+        with span("precompress") as info:
+            counts = precompress_site(Path(OUTPUT_DIR))
+            info.update(counts)
+        encodings = "gzip and zstd" if zstd_available() else "gzip"
+        print(f"Precompressed {counts['compressed']} file(s) with {encodings}; {counts['unchanged']} unchanged.")
+
+
+def watched_inputs():
+    """Return the size and mtime of every file a rebuild could depend on."""
+    state = {}
+    for root in WATCH_DIRS:
+        for dirpath, dirnames, filenames in os.walk(root):
+            # Derivatives are build output; watching them would retrigger every build.
+            dirnames[:] = [
+                name for name in dirnames
+                if not name.startswith(".") and Path(dirpath, name) not in (RESPONSIVE_DIR, ASSET_DIST_DIR, ICON_ATLAS_DIR)
+            ]
+            for name in filenames:
+                # Precompressed sidecars are output too.
+                if name.startswith(".") or name.endswith((".gz", ".zst")):
+                    continue
+                path = os.path.join(dirpath, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                state[path] = (stat.st_size, stat.st_mtime_ns)
+    try:
+        stat = os.stat(CV_DATA_PATH)
+        state[str(CV_DATA_PATH)] = (stat.st_size, stat.st_mtime_ns)
+    except FileNotFoundError:
+        pass
+    return state
+
+
+def watch(args):
+    """Poll the inputs and run an incremental build after every change."""
+    inputs = watched_inputs()
+    while True:
+        time.sleep(WATCH_POLL_SECONDS)
+        if watched_inputs() == inputs:
             continue
-        folder = folder_by_id[project_id]
-        folder_path = safe_join(PROJECTS_DIR, folder)
-        title = read_file(safe_join(folder_path, "title.txt"))
-        desc = read_file(safe_join(folder_path, "description.txt"))
-        icon = get_icon(folder_path)
-        media = get_media(folder_path)
-        next_project = project_ids[idx + 1] if idx + 1 < len(project_ids) else ""
-        prev_project = project_ids[idx - 1] if idx - 1 >= 0 else ""
-        if project_id == "0010":
-            html = generate_drone_gallery_html(
-                project_id, folder, title, desc, media,
-                next_project, prev_project, projects
-            )
+        started = time.perf_counter()
+        try:
+            build_site(args)
+        except (OSError, ValueError) as exc:
+            print(f"Build failed: {exc}")
         else:
-            html = generate_project_html(project_id, folder, title, desc, icon, media, next_project, prev_project, projects)
-        # ensure output directory exists
-        out_dir = os.path.join(OUTPUT_DIR, PROJECT_HTML_DIR)
-        os.makedirs(out_dir, exist_ok=True)
-        with open(os.path.join(out_dir, f"project{project_id}.html"), "w", encoding="utf-8") as f:
-          f.write(html)
-
-    index_html = generate_index_html(projects)
-    with open(os.path.join(OUTPUT_DIR, "index.html"), "w", encoding="utf-8") as f:
-        f.write(index_html)
-    print("Site generated!")
+            print(f"Rebuilt in {(time.perf_counter() - started) * 1000:.0f} ms.")
+        # Snapshot after the build: it may itself update media-dates.json.
+        inputs = watched_inputs()
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.jobs < 0:
+        raise SystemExit("--jobs must be 0 or a positive number.")
+    if args.index_page_size < 0:
+        raise SystemExit("--index-page-size must be 0 or a positive number.")
+    if args.serve and not 1024 <= args.port <= 65535:
+        raise SystemExit("Choose a port between 1024 and 65535.")
+    if args.watch:
+        args.incremental = True
+    build_site(args)
+    if not (args.watch or args.serve):
+        return
+
+    server = start_preview_server(OUTPUT_DIR, args.port) if args.serve else None
+    if server:
+        print(f"Previewing the site at http://{HOST}:{args.port}/index.html")
+    if args.watch:
+        print("Watching projects/, templates/ and assets/ for changes.")
+    print("Press Control-C to stop.")
+    try:
+        if args.watch:
+            watch(args)
+        else:
+            while True:
+                time.sleep(3600)
+    except KeyboardInterrupt:
+        print("\nStopping.")
+    finally:
+        if server:
+            server.shutdown()
+            server.server_close()
+
 
 if __name__ == "__main__":
     main()
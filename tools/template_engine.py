@@ -0,0 +1,59 @@
+"""Tiny compiled template layer for the ``{{PLACEHOLDER}}`` page templates.
+
+Each template file is read once and split into literal and slot segments, so
+rendering a page is a single ``str.join`` instead of one full-document copy per
+placeholder.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Mapping
+
+
+PLACEHOLDER_PATTERN = re.compile(r"\{\{([A-Z0-9_]+)\}\}")
+
+
+class TemplateError(ValueError):
+    """Raised when a render call and its template disagree on placeholders."""
+
+
+class CompiledTemplate:
+    def __init__(self, source: str, name: str = "<template>") -> None:
+        parts = PLACEHOLDER_PATTERN.split(source)
+        self.name = name
+        self.literals = tuple(parts[0::2])
+        self.slots = tuple(parts[1::2])
+        self.placeholders = frozenset(self.slots)
+
+    def render(self, values: Mapping[str, str]) -> str:
+        """Fill every slot; unknown or unfilled placeholders raise TemplateError."""
+        unknown = set(values) - self.placeholders
+        unfilled = self.placeholders - set(values)
+        if unknown or unfilled:
+            problems = []
+            if unfilled:
+                problems.append("unfilled " + ", ".join(f"{{{{{name}}}}}" for name in sorted(unfilled)))
+            if unknown:
+                problems.append("unknown " + ", ".join(f"{{{{{name}}}}}" for name in sorted(unknown)))
+            raise TemplateError(f"{self.name}: " + "; ".join(problems))
+        pieces = [self.literals[0]]
+        for slot, literal in zip(self.slots, self.literals[1:]):
+            pieces.append(values[slot])
+            pieces.append(literal)
+        return "".join(pieces)
+
+
+@lru_cache(maxsize=None)
+def _compiled(path: str, _mtime_ns: int) -> CompiledTemplate:
+    with open(path, "r", encoding="utf-8") as handle:
+        return CompiledTemplate(handle.read(), name=os.path.basename(path))
+
+
+def load_template(path: str | Path) -> CompiledTemplate:
+    """Return the compiled template, re-reading it only after the file changes."""
+    path = os.fspath(path)
+    return _compiled(path, os.stat(path).st_mtime_ns)
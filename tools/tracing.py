@@ -0,0 +1,139 @@
+"""Opt-in Chrome trace-event spans for the publish pipeline.
+
+Tracing is off unless ``SITE_TRACE_DIR`` names a directory, either in the
+environment (so the export subprocesses inherit it) or through ``enable()``.
+Each process appends its finished spans to ``trace-<pid>.jsonl`` in that
+directory whenever its outermost span closes, which also covers pool workers
+that exit without running cleanup handlers. ``merge_traces()`` combines the
+files into one ``{"traceEvents": [...]}`` document for ``chrome://tracing`` or
+Perfetto. With tracing off, ``span()`` returns a shared no-op context manager.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+
+TRACE_ENV = "SITE_TRACE_DIR"
+
+
+class _NullSpan:
+    def __enter__(self) -> dict[str, Any]:
+        return {}
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+_state = threading.local()
+_lock = threading.Lock()
+_events: list[dict[str, Any]] = []
+_trace_dir: str | None = os.environ.get(TRACE_ENV) or None
+_named_processes: set[int] = set()
+
+
+def _reset_after_fork() -> None:
+    # A forked worker starts inside the parent's open spans; its own spans are
+    # top-level and must not re-emit the parent's unflushed events.
+    _state.depth = 0
+    _events.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def enabled() -> bool:
+    return _trace_dir is not None
+
+
+def enable(directory: str | Path) -> None:
+    """Turn tracing on for this process and every subprocess started after it."""
+    global _trace_dir
+    Path(directory).mkdir(parents=True, exist_ok=True)
+    _trace_dir = os.fspath(directory)
+    os.environ[TRACE_ENV] = _trace_dir
+
+
+class _Span:
+    def __init__(self, name: str, category: str, args: dict[str, Any]) -> None:
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self) -> dict[str, Any]:
+        _state.depth = getattr(_state, "depth", 0) + 1
+        self.start = time.perf_counter_ns()
+        return self.args
+
+    def __exit__(self, exc_type: Any, *exc_info: Any) -> None:
+        end = time.perf_counter_ns()
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        event = {
+            "name": self.name,
+            "cat": self.category,
+            "ph": "X",
+            "ts": self.start / 1000,
+            "dur": (end - self.start) / 1000,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+        }
+        if self.args:
+            event["args"] = self.args
+        with _lock:
+            _events.append(event)
+        _state.depth -= 1
+        if _state.depth == 0:
+            flush()
+
+
+def span(name: str, category: str = "build", **args: Any) -> Any:
+    """Time a ``with`` block; the yielded dict can collect counts for the event's args."""
+    if _trace_dir is None:
+        return _NULL_SPAN
+    return _Span(name, category, args)
+
+
+def flush() -> None:
+    """Append this process's finished spans to its trace file."""
+    if _trace_dir is None:
+        return
+    pid = os.getpid()
+    with _lock:
+        events = _events[:]
+        _events.clear()
+        if pid not in _named_processes:
+            _named_processes.add(pid)
+            label = os.path.basename(sys.argv[0]) if sys.argv and sys.argv[0] else "python"
+            events.insert(0, {"name": "process_name", "ph": "M", "pid": pid, "args": {"name": label}})
+    if not events:
+        return
+    directory = Path(_trace_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    with open(directory / f"trace-{pid}.jsonl", "a", encoding="utf-8") as handle:
+        for event in events:
+            handle.write(json.dumps(event) + "\n")
+
+
+def merge_traces(directory: str | Path, destination: str | Path) -> int:
+    """Combine every process's spans into one trace file; return the event count."""
+    events = []
+    for path in sorted(Path(directory).glob("trace-*.jsonl")):
+        with open(path, "r", encoding="utf-8") as handle:
+            events.extend(json.loads(line) for line in handle if line.strip())
+    events.sort(key=lambda event: event.get("ts", 0))
+    destination = Path(destination)
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    destination.write_text(
+        json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}) + "\n",
+        encoding="utf-8",
+    )
+    return len(events)